@@ -0,0 +1,230 @@
+"""
+Admission control for GPTB2 backend
+Rejects work the worker cannot finish in time with a fast 429/503 + Retry-After instead of
+letting requests queue until gunicorn's worker timeout:
+- per-client token bucket (429); the configured rate is per client across the deployment and
+  each process enforces its share (ADMISSION_PROCESSES = backend replicas x workers), since
+  least_conn balancing spreads one client's requests over all of them
+- per-worker concurrency limit with a small, bounded, time-limited wait queue (503)
+- queue-delay shedding from nginx's X-Request-Start header, which covers requests that
+  waited in gunicorn's accept backlog before reaching the app (503)
+- priority: expensive endpoints (bulk, batch, list-all, stats) get a smaller share of the
+  concurrency limit, never wait in the queue and are shed at half the queue delay
+"""
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict
+from flask import current_app, jsonify, request
+
+logger = logging.getLogger('gptb2.admission')
+
+EXTENSION_KEY = 'admission'
+SLOT_KEY = 'gptb2.admission_slot'
+
+# Endpoints shed first under load
+LOW_PRIORITY_ENDPOINTS = frozenset({
+    'get_all_equations',
+    'get_equation_stats',
+    'create_bulk_equations',
+    'update_bulk_equations',
+    'delete_bulk_equations',
+    'run_batch',
+})
+
+# Long-lived streams: rate limited on connect, but never hold a concurrency slot
+STREAMING_ENDPOINTS = frozenset({
+    'stream_events',
+})
+
+
+class RateLimiter:
+    """Token buckets keyed by client, oldest clients forgotten beyond max_clients"""
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets = OrderedDict()  # client -> [tokens, last refill]
+        self.lock = threading.Lock()
+
+    def acquire(self, client, now=None):
+        """Take one token; return 0 when allowed, else seconds until a token is available"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            bucket = self.buckets.pop(client, None) or [self.burst, now]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self.buckets[client] = bucket
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate
+
+
+class ConcurrencyLimiter:
+    """At most `limit` requests in flight; up to `max_queue` more wait up to `timeout` seconds"""
+
+    def __init__(self, limit, max_queue, timeout, low_priority_limit):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.low_priority_limit = low_priority_limit
+        self.in_flight = 0
+        self.waiting = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, low_priority=False):
+        """Return None when admitted, else the rejection reason"""
+        with self.condition:
+            if low_priority:
+                if self.in_flight < self.low_priority_limit and not self.waiting:
+                    self.in_flight += 1
+                    return None
+                return 'shed'
+
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                return None
+            if self.waiting >= self.max_queue:
+                return 'queue_full'
+
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + self.timeout
+                while self.in_flight >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return 'queue_timeout'
+                    self.condition.wait(remaining)
+                self.in_flight += 1
+                return None
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+
+def queue_delay(header_value, now=None):
+    """
+    Seconds since the proxy received the request, from X-Request-Start: t=<epoch seconds>
+    (nginx $msec) or t=<epoch microseconds>; None when missing or unparsable
+    """
+    if not header_value:
+        return None
+    try:
+        started = float(header_value.strip().removeprefix('t='))
+    except ValueError:
+        return None
+    if started > 1e11:
+        started /= 1e6
+    delay = (time.time() if now is None else now) - started
+    return max(delay, 0.0)
+
+
+def client_key():
+    if current_app.config['ADMISSION_TRUST_PROXY']:
+        forwarded = request.headers.get('X-Real-IP') or request.headers.get('X-Forwarded-For', '').split(',')[0].strip()
+        if forwarded:
+            return forwarded
+    return request.remote_addr or 'unknown'
+
+
+def _reject(status, reason, retry_after):
+    state = current_app.extensions[EXTENSION_KEY]
+    state['stats'][reason] += 1
+    logger.debug("Rejected %s %s with %d: %s", request.method, request.path, status, reason)
+    response = jsonify({
+        'message': 'Too many requests, please retry later' if status == 429 else 'Server is busy, please retry later',
+        'status': 'error',
+        'reason': reason,
+        'retry_after': round(retry_after, 3)
+    })
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def _admit():
+    config = current_app.config
+    if not config['ADMISSION_ENABLED'] or not request.path.startswith('/api/'):
+        return None
+
+    state = current_app.extensions[EXTENSION_KEY]
+    low_priority = request.endpoint in config['ADMISSION_LOW_PRIORITY_ENDPOINTS']
+
+    if config['ADMISSION_RATE_PER_SECOND'] > 0:
+        wait = state['rate_limiter'].acquire(client_key())
+        if wait:
+            return _reject(429, 'rate_limited', wait)
+
+    if request.endpoint in config['ADMISSION_STREAMING_ENDPOINTS']:
+        return None
+
+    max_delay = config['ADMISSION_MAX_QUEUE_DELAY_MS'] / 1000
+    if max_delay > 0:
+        delay = queue_delay(request.headers.get('X-Request-Start'))
+        if delay is not None and delay > (max_delay / 2 if low_priority else max_delay):
+            return _reject(503, 'queue_delay', 1)
+
+    reason = state['concurrency'].acquire(low_priority)
+    if reason:
+        return _reject(503, reason, 1)
+    # Kept on the request itself: teardown can run after the app context is gone (test clients)
+    request.environ[SLOT_KEY] = state['concurrency']
+    return None
+
+
+def _release(exc):
+    limiter = request.environ.pop(SLOT_KEY, None)
+    if limiter is not None:
+        limiter.release()
+
+
+def stats(app=None):
+    """Rejection counters of this worker plus current load"""
+    state = (app or current_app).extensions.get(EXTENSION_KEY)
+    if state is None:
+        return {}
+    concurrency = state['concurrency']
+    return dict(state['stats'], in_flight=concurrency.in_flight, waiting=concurrency.waiting)
+
+
+def init_app(app):
+    """Register admission control; call before other init_app()s so rejected requests skip their hooks"""
+    app.config.setdefault('ADMISSION_ENABLED', True)
+    app.config.setdefault('ADMISSION_RATE_PER_SECOND', 20.0)
+    app.config.setdefault('ADMISSION_BURST', 40)
+    app.config.setdefault('ADMISSION_PROCESSES', 1)
+    app.config.setdefault('ADMISSION_TRUST_PROXY', False)
+    app.config.setdefault('ADMISSION_MAX_CONCURRENT', 4)
+    app.config.setdefault('ADMISSION_LOW_PRIORITY_CONCURRENT', 2)
+    app.config.setdefault('ADMISSION_MAX_QUEUE', 4)
+    app.config.setdefault('ADMISSION_QUEUE_TIMEOUT_MS', 500.0)
+    app.config.setdefault('ADMISSION_MAX_QUEUE_DELAY_MS', 1000.0)
+    app.config.setdefault('ADMISSION_LOW_PRIORITY_ENDPOINTS', LOW_PRIORITY_ENDPOINTS)
+    app.config.setdefault('ADMISSION_STREAMING_ENDPOINTS', STREAMING_ENDPOINTS)
+
+    processes = max(1, app.config['ADMISSION_PROCESSES'])
+    app.extensions[EXTENSION_KEY] = {
+        'rate_limiter': RateLimiter(
+            app.config['ADMISSION_RATE_PER_SECOND'] / processes,
+            max(1, app.config['ADMISSION_BURST'] // processes)
+        ),
+        'concurrency': ConcurrencyLimiter(
+            app.config['ADMISSION_MAX_CONCURRENT'],
+            app.config['ADMISSION_MAX_QUEUE'],
+            app.config['ADMISSION_QUEUE_TIMEOUT_MS'] / 1000,
+            app.config['ADMISSION_LOW_PRIORITY_CONCURRENT']
+        ),
+        'stats': dict.fromkeys(('rate_limited', 'queue_delay', 'queue_full', 'queue_timeout', 'shed'), 0),
+    }
+    app.before_request(_admit)
+    app.teardown_request(_release)
@@ -1,9 +1,27 @@
 import os
 import logging
-from flask import Flask, jsonify, request
+from flask import Flask, current_app, jsonify, redirect, request
 from flask_cors import CORS
 from dotenv import load_dotenv
-from models import db, Equation
+from datetime import datetime
+from sqlalchemy import and_, case, delete, or_, select, update
+from models import db, Equation, SOLUTION_COLUMNS, equation_stats, insert_equations
+import admission
+import archive
+import batch
+import canonical
+import coalesce
+import dedup
+import delta_sync
+import events
+import fieldsets
+import instrumentation
+import pagination
+import serialization
+import server_timing
+import shared_cache
+import similarity
+import solve
 
 # Load environment variables from .env file
 load_dotenv()
@@ -54,8 +72,74 @@ app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
 
+# SQL query instrumentation (per-request query count, slow-query log, N+1 detection)
+app.config['SQL_INSTRUMENTATION_ENABLED'] = os.getenv('SQL_INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+app.config['SQL_INSTRUMENTATION_HEADERS'] = os.getenv('SQL_INSTRUMENTATION_HEADERS', str(DEBUG_MODE)).lower() == 'true'
+app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '100'))
+app.config['N_PLUS_ONE_THRESHOLD'] = int(os.getenv('N_PLUS_ONE_THRESHOLD', '5'))
+
+# Server-Timing headers on /api responses (0 = off, 1 = every request, 0.1 = 10% sampled)
+app.config['SERVER_TIMING_SAMPLE_RATE'] = float(os.getenv('SERVER_TIMING_SAMPLE_RATE', '1' if DEBUG_MODE else '0'))
+
+# Cold storage for archived monthly partitions (see archive.py)
+app.config['ARCHIVE_DIR'] = os.getenv('ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive'))
+
+# Admission control: fast 429/503 + Retry-After instead of queueing until the worker timeout (see admission.py)
+app.config['ADMISSION_ENABLED'] = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+app.config['ADMISSION_RATE_PER_SECOND'] = float(os.getenv('ADMISSION_RATE_PER_SECOND', '20'))
+app.config['ADMISSION_BURST'] = int(os.getenv('ADMISSION_BURST', '40'))
+# Defaults to every gunicorn worker (WEB_CONCURRENCY) of every replica (BACKEND_REPLICAS)
+app.config['ADMISSION_PROCESSES'] = int(os.getenv(
+    'ADMISSION_PROCESSES', int(os.getenv('BACKEND_REPLICAS', '1')) * int(os.getenv('WEB_CONCURRENCY', '1'))
+))
+app.config['ADMISSION_TRUST_PROXY'] = os.getenv('ADMISSION_TRUST_PROXY', 'false').lower() == 'true'
+app.config['ADMISSION_MAX_CONCURRENT'] = int(os.getenv('ADMISSION_MAX_CONCURRENT', '4'))
+app.config['ADMISSION_LOW_PRIORITY_CONCURRENT'] = int(os.getenv('ADMISSION_LOW_PRIORITY_CONCURRENT', '2'))
+app.config['ADMISSION_MAX_QUEUE'] = int(os.getenv('ADMISSION_MAX_QUEUE', '4'))
+app.config['ADMISSION_QUEUE_TIMEOUT_MS'] = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_MS', '500'))
+app.config['ADMISSION_MAX_QUEUE_DELAY_MS'] = float(os.getenv('ADMISSION_MAX_QUEUE_DELAY_MS', '1000'))
+
+# Single-flight coalescing of identical concurrent reads (see coalesce.py)
+app.config['COALESCING_ENABLED'] = os.getenv('COALESCING_ENABLED', 'true').lower() == 'true'
+
+# Change feed (SSE). Empty EVENTS_PUBLISH_ADDR: this process serves GET /api/events itself
+# (development); host:port: committed writes are sent to the events service (see events.py)
+app.config['EVENTS_ENABLED'] = os.getenv('EVENTS_ENABLED', 'true').lower() == 'true'
+app.config['EVENTS_PUBLISH_ADDR'] = os.getenv('EVENTS_PUBLISH_ADDR', '')
+app.config['EVENTS_STREAM_URL'] = os.getenv('EVENTS_STREAM_URL', '')
+app.config['EVENTS_REPLAY_SIZE'] = int(os.getenv('EVENTS_REPLAY_SIZE', '1000'))
+app.config['EVENTS_HEARTBEAT_SECONDS'] = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+
+# Delta sync (GET /api/equation?since=): overlap window and tombstone retention (see delta_sync.py)
+app.config['DELTA_SYNC_WINDOW_SECONDS'] = float(os.getenv('DELTA_SYNC_WINDOW_SECONDS', '5'))
+app.config['DELTA_TOMBSTONE_RETENTION_DAYS'] = int(os.getenv('DELTA_TOMBSTONE_RETENTION_DAYS', '30'))
+
+# Host-wide shared-memory cache for GET /api/equation/<id> (see shared_cache.py)
+app.config['SHARED_CACHE_ENABLED'] = os.getenv('SHARED_CACHE_ENABLED', 'true').lower() == 'true'
+app.config['SHARED_CACHE_PATH'] = os.getenv('SHARED_CACHE_PATH', shared_cache.default_path())
+app.config['SHARED_CACHE_SIZE_MB'] = int(os.getenv('SHARED_CACHE_SIZE_MB', '16'))
+app.config['SHARED_CACHE_TTL_SECONDS'] = float(os.getenv('SHARED_CACHE_TTL_SECONDS', '300'))
+
+# Similar-equations k-d tree index, one per worker (see similarity.py)
+app.config['SIMILARITY_INDEX_WARM'] = os.getenv('SIMILARITY_INDEX_WARM', 'false').lower() == 'true'
+app.config['SIMILARITY_INDEX_REFRESH_SECONDS'] = float(os.getenv('SIMILARITY_INDEX_REFRESH_SECONDS', '5'))
+app.config['SIMILARITY_INDEX_REBUILD_SECONDS'] = float(os.getenv('SIMILARITY_INDEX_REBUILD_SECONDS', '0'))
+
+# Dedup mode for every create instead of only ?dedup=true requests (see dedup.py)
+app.config['DEDUP_ENABLED'] = os.getenv('DEDUP_ENABLED', 'false').lower() == 'true'
+
 # Initialize SQLAlchemy with app
 db.init_app(app)
+admission.init_app(app)
+instrumentation.init_app(app)
+server_timing.init_app(app)
+serialization.init_app(app)
+fieldsets.init_app(app)
+coalesce.init_app(app)
+events.init_app(app)
+delta_sync.init_app(app)
+shared_cache.init_app(app)
+similarity.init_app(app)
 
 @app.route('/ping', methods=['GET'])
 def ping():
@@ -176,6 +260,9 @@ def create_equation():
     """
     Create new equation and solve it
     Expected JSON: {"a": float, "b": float, "c": float}
+    Prefer: return=minimal answers with only the new id
+    ?dedup=true (default DEDUP_ENABLED) returns the stored equation with the same coefficients,
+    if any, with status 200 and "deduplicated": true instead of inserting (see dedup.py)
     """
     try:
         # Validate request content type
@@ -188,40 +275,55 @@ def create_equation():
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['a', 'b', 'c']
-        missing_fields = [field for field in required_fields if field not in data]
+        with server_timing.phase('validate'):
+            required_fields = ['a', 'b', 'c']
+            missing_fields = [field for field in required_fields if field not in data]
         
-        if missing_fields:
-            return jsonify({
-                'message': f'Missing required fields: {", ".join(missing_fields)}',
-                'status': 'error',
-                'required_fields': required_fields
-            }), 400
+            if missing_fields:
+                return jsonify({
+                    'message': f'Missing required fields: {", ".join(missing_fields)}',
+                    'status': 'error',
+                    'required_fields': required_fields
+                }), 400
         
-        # Validate field types and convert to float
-        try:
-            a = float(data['a'])
-            b = float(data['b'])
-            c = float(data['c'])
-        except (ValueError, TypeError) as e:
-            return jsonify({
-                'message': 'Coefficients a, b, c must be valid numbers',
-                'status': 'error',
-                'error': str(e)
-            }), 400
+            # Validate field types and convert to float
+            try:
+                a = float(data['a'])
+                b = float(data['b'])
+                c = float(data['c'])
+            except (ValueError, TypeError) as e:
+                return jsonify({
+                    'message': 'Coefficients a, b, c must be valid numbers',
+                    'status': 'error',
+                    'error': str(e)
+                }), 400
         
         # Create and solve equation
-        equation = Equation(a=a, b=b, c=c)
+        with server_timing.phase('solve'):
+            equation = Equation(a=a, b=b, c=c)
         
         # Save to database
         try:
-            db.session.add(equation)
-            db.session.commit()
+            if dedup.requested():
+                [(equation, deduplicated)], _ = dedup.create([equation])
+                db.session.commit()
+                if deduplicated:
+                    return jsonify({
+                        'message': 'Equation already exists; returned the stored equation',
+                        'status': 'success',
+                        'deduplicated': True,
+                        'data': {'id': equation.id} if fieldsets.prefers_minimal() else equation.to_dict()
+                    }), 200
+            else:
+                db.session.add(equation)
+                db.session.commit()
+            similarity.record_upsert([equation])
+            events.publish_created([equation])
             
             return jsonify({
                 'message': 'Equation created and solved successfully',
                 'status': 'success',
-                'data': equation.to_dict()
+                'data': {'id': equation.id} if fieldsets.prefers_minimal() else equation.to_dict()
             }), 201
             
         except Exception as db_error:
@@ -241,18 +343,136 @@ def create_equation():
             'error': str(e)
         }), 500
 
+def _solve_flight_key():
+    """Conditional requests get their own flight: a 304 must never reach a client without the ETag"""
+    return coalesce.default_key() + (request.headers.get('If-None-Match', ''),)
+
+@app.route('/api/solve', methods=['GET'])
+@coalesce.single_flight(key=_solve_flight_key)
+def get_solution():
+    """
+    Solve an equation without storing it: GET /api/solve?a=1&b=-5&c=6
+    Never touches the database. The answer never changes, so it is sent with
+    Cache-Control: immutable and a strong ETag (If-None-Match answers 304).
+    Non-canonical queries (other number forms, order or extra parameters) get a 301 to
+    the canonical URL, so caches hold one entry per equation (see solve.py)
+    """
+    try:
+        try:
+            with server_timing.phase('validate'):
+                coefficients, query = solve.canonical_query(request.args)
+        except ValueError as e:
+            return jsonify({
+                'message': str(e),
+                'status': 'error'
+            }), 400
+        
+        if request.query_string.decode('latin-1') != query:
+            response = redirect(f'{request.path}?{query}', code=301)
+            response.headers['Cache-Control'] = solve.IMMUTABLE
+            return response
+        
+        codec = serialization.negotiated_codec()
+        etag = solve.etag(query, codec.mimetype if codec else 'application/json')
+        # If-None-Match uses weak comparison (RFC 9110): nginx marks the ETag weak when it gzips
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            with server_timing.phase('solve'):
+                equation = Equation(*coefficients)
+            response = jsonify({
+                'message': 'Equation solved successfully',
+                'status': 'success',
+                'data': equation.to_dict(solve.FIELDS)
+            })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = solve.IMMUTABLE
+        return response
+        
+    except Exception as e:
+        return jsonify({
+            'message': 'Failed to solve equation',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
 @app.route('/api/equation', methods=['GET'])
+@coalesce.single_flight()
 def get_all_equations():
-    """Get all equations from database"""
+    """
+    Get all equations from database
+    ?fields=id,a,b,c returns (and SELECTs) only the named fields
+    ?since=<sync_token> returns only equations changed since that token plus the ids deleted
+    since (delta sync, see delta_sync.py); ?since= (empty) starts a sync with the full list.
+    Sync responses carry the token for the next request
+    ?limit=<n>[&cursor=<next_cursor>] returns the list in keyset pages (see pagination.py)
+    ?canonical_hash=<hash> returns only scalar multiples of one equation (see canonical.py)
+    """
     try:
-        equations = Equation.query.order_by(Equation.created_at.desc()).all()
+        try:
+            fields = fieldsets.requested_fields()
+            since = delta_sync.parse_token(request.args.get('since'))
+            canonical_hash = canonical.parse_hash(request.args.get('canonical_hash'))
+            limit = pagination.parse_limit(request.args.get('limit'))
+            cursor = pagination.parse_cursor(request.args.get('cursor'))
+            if limit is None and cursor is not None:
+                raise ValueError('cursor requires limit')
+            if limit is not None and since is not None:
+                raise ValueError('limit cannot be combined with a since token; deltas are not paged')
+            if canonical_hash is not None and 'since' in request.args:
+                raise ValueError('canonical_hash cannot be combined with since; deltas are not filtered')
+        except ValueError as e:
+            return jsonify({
+                'message': str(e),
+                'status': 'error'
+            }), 400
         
-        return jsonify({
+        syncing = 'since' in request.args
+        sync_token = delta_sync.new_token() if syncing else None
+        full_resync = since is not None and since < delta_sync.resync_horizon()
+        query = Equation.query.options(*fieldsets.load_options(fields))
+        
+        if since is not None and not full_resync:
+            # Served from idx_updated_at and the deletion log's deleted_at index
+            equations = query.filter(Equation.updated_at >= since).order_by(Equation.updated_at).all()
+            deleted_ids = delta_sync.deleted_since(since)
+            
+            return jsonify({
+                'message': f'Retrieved {len(equations)} changed and {len(deleted_ids)} deleted equations',
+                'status': 'success',
+                'delta': True,
+                'count': len(equations),
+                'data': [eq.to_dict(fields) for eq in equations],
+                'deleted': deleted_ids,
+                'sync_token': sync_token
+            })
+        
+        if limit is not None and fields is not None:
+            # The next cursor is built from created_at and id
+            query = Equation.query.options(*fieldsets.load_options(fields + ['created_at']))
+        if canonical_hash is not None:
+            # Served from idx_canonical_hash (canonical_hash, created_at)
+            query = query.filter(Equation.canonical_hash == canonical_hash)
+        
+        if limit is not None:
+            equations, next_cursor = pagination.page(query, limit, cursor)
+        else:
+            equations = query.order_by(Equation.created_at.desc()).all()
+        
+        response = {
             'message': f'Retrieved {len(equations)} equations',
             'status': 'success',
             'count': len(equations),
-            'data': [eq.to_dict() for eq in equations]
-        })
+            'data': [eq.to_dict(fields) for eq in equations]
+        }
+        if limit is not None:
+            response['next_cursor'] = next_cursor
+        if syncing:
+            response['sync_token'] = sync_token
+        if full_resync:
+            # Too old for a delta: the client must replace its copy
+            response['full_resync'] = True
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({
@@ -262,10 +482,44 @@ def get_all_equations():
         }), 500
 
 @app.route('/api/equation/<int:equation_id>', methods=['GET'])
+@coalesce.single_flight()
 def get_equation(equation_id):
-    """Get specific equation by ID"""
+    """
+    Get specific equation by ID
+    Served from the host-wide shared cache when possible (X-Cache: HIT)
+    ?include_archived=true also searches partitions archived to cold storage (slower)
+    ?fields=id,solution returns only the named fields; on a cache miss only their columns are
+    read, and the partial row is not cached
+    """
     try:
-        equation = Equation.query.get(equation_id)
+        try:
+            fields = fieldsets.requested_fields()
+        except ValueError as e:
+            return jsonify({
+                'message': str(e),
+                'status': 'error'
+            }), 400
+        
+        cached, generation = shared_cache.lookup_equation(equation_id)
+        if cached is not None:
+            response = jsonify({
+                'message': 'Equation retrieved successfully',
+                'status': 'success',
+                'data': fieldsets.project(cached, fields)
+            })
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        
+        equation = Equation.query.options(*fieldsets.load_options(fields)).get(equation_id)
+        
+        if not equation and request.args.get('include_archived', 'false').lower() == 'true':
+            archived = archive.find_archived_equation(current_app.config['ARCHIVE_DIR'], equation_id)
+            if archived:
+                return jsonify({
+                    'message': 'Equation retrieved from archive',
+                    'status': 'success',
+                    'data': fieldsets.project(archived, fields)
+                })
         
         if not equation:
             return jsonify({
@@ -273,11 +527,17 @@ def get_equation(equation_id):
                 'status': 'error'
             }), 404
         
-        return jsonify({
+        equation_data = equation.to_dict(fields)
+        if fields is None:
+            shared_cache.store_equation(equation_data, generation)
+        
+        response = jsonify({
             'message': 'Equation retrieved successfully',
             'status': 'success',
-            'data': equation.to_dict()
+            'data': equation_data
         })
+        response.headers['X-Cache'] = 'MISS'
+        return response
         
     except Exception as e:
         return jsonify({
@@ -291,12 +551,16 @@ def update_equation(equation_id):
     """
     Update existing equation with new coefficients and re-solve
     Expected JSON: {"a": float, "b": float, "c": float}
+    Prefer: return=minimal skips reading the current row (no previous_values) and answers with only the id
     """
     try:
-        # Find existing equation
-        equation = Equation.query.get(equation_id)
+        minimal = fieldsets.prefers_minimal()
         
-        if not equation:
+        # Find existing equation (its current values are reported as previous_values);
+        # a minimal update learns whether the row exists from the UPDATE itself
+        equation = None if minimal else db.session.get(Equation, equation_id)
+        
+        if not minimal and not equation:
             return jsonify({
                 'message': f'Equation with ID {equation_id} not found',
                 'status': 'error'
@@ -312,27 +576,73 @@ def update_equation(equation_id):
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['a', 'b', 'c']
-        missing_fields = [field for field in required_fields if field not in data]
+        with server_timing.phase('validate'):
+            required_fields = ['a', 'b', 'c']
+            missing_fields = [field for field in required_fields if field not in data]
         
-        if missing_fields:
-            return jsonify({
-                'message': f'Missing required fields: {", ".join(missing_fields)}',
-                'status': 'error',
-                'required_fields': required_fields
-            }), 400
+            if missing_fields:
+                return jsonify({
+                    'message': f'Missing required fields: {", ".join(missing_fields)}',
+                    'status': 'error',
+                    'required_fields': required_fields
+                }), 400
         
-        # Validate field types and convert to float
-        try:
-            new_a = float(data['a'])
-            new_b = float(data['b'])
-            new_c = float(data['c'])
-        except (ValueError, TypeError) as e:
-            return jsonify({
-                'message': 'Coefficients a, b, c must be valid numbers',
-                'status': 'error',
-                'error': str(e)
-            }), 400
+            # Validate field types and convert to float
+            try:
+                new_a = float(data['a'])
+                new_b = float(data['b'])
+                new_c = float(data['c'])
+            except (ValueError, TypeError) as e:
+                return jsonify({
+                    'message': 'Coefficients a, b, c must be valid numbers',
+                    'status': 'error',
+                    'error': str(e)
+                }), 400
+        
+        if minimal:
+            with server_timing.phase('solve'):
+                solved = Equation(a=new_a, b=new_b, c=new_c)
+            
+            try:
+                now = datetime.utcnow()
+                updated = db.session.execute(
+                    update(Equation)
+                    .where(Equation.id == equation_id)
+                    .values(
+                        updated_at=now,
+                        **{column: getattr(solved, column) for column in ('a', 'b', 'c') + SOLUTION_COLUMNS}
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                
+                if not updated:
+                    db.session.rollback()
+                    return jsonify({
+                        'message': f'Equation with ID {equation_id} not found',
+                        'status': 'error'
+                    }), 404
+                
+                db.session.commit()
+                shared_cache.invalidate_equations([equation_id])
+                solved.id = equation_id
+                solved.updated_at = now
+                similarity.record_upsert([solved])
+                events.publish_updated([solved])
+                
+                return jsonify({
+                    'message': 'Equation updated and re-solved successfully',
+                    'status': 'success',
+                    'data': {'id': equation_id}
+                }), 200
+                
+            except Exception as db_error:
+                db.session.rollback()
+                return jsonify({
+                    'message': 'Equation updated but database save failed',
+                    'status': 'partial_success',
+                    'data': {'id': equation_id},
+                    'database_error': str(db_error)
+                }), 200
         
         # Store old values for response
         old_values = {
@@ -347,11 +657,15 @@ def update_equation(equation_id):
         equation.a = new_a
         equation.b = new_b
         equation.c = new_c
-        equation.solve_equation()  # Re-calculate solution
+        with server_timing.phase('solve'):
+            equation.solve_equation()  # Re-calculate solution
         
         # Save to database
         try:
             db.session.commit()
+            shared_cache.invalidate_equations([equation_id])
+            similarity.record_upsert([equation])
+            events.publish_updated([equation])
             
             return jsonify({
                 'message': 'Equation updated and re-solved successfully',
@@ -382,24 +696,55 @@ def update_equation(equation_id):
 
 @app.route('/api/equation/<int:equation_id>', methods=['DELETE'])
 def delete_equation(equation_id):
-    """Delete equation by ID"""
+    """
+    Delete equation by ID
+    Prefer: return=minimal skips reading the deleted row back and answers with only its id
+    """
     try:
-        # Find existing equation
-        equation = Equation.query.get(equation_id)
-        
-        if not equation:
-            return jsonify({
-                'message': f'Equation with ID {equation_id} not found',
-                'status': 'error'
-            }), 404
-        
-        # Store equation data for response before deletion
-        equation_data = equation.to_dict()
-        
-        # Delete from database
+        # Delete by primary key; the deleted row is read back in the same statement
+        # where the dialect supports DELETE ... RETURNING
         try:
-            db.session.delete(equation)
+            equation_data = None
+            if fieldsets.prefers_minimal():
+                # Nothing is read back: the row count tells whether it existed
+                deleted = db.session.execute(
+                    delete(Equation)
+                    .where(Equation.id == equation_id)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                equation_data = {'id': equation_id} if deleted else None
+            else:
+                if db.session.get_bind().dialect.delete_returning:
+                    equation = db.session.execute(
+                        delete(Equation)
+                        .where(Equation.id == equation_id)
+                        .returning(Equation)
+                        .execution_options(synchronize_session=False)
+                    ).scalar_one_or_none()
+                else:
+                    equation = db.session.get(Equation, equation_id)
+                    if equation:
+                        db.session.execute(
+                            delete(Equation)
+                            .where(Equation.id == equation_id)
+                            .execution_options(synchronize_session=False)
+                        )
+                
+                if equation:
+                    # Store equation data for response
+                    equation_data = equation.to_dict()
+            
+            if equation_data is None:
+                db.session.rollback()
+                return jsonify({
+                    'message': f'Equation with ID {equation_id} not found',
+                    'status': 'error'
+                }), 404
+            
             db.session.commit()
+            shared_cache.invalidate_equations([equation_id])
+            similarity.record_delete([equation_id])
+            events.publish_deleted([equation_id])
             
             return jsonify({
                 'message': f'Equation with ID {equation_id} deleted successfully',
@@ -427,6 +772,10 @@ def create_bulk_equations():
     """
     Create multiple equations at once
     Expected JSON: {"equations": [{"a": float, "b": float, "c": float}, ...]}
+    Prefer: return=minimal lists only the ids of created equations
+    ?dedup=true (default DEDUP_ENABLED) inserts only coefficients not stored yet: created_equations
+    still has one entry per valid item, in request order, and deduplicated_indexes names the
+    items answered with an equation stored before (see dedup.py)
     """
     try:
         if not request.is_json:
@@ -461,24 +810,25 @@ def create_bulk_equations():
         for i, eq_data in enumerate(data['equations']):
             try:
                 # Validate each equation
-                required_fields = ['a', 'b', 'c']
-                missing_fields = [field for field in required_fields if field not in eq_data]
-                
-                if missing_fields:
-                    errors.append({
-                        'index': i,
-                        'error': f'Missing required fields: {", ".join(missing_fields)}'
-                    })
-                    continue
-                
-                # Convert to float
-                a = float(eq_data['a'])
-                b = float(eq_data['b'])
-                c = float(eq_data['c'])
+                with server_timing.phase('validate'):
+                    required_fields = ['a', 'b', 'c']
+                    missing_fields = [field for field in required_fields if field not in eq_data]
+                    
+                    if missing_fields:
+                        errors.append({
+                            'index': i,
+                            'error': f'Missing required fields: {", ".join(missing_fields)}'
+                        })
+                        continue
+                    
+                    # Convert to float
+                    a = float(eq_data['a'])
+                    b = float(eq_data['b'])
+                    c = float(eq_data['c'])
                 
                 # Create equation
-                equation = Equation(a=a, b=b, c=c)
-                db.session.add(equation)
+                with server_timing.phase('solve'):
+                    equation = Equation(a=a, b=b, c=c)
                 created_equations.append(equation)
                 
             except (ValueError, TypeError) as e:
@@ -492,19 +842,41 @@ def create_bulk_equations():
                     'error': str(e)
                 })
         
-        # Commit all valid equations
+        # Insert all valid equations in one statement and commit
+        minimal = fieldsets.prefers_minimal()
+        deduplicating = dedup.requested()
+        returned_equations = created_equations
+        results = []
         try:
-            if created_equations:
+            if created_equations and deduplicating:
+                results, created_equations = dedup.create(created_equations)
+                returned_equations = [eq for eq, _ in results]
                 db.session.commit()
-                
-            return jsonify({
+            elif created_equations:
+                insert_equations(created_equations)
+                db.session.commit()
+            if created_equations:
+                similarity.record_upsert(created_equations)
+                events.publish_created(created_equations)
+            
+            response = {
                 'message': f'Bulk operation completed: {len(created_equations)} created, {len(errors)} errors',
                 'status': 'success' if len(errors) == 0 else 'partial_success',
                 'created_count': len(created_equations),
                 'error_count': len(errors),
-                'created_equations': [eq.to_dict() for eq in created_equations],
+                'created_equations': [
+                    {'id': eq.id} if minimal else eq.to_dict() for eq in returned_equations
+                ],
                 'errors': errors
-            }), 201 if len(errors) == 0 else 200
+            }
+            if deduplicating:
+                failed = {error['index'] for error in errors}
+                valid = [i for i in range(len(data['equations'])) if i not in failed]
+                response['deduplicated_indexes'] = [
+                    index for index, (_, deduplicated) in zip(valid, results) if deduplicated
+                ]
+                response['message'] += f', {len(response["deduplicated_indexes"])} already stored'
+            return jsonify(response), 201 if len(errors) == 0 and created_equations else 200
             
         except Exception as db_error:
             db.session.rollback()
@@ -521,48 +893,674 @@ def create_bulk_equations():
             'error': str(e)
         }), 500
 
+@app.route('/api/equations/bulk', methods=['PUT'])
+def update_bulk_equations():
+    """
+    Update and re-solve multiple equations at once
+    Expected JSON: {"equations": [{"id": int, "a": float, "b": float, "c": float}, ...]}
+    Runs as one SELECT of the targeted ids plus one UPDATE ... CASE in a single transaction
+    Prefer: return=minimal omits each result's data, so the SELECT reads ids only
+    """
+    try:
+        if not request.is_json:
+            return jsonify({
+                'message': 'Content-Type must be application/json',
+                'status': 'error'
+            }), 400
+        
+        data = request.get_json()
+        
+        if 'equations' not in data or not isinstance(data['equations'], list):
+            return jsonify({
+                'message': 'Request must contain "equations" array',
+                'status': 'error'
+            }), 400
+        
+        if len(data['equations']) == 0:
+            return jsonify({
+                'message': 'Equations array cannot be empty',
+                'status': 'error'
+            }), 400
+        
+        if len(data['equations']) > 50:  # Limit bulk operations
+            return jsonify({
+                'message': 'Maximum 50 equations allowed per bulk operation',
+                'status': 'error'
+            }), 400
+        
+        # Validate and re-solve every item before touching the database
+        solved = {}
+        errors = []
+        
+        for i, eq_data in enumerate(data['equations']):
+            with server_timing.phase('validate'):
+                required_fields = ['id', 'a', 'b', 'c']
+                missing_fields = [field for field in required_fields if field not in eq_data]
+                
+                if missing_fields:
+                    errors.append({
+                        'index': i,
+                        'error': f'Missing required fields: {", ".join(missing_fields)}'
+                    })
+                    continue
+                
+                try:
+                    equation_id = int(eq_data['id'])
+                    a = float(eq_data['a'])
+                    b = float(eq_data['b'])
+                    c = float(eq_data['c'])
+                except (ValueError, TypeError) as e:
+                    errors.append({
+                        'index': i,
+                        'error': f'Invalid id or coefficients: {str(e)}'
+                    })
+                    continue
+                
+                if equation_id in solved:
+                    errors.append({
+                        'index': i,
+                        'id': equation_id,
+                        'error': 'Duplicate id in request'
+                    })
+                    continue
+            
+            with server_timing.phase('solve'):
+                solved[equation_id] = Equation(a=a, b=b, c=c)
+        
+        results = []
+        now = datetime.utcnow()
+        minimal = fieldsets.prefers_minimal()
+        try:
+            existing = {}
+            if solved and minimal:
+                # Only existence is needed to report missing ids
+                for equation_id in db.session.execute(
+                    select(Equation.id).where(Equation.id.in_(list(solved)))
+                ).scalars():
+                    existing[equation_id] = solved[equation_id]
+                    existing[equation_id].id = equation_id
+                    existing[equation_id].updated_at = now
+            elif solved:
+                # Current rows are read once to report missing ids and fill created_at
+                existing = {
+                    equation.id: equation
+                    for equation in Equation.query.filter(Equation.id.in_(list(solved)))
+                }
+            
+            if existing:
+                ids = list(existing)
+                values = {
+                    column: case(
+                        {equation_id: getattr(solved[equation_id], column) for equation_id in ids},
+                        value=Equation.id
+                    )
+                    for column in ('a', 'b', 'c') + SOLUTION_COLUMNS
+                }
+                db.session.execute(
+                    update(Equation)
+                    .where(Equation.id.in_(ids))
+                    .values(updated_at=now, **values)
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+                shared_cache.invalidate_equations(ids)
+            
+            for equation_id, new_equation in solved.items():
+                equation = existing.get(equation_id)
+                if equation is None:
+                    results.append({'id': equation_id, 'status': 'not_found'})
+                    continue
+                if minimal:
+                    results.append({'id': equation_id, 'status': 'updated'})
+                    continue
+                
+                # Detach before copying new values so the session does not flush them again
+                db.session.expunge(equation)
+                for column in ('a', 'b', 'c') + SOLUTION_COLUMNS:
+                    setattr(equation, column, getattr(new_equation, column))
+                equation.updated_at = now
+                results.append({'id': equation_id, 'status': 'updated', 'data': equation.to_dict()})
+            
+            similarity.record_upsert(existing.values())
+            events.publish_updated(existing.values())
+            
+        except Exception as db_error:
+            db.session.rollback()
+            return jsonify({
+                'message': 'Bulk update failed during database save',
+                'status': 'error',
+                'error': str(db_error)
+            }), 500
+        
+        updated_count = sum(1 for result in results if result['status'] == 'updated')
+        not_found_count = len(results) - updated_count
+        
+        return jsonify({
+            'message': f'Bulk update completed: {updated_count} updated, {not_found_count} not found, {len(errors)} errors',
+            'status': 'success' if not_found_count == 0 and len(errors) == 0 else 'partial_success',
+            'updated_count': updated_count,
+            'not_found_count': not_found_count,
+            'error_count': len(errors),
+            'results': results,
+            'errors': errors
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'message': 'Bulk update failed',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/equations/bulk', methods=['DELETE'])
+def delete_bulk_equations():
+    """
+    Delete multiple equations at once
+    Expected JSON: {"ids": [int, ...]}
+               or: {"filter": {"solution_type": str, "created_before": iso8601, "created_after": iso8601}}
+    Runs as a single DELETE ... WHERE (plus one SELECT of the ids where the dialect lacks RETURNING)
+    """
+    try:
+        if not request.is_json:
+            return jsonify({
+                'message': 'Content-Type must be application/json',
+                'status': 'error'
+            }), 400
+        
+        data = request.get_json()
+        
+        with server_timing.phase('validate'):
+            if 'ids' in data:
+                if not isinstance(data['ids'], list) or len(data['ids']) == 0:
+                    return jsonify({
+                        'message': '"ids" must be a non-empty array',
+                        'status': 'error'
+                    }), 400
+                
+                if len(data['ids']) > 500:  # Limit bulk operations
+                    return jsonify({
+                        'message': 'Maximum 500 ids allowed per bulk delete',
+                        'status': 'error'
+                    }), 400
+                
+                try:
+                    requested_ids = list(dict.fromkeys(int(equation_id) for equation_id in data['ids']))
+                except (ValueError, TypeError) as e:
+                    return jsonify({
+                        'message': 'All ids must be integers',
+                        'status': 'error',
+                        'error': str(e)
+                    }), 400
+                
+                condition = Equation.id.in_(requested_ids)
+            
+            elif isinstance(data.get('filter'), dict) and data['filter']:
+                requested_ids = None
+                conditions = []
+                filters = data['filter']
+                unknown = set(filters) - {'solution_type', 'created_before', 'created_after'}
+                
+                if unknown:
+                    return jsonify({
+                        'message': f'Unsupported filter fields: {", ".join(sorted(unknown))}',
+                        'status': 'error'
+                    }), 400
+                
+                try:
+                    if 'solution_type' in filters:
+                        conditions.append(Equation.solution_type == str(filters['solution_type']))
+                    if 'created_before' in filters:
+                        conditions.append(Equation.created_at < datetime.fromisoformat(filters['created_before']))
+                    if 'created_after' in filters:
+                        conditions.append(Equation.created_at >= datetime.fromisoformat(filters['created_after']))
+                except (ValueError, TypeError) as e:
+                    return jsonify({
+                        'message': 'created_before/created_after must be ISO 8601 timestamps',
+                        'status': 'error',
+                        'error': str(e)
+                    }), 400
+                
+                condition = and_(*conditions)
+            
+            else:
+                return jsonify({
+                    'message': 'Request must contain "ids" array or non-empty "filter" object',
+                    'status': 'error'
+                }), 400
+        
+        try:
+            statement = delete(Equation).where(condition).execution_options(synchronize_session=False)
+            if db.session.get_bind().dialect.delete_returning:
+                deleted_ids = list(db.session.execute(statement.returning(Equation.id)).scalars())
+            else:
+                deleted_ids = list(db.session.execute(select(Equation.id).where(condition)).scalars())
+                if deleted_ids:
+                    db.session.execute(
+                        delete(Equation)
+                        .where(Equation.id.in_(deleted_ids))
+                        .execution_options(synchronize_session=False)
+                    )
+            db.session.commit()
+            shared_cache.invalidate_equations(deleted_ids)
+            similarity.record_delete(deleted_ids)
+            events.publish_deleted(deleted_ids)
+            
+        except Exception as db_error:
+            db.session.rollback()
+            return jsonify({
+                'message': 'Bulk delete failed during database save',
+                'status': 'error',
+                'error': str(db_error)
+            }), 500
+        
+        deleted_ids.sort()
+        if requested_ids is None:
+            results = [{'id': equation_id, 'status': 'deleted'} for equation_id in deleted_ids]
+        else:
+            deleted = set(deleted_ids)
+            results = [
+                {'id': equation_id, 'status': 'deleted' if equation_id in deleted else 'not_found'}
+                for equation_id in requested_ids
+            ]
+        not_found_count = len(results) - len(deleted_ids)
+        
+        return jsonify({
+            'message': f'Bulk delete completed: {len(deleted_ids)} deleted, {not_found_count} not found',
+            'status': 'success' if not_found_count == 0 else 'partial_success',
+            'deleted_count': len(deleted_ids),
+            'not_found_count': not_found_count,
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'message': 'Bulk delete failed',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/batch', methods=['POST'])
+def run_batch():
+    """
+    Run several operations in one request, in order
+    Expected JSON: {"operations": [{"op": "create", "a": 1, "b": -3, "c": 2},
+                                   {"op": "update", "id": "$0", "a": 1, "b": -5, "c": 6},
+                                   {"op": "get" | "delete", "id": int | "$<index>"},
+                                   {"op": "stats"}, ...],
+                    "atomic": true}
+    atomic (default true) runs everything in one transaction and rolls it all back on the first
+    failure; atomic=false commits each write separately and reports failures per operation.
+    Prefer: return=minimal answers creates, updates and deletes with only the id
+    """
+    try:
+        if not request.is_json:
+            return jsonify({
+                'message': 'Content-Type must be application/json',
+                'status': 'error'
+            }), 400
+        
+        data = request.get_json()
+        operations = data.get('operations') if isinstance(data, dict) else None
+        
+        if not isinstance(operations, list) or len(operations) == 0:
+            return jsonify({
+                'message': 'Request must contain a non-empty "operations" array',
+                'status': 'error'
+            }), 400
+        
+        if len(operations) > batch.MAX_OPERATIONS:
+            return jsonify({
+                'message': f'Maximum {batch.MAX_OPERATIONS} operations allowed per batch',
+                'status': 'error'
+            }), 400
+        
+        atomic = data.get('atomic', True)
+        if not isinstance(atomic, bool):
+            return jsonify({
+                'message': 'atomic must be true or false',
+                'status': 'error'
+            }), 400
+        
+        results, failed_index = batch.run(operations, atomic, fieldsets.prefers_minimal())
+        
+        if failed_index is not None:
+            failed = results[failed_index]
+            return jsonify({
+                'message': f'Batch rolled back: operation {failed_index} ({failed["op"]}) failed: {failed["error"]}',
+                'status': 'error',
+                'atomic': True,
+                'failed_index': failed_index,
+                'results': results
+            }), failed['status']
+        
+        error_count = sum(1 for result in results if 'error' in result)
+        return jsonify({
+            'message': f'Batch completed: {len(results) - error_count} succeeded, {error_count} failed',
+            'status': 'success' if error_count == 0 else 'partial_success',
+            'atomic': atomic,
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'message': 'Batch failed',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/equations', methods=['GET'])
+@coalesce.single_flight()
+def get_equations_by_ids():
+    """
+    Get several equations by id in one request (multi-get)
+    Query params: ids=1,2,3 (at most 100), fields (sparse fieldset)
+    Ids found in the shared cache are served from it; the rest are read with one SELECT ... IN.
+    data follows the order of ids; ids that do not exist are listed in not_found
+    """
+    try:
+        try:
+            ids = [int(value) for value in request.args.get('ids', '').split(',') if value.strip()]
+        except ValueError:
+            return jsonify({
+                'message': 'ids must be a comma-separated list of integers',
+                'status': 'error'
+            }), 400
+        
+        try:
+            fields = fieldsets.requested_fields()
+        except ValueError as e:
+            return jsonify({
+                'message': str(e),
+                'status': 'error'
+            }), 400
+        
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return jsonify({
+                'message': 'Provide ids, e.g. ?ids=1,2,3',
+                'status': 'error'
+            }), 400
+        
+        if len(ids) > 100:
+            return jsonify({
+                'message': 'Maximum 100 ids allowed per request',
+                'status': 'error'
+            }), 400
+        
+        found = {}
+        generations = {}
+        for equation_id in ids:
+            cached, generations[equation_id] = shared_cache.lookup_equation(equation_id)
+            if cached is not None:
+                found[equation_id] = fieldsets.project(cached, fields)
+        
+        missing = [equation_id for equation_id in ids if equation_id not in found]
+        if missing:
+            equations = Equation.query.options(*fieldsets.load_options(fields)).filter(Equation.id.in_(missing)).all()
+            for equation in equations:
+                found[equation.id] = equation.to_dict(fields)
+                if fields is None:
+                    shared_cache.store_equation(found[equation.id], generations[equation.id])
+        
+        not_found = [equation_id for equation_id in ids if equation_id not in found]
+        return jsonify({
+            'message': f'Retrieved {len(found)} equations, {len(not_found)} not found',
+            'status': 'success',
+            'count': len(found),
+            'data': [found[equation_id] for equation_id in ids if equation_id in found],
+            'not_found': not_found
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'message': 'Failed to retrieve equations',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
 @app.route('/api/equations/stats', methods=['GET'])
+@coalesce.single_flight()
 def get_equation_stats():
     """Get statistics about equations in database"""
     try:
-        total_count = Equation.query.count()
+        stats = equation_stats()
         
-        if total_count == 0:
+        if stats['total_equations'] == 0:
             return jsonify({
                 'message': 'No equations found in database',
                 'status': 'success',
-                'stats': {
-                    'total_equations': 0,
-                    'by_solution_type': {},
-                    'latest_equation': None
-                }
+                'stats': stats
             })
         
-        # Count by solution type
-        from sqlalchemy import func
-        solution_type_counts = db.session.query(
-            Equation.solution_type,
-            func.count(Equation.id)
-        ).group_by(Equation.solution_type).all()
+        return jsonify({
+            'message': f'Retrieved statistics for {stats["total_equations"]} equations',
+            'status': 'success',
+            'stats': stats
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'message': 'Failed to retrieve equation statistics',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/equations/search', methods=['GET'])
+@coalesce.single_flight()
+def search_equations_by_roots():
+    """
+    Search equations by numeric root values
+    Query params:
+      root_min, root_max  - a root's real part lies in [root_min, root_max]
+      imag_min, imag_max  - |imaginary part| of the roots lies in [imag_min, imag_max]
+      kind                - real | complex (default: any)
+      limit               - max rows returned (default 100, max 1000)
+      fields              - sparse fieldset, e.g. id,roots
+    Example: /api/equations/search?kind=real&root_min=2&root_max=3
+    """
+    try:
+        with server_timing.phase('validate'):
+            try:
+                bounds = {
+                    name: float(request.args[name])
+                    for name in ('root_min', 'root_max', 'imag_min', 'imag_max')
+                    if request.args.get(name, '') != ''
+                }
+                limit = int(request.args.get('limit', 100))
+            except ValueError as e:
+                return jsonify({
+                    'message': 'root_min, root_max, imag_min, imag_max and limit must be valid numbers',
+                    'status': 'error',
+                    'error': str(e)
+                }), 400
+            
+            kind = request.args.get('kind', 'any')
+            if kind not in ('any', 'real', 'complex'):
+                return jsonify({
+                    'message': 'kind must be one of: any, real, complex',
+                    'status': 'error'
+                }), 400
+            
+            if not bounds and kind == 'any':
+                return jsonify({
+                    'message': 'Provide at least one of root_min, root_max, imag_min, imag_max or kind',
+                    'status': 'error'
+                }), 400
+            
+            limit = max(1, min(limit, 1000))
+            
+            try:
+                fields = fieldsets.requested_fields(extra=('roots',))
+            except ValueError as e:
+                return jsonify({
+                    'message': str(e),
+                    'status': 'error'
+                }), 400
+        
+        # Conditions on root_imag lead both (root_imag, rootN_real) indexes
+        imag_conditions = [Equation.root_imag.isnot(None)]
+        if kind == 'real':
+            imag_conditions.append(Equation.root_imag == 0)
+        elif kind == 'complex':
+            imag_conditions.append(Equation.root_imag > 0)
+        if 'imag_min' in bounds:
+            imag_conditions.append(Equation.root_imag >= bounds['imag_min'])
+        if 'imag_max' in bounds:
+            imag_conditions.append(Equation.root_imag <= bounds['imag_max'])
+        
+        def root_in_range(column):
+            conditions = list(imag_conditions)
+            if 'root_min' in bounds:
+                conditions.append(column >= bounds['root_min'])
+            if 'root_max' in bounds:
+                conditions.append(column <= bounds['root_max'])
+            return and_(*conditions)
         
-        by_solution_type = {solution_type: count for solution_type, count in solution_type_counts}
+        if 'root_min' in bounds or 'root_max' in bounds:
+            # One branch per root column so each can use its own index (index merge union)
+            condition = or_(root_in_range(Equation.root1_real), root_in_range(Equation.root2_real))
+        else:
+            condition = and_(*imag_conditions)
         
-        # Get latest equation
-        latest_equation = Equation.query.order_by(Equation.created_at.desc()).first()
+        equations = Equation.query.filter(condition).order_by(Equation.id).limit(limit).all()
         
         return jsonify({
-            'message': f'Retrieved statistics for {total_count} equations',
+            'message': f'Found {len(equations)} equations',
             'status': 'success',
-            'stats': {
-                'total_equations': total_count,
-                'by_solution_type': by_solution_type,
-                'latest_equation': latest_equation.to_dict() if latest_equation else None
-            }
+            'count': len(equations),
+            'limit': limit,
+            'data': [
+                dict(eq.to_dict(fields), roots=eq.roots_dict()) if fields is None or 'roots' in fields
+                else eq.to_dict(fields)
+                for eq in equations
+            ]
         })
         
     except Exception as e:
         return jsonify({
-            'message': 'Failed to retrieve equation statistics',
+            'message': 'Failed to search equations',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/equations/similar', methods=['GET'])
+@coalesce.single_flight()
+def find_similar_equations():
+    """
+    Find the k stored equations closest to (a, b, c) in coefficient space
+    Query params:
+      a, b, c    - coefficients (required)
+      k          - number of neighbours (default 5, max SIMILARITY_MAX_K)
+      normalize  - true compares scale-free coefficients, so 2x² - 10x + 12 matches x² - 5x + 6
+      fields     - sparse fieldset, e.g. id,distance
+    Served from the worker's in-memory k-d tree (see similarity.py); only the k hits are read from the database
+    Example: /api/equations/similar?a=1&b=-5&c=6&k=3
+    """
+    try:
+        with server_timing.phase('validate'):
+            missing_fields = [field for field in ('a', 'b', 'c') if request.args.get(field, '') == '']
+            if missing_fields:
+                return jsonify({
+                    'message': f'Missing required query params: {", ".join(missing_fields)}',
+                    'status': 'error',
+                    'required_fields': ['a', 'b', 'c']
+                }), 400
+            
+            try:
+                a = float(request.args['a'])
+                b = float(request.args['b'])
+                c = float(request.args['c'])
+                k = int(request.args.get('k', 5))
+            except ValueError as e:
+                return jsonify({
+                    'message': 'a, b, c and k must be valid numbers',
+                    'status': 'error',
+                    'error': str(e)
+                }), 400
+            
+            k = max(1, min(k, current_app.config['SIMILARITY_MAX_K']))
+            normalize = request.args.get('normalize', 'false').lower() == 'true'
+            
+            try:
+                fields = fieldsets.requested_fields(extra=('distance',))
+            except ValueError as e:
+                return jsonify({
+                    'message': str(e),
+                    'status': 'error'
+                }), 400
+        
+        neighbours = similarity.find_similar(a, b, c, k, normalize=normalize)
+        
+        return jsonify({
+            'message': f'Found {len(neighbours)} similar equations',
+            'status': 'success',
+            'count': len(neighbours),
+            'k': k,
+            'normalized': normalize,
+            'data': [
+                dict(eq.to_dict(fields), distance=distance) if fields is None or 'distance' in fields
+                else eq.to_dict(fields)
+                for distance, eq in neighbours
+            ]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'message': 'Failed to find similar equations',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events stream of committed equation creates, updates and deletes
+    Reconnecting clients send Last-Event-ID (or ?last_event_id=) to replay what they missed.
+    Served here only in development; with EVENTS_PUBLISH_ADDR set the feed lives in the events
+    service (events_server.py) so that idle streams never hold API worker threads.
+    """
+    if current_app.config['EVENTS_PUBLISH_ADDR']:
+        if current_app.config['EVENTS_STREAM_URL']:
+            return redirect(current_app.config['EVENTS_STREAM_URL'], code=307)
+        return jsonify({
+            'message': 'The change feed is served by the events service',
+            'status': 'error'
+        }), 404
+    return events.stream_response()
+
+@app.route('/api/metrics', methods=['GET'])
+def get_worker_metrics():
+    """Load-handling counters of the worker that serves this request"""
+    try:
+        return jsonify({
+            'message': 'Retrieved worker metrics',
+            'status': 'success',
+            'pid': os.getpid(),
+            'metrics': {
+                'admission': admission.stats(),
+                'coalescing': coalesce.stats()
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'message': 'Failed to retrieve worker metrics',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss counters of the worker that serves this request, plus shared cache occupancy"""
+    try:
+        return jsonify({
+            'message': 'Retrieved cache statistics',
+            'status': 'success',
+            'stats': shared_cache.stats()
+        })
+    except Exception as e:
+        return jsonify({
+            'message': 'Failed to retrieve cache statistics',
             'status': 'error',
             'error': str(e)
         }), 500
@@ -0,0 +1,361 @@
+"""
+Cold storage for the equations table
+Exports old monthly partitions to zstd-compressed Parquet files, drops them from MySQL
+and serves archived rows by id (slow path, only when explicitly requested)
+
+Usage (inside the backend container, e.g. from a monthly cron job):
+    python archive.py ensure  [--months-ahead 3]      # pre-create upcoming partitions
+    python archive.py archive [--retention-months 12] [--dry-run]
+    python archive.py prune   [--tombstone-retention-days 30]  # trim the delta-sync deletion log
+    python archive.py run                             # ensure + archive + prune
+"""
+import os
+import re
+import json
+import logging
+import argparse
+from datetime import date, datetime
+
+import canonical
+from models import Equation
+
+logger = logging.getLogger('gptb2.archive')
+
+# Every stored column, so an archived row keeps everything a live one has
+ARCHIVE_COLUMNS = tuple(column.name for column in Equation.__table__.columns)
+MANIFEST_NAME = 'manifest.json'
+PARTITION_PATTERN = re.compile(r'^p(\d{4})(\d{2})$')
+EXPORT_BATCH_SIZE = 50000
+
+_manifest_cache = {}
+
+
+def _pyarrow():
+    """Import pyarrow lazily; only archival and archived reads need it"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError('pyarrow is required for equation archival (pip install pyarrow)') from e
+    return pyarrow, pyarrow.parquet
+
+
+def add_months(month, count):
+    """Return the first day of the month `count` months after `month`"""
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """Partition holding rows created in `month`, e.g. p202501"""
+    return f'p{month.year}{month.month:02d}'
+
+
+def partition_month(name):
+    """Inverse of partition_name(); None for p_future and foreign partitions"""
+    match = PARTITION_PATTERN.match(name or '')
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def future_partitions_sql(existing_names, today, months_ahead):
+    """
+    Build the REORGANIZE statement splitting the months up to `months_ahead` off p_future,
+    or None when they already exist
+    """
+    existing = [partition_month(name) for name in existing_names if partition_month(name)]
+    start = add_months(max(existing), 1) if existing else date(today.year, today.month, 1)
+    last = add_months(date(today.year, today.month, 1), months_ahead)
+
+    definitions = []
+    month = start
+    while month <= last:
+        definitions.append(
+            f"PARTITION {partition_name(month)} VALUES LESS THAN ('{add_months(month, 1).isoformat()}')"
+        )
+        month = add_months(month, 1)
+
+    if not definitions:
+        return None
+    definitions.append('PARTITION p_future VALUES LESS THAN (MAXVALUE)')
+    return f"ALTER TABLE equations REORGANIZE PARTITION p_future INTO ({', '.join(definitions)})"
+
+
+def manifest_path(archive_dir):
+    return os.path.join(archive_dir, MANIFEST_NAME)
+
+
+def load_manifest(archive_dir):
+    """Read the archive manifest (cached until the file changes)"""
+    path = manifest_path(archive_dir)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {'files': []}
+
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    _manifest_cache[path] = (mtime, manifest)
+    return manifest
+
+
+def save_manifest(archive_dir, manifest):
+    """Write the manifest atomically so readers never see a partial file"""
+    path = manifest_path(archive_dir)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _schema(pa):
+    """Parquet schema of ARCHIVE_COLUMNS, typed from the model's columns"""
+    from sqlalchemy import DateTime, Float, Integer, String
+    types = ((Integer, pa.int64()), (Float, pa.float64()), (String, pa.string()), (DateTime, pa.timestamp('us')))
+    columns = Equation.__table__.columns
+    return pa.schema([
+        (name, next(arrow for sql_type, arrow in types if isinstance(columns[name].type, sql_type)))
+        for name in ARCHIVE_COLUMNS
+    ])
+
+
+def write_archive(archive_dir, partition, row_batches):
+    """
+    Write batches of row tuples (ARCHIVE_COLUMNS order) to <archive_dir>/equations_<partition>.parquet
+    and register the file in the manifest. Returns the manifest entry.
+    """
+    pa, pq = _pyarrow()
+    os.makedirs(archive_dir, exist_ok=True)
+
+    filename = f'equations_{partition}.parquet'
+    path = os.path.join(archive_dir, filename)
+    tmp_path = path + '.tmp'
+    schema = _schema(pa)
+
+    row_count = 0
+    min_id = max_id = max_updated_at = None
+    updated_at_index = ARCHIVE_COLUMNS.index('updated_at')
+    with pq.ParquetWriter(tmp_path, schema, compression='zstd', compression_level=9) as writer:
+        for rows in row_batches:
+            if not rows:
+                continue
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            row_count += len(rows)
+            batch_min, batch_max = min(columns[0]), max(columns[0])
+            min_id = batch_min if min_id is None else min(min_id, batch_min)
+            max_id = batch_max if max_id is None else max(max_id, batch_max)
+            updated = [value for value in columns[updated_at_index] if value is not None]
+            if updated:
+                max_updated_at = max(updated + ([max_updated_at] if max_updated_at else []))
+
+    # Never drop a partition whose export cannot be read back completely
+    if pq.read_metadata(tmp_path).num_rows != row_count:
+        os.remove(tmp_path)
+        raise RuntimeError(f'Archive verification failed for partition {partition}')
+    os.replace(tmp_path, path)
+
+    entry = {
+        'partition': partition,
+        'file': filename,
+        'row_count': row_count,
+        'min_id': min_id,
+        'max_id': max_id,
+        # Checked again right before the partition is dropped (see archive_old_partitions)
+        'max_updated_at': max_updated_at.isoformat() if max_updated_at else None,
+        'archived_at': datetime.utcnow().isoformat()
+    }
+    manifest = load_manifest(archive_dir)
+    files = [f for f in manifest['files'] if f['partition'] != partition]
+    save_manifest(archive_dir, {'files': files + [entry]})
+    return entry
+
+
+def discard_archive(archive_dir, partition):
+    """Remove a partition's export and manifest entry (the partition itself is kept)"""
+    manifest = load_manifest(archive_dir)
+    for entry in manifest['files']:
+        if entry['partition'] == partition:
+            path = os.path.join(archive_dir, entry['file'])
+            if os.path.exists(path):
+                os.remove(path)
+    save_manifest(archive_dir, {'files': [f for f in manifest['files'] if f['partition'] != partition]})
+
+
+def _archived_to_dict(row):
+    """Shape an archived row like Equation.to_dict()"""
+    return {
+        'id': row['id'],
+        'a': row['a'],
+        'b': row['b'],
+        'c': row['c'],
+        'solution': row['solution'],
+        'discriminant': row['discriminant'],
+        'solution_type': row['solution_type'],
+        'equation_string': f"{row['a']}x² + {row['b']}x + {row['c']} = 0",
+        # Files archived before the column existed do not have it
+        'canonical_hash': row.get('canonical_hash') or canonical.canonical_hash(row['a'], row['b'], row['c']),
+        'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+        'updated_at': row['updated_at'].isoformat() if row['updated_at'] else None,
+        'archived': True
+    }
+
+
+def find_archived_equation(archive_dir, equation_id):
+    """
+    Look up one archived equation by id. The manifest's id ranges select candidate files,
+    and Parquet row-group statistics let pyarrow skip most of each file.
+    """
+    candidates = [
+        entry for entry in load_manifest(archive_dir)['files']
+        if entry['row_count'] and entry['min_id'] <= equation_id <= entry['max_id']
+    ]
+    if not candidates:
+        return None
+
+    _, pq = _pyarrow()
+    for entry in candidates:
+        table = pq.read_table(
+            os.path.join(archive_dir, entry['file']),
+            filters=[('id', '=', equation_id)]
+        )
+        if table.num_rows:
+            return _archived_to_dict(table.slice(0, 1).to_pylist()[0])
+    return None
+
+
+def list_partitions(connection):
+    """Return partition names of the equations table in range order"""
+    from sqlalchemy import text
+    result = connection.execute(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'equations' "
+        "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+    ))
+    return [row[0] for row in result]
+
+
+def ensure_future_partitions(connection, months_ahead, today=None):
+    """Split upcoming months off p_future so new rows never pile up in it"""
+    from sqlalchemy import text
+    statement = future_partitions_sql(list_partitions(connection), today or date.today(), months_ahead)
+    if statement:
+        logger.info(statement)
+        connection.execute(text(statement))
+    return statement
+
+
+def _partition_batches(connection, partition):
+    from sqlalchemy import text
+    result = connection.execution_options(stream_results=True).execute(text(
+        f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM equations PARTITION ({partition}) ORDER BY id"
+    ))
+    while True:
+        rows = result.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            break
+        yield [tuple(row) for row in rows]
+
+
+def archive_old_partitions(engine, archive_dir, retention_months, today=None, dry_run=False):
+    """
+    Export every monthly partition that ended more than `retention_months` ago,
+    then drop it. Returns the manifest entries written.
+    """
+    from sqlalchemy import text
+    today = today or date.today()
+    cutoff = add_months(date(today.year, today.month, 1), -retention_months)
+
+    with engine.connect() as connection:
+        expired = [
+            name for name in list_partitions(connection)
+            if partition_month(name) and add_months(partition_month(name), 1) <= cutoff
+        ]
+
+    entries = []
+    for partition in expired:
+        if dry_run:
+            logger.info("Would archive partition %s", partition)
+            continue
+        with engine.connect() as connection:
+            entry = write_archive(archive_dir, partition, _partition_batches(connection, partition))
+
+        # Writes are blocked from the check to the drop, so nothing committed after the
+        # export can be dropped with the partition. A row updated or deleted during the
+        # export fails the check; the partition stays and the next run exports it again
+        with engine.connect() as connection:
+            connection.execute(text("LOCK TABLES equations WRITE"))
+            try:
+                live = connection.execute(text(
+                    f"SELECT COUNT(*), MAX(updated_at) FROM equations PARTITION ({partition})"
+                )).one()
+                if not export_matches(entry, live[0], live[1]):
+                    logger.warning("Partition %s changed during its export (%s rows, last update %s); "
+                                   "kept, will be archived on the next run", partition, live[0], live[1])
+                    discard_archive(archive_dir, partition)
+                    continue
+                connection.execute(text(f"ALTER TABLE equations DROP PARTITION {partition}"))
+            finally:
+                connection.execute(text("UNLOCK TABLES"))
+        logger.info("Archived partition %s (%d rows) to %s", partition, entry['row_count'], entry['file'])
+        entries.append(entry)
+    return entries
+
+
+def export_matches(entry, row_count, max_updated_at):
+    """True when a partition still has the row count and latest update its export recorded"""
+    recorded = entry.get('max_updated_at')
+    live = max_updated_at.isoformat() if max_updated_at else None
+    return row_count == entry['row_count'] and live == recorded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive old equations partitions to Parquet')
+    parser.add_argument('command', choices=['ensure', 'archive', 'prune', 'run'])
+    parser.add_argument('--months-ahead', type=int, default=3)
+    parser.add_argument('--retention-months', type=int, default=int(os.getenv('ARCHIVE_RETENTION_MONTHS', '12')))
+    parser.add_argument('--archive-dir', default=os.getenv('ARCHIVE_DIR', '/app/archive'))
+    parser.add_argument('--tombstone-retention-days', type=int,
+                        default=int(os.getenv('DELTA_TOMBSTONE_RETENTION_DAYS', '30')))
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from app import app
+    from models import db
+
+    with app.app_context():
+        if args.command in ('ensure', 'run'):
+            with db.engine.begin() as connection:
+                statement = ensure_future_partitions(connection, args.months_ahead)
+            print(f"✅ Partitions up to date{': ' + statement if statement else ''}")
+
+        if args.command in ('archive', 'run'):
+            entries = archive_old_partitions(
+                db.engine, args.archive_dir, args.retention_months, dry_run=args.dry_run
+            )
+            print(f"✅ Archived {len(entries)} partitions to {args.archive_dir}")
+            if entries:
+                # Dropped rows must stop being served from the host-wide GET-by-id cache
+                import shared_cache
+                cache = shared_cache.get_cache(app)
+                if cache is not None:
+                    cache.clear()
+
+        if args.command in ('prune', 'run') and not args.dry_run:
+            import delta_sync
+            with db.engine.begin() as connection:
+                removed = delta_sync.prune_deletion_log(connection, args.tombstone_retention_days)
+            print(f"✅ Pruned {removed} deletion-log entries older than {args.tombstone_retention_days} days")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Batched operations for POST /api/batch
+
+One request carries an ordered list of sub-operations (create, get, update, delete, stats),
+so a client flow such as "create, then read the stats, then list" costs one round-trip.
+
+- atomic (default): every operation runs in one transaction, committed once at the end; the
+  first failing operation rolls the whole batch back
+- non-atomic: each write is committed on its own and failures are reported per operation
+- an "id" of "$<n>" refers to the id returned by the n-th operation of the same batch
+- reads inside the transaction see the batch's own uncommitted writes, so they go to the
+  database rather than the shared cache
+- cache invalidation, index updates and change-feed events run only after a commit
+"""
+from models import db, Equation, equation_stats
+import events
+import shared_cache
+import similarity
+
+MAX_OPERATIONS = 50
+OPERATIONS = ('create', 'get', 'update', 'delete', 'stats')
+WRITES = ('create', 'update', 'delete')
+
+
+class OperationError(Exception):
+    """A sub-operation that cannot run, with the HTTP status it would have on its own"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class Effects:
+    """Side effects of committed writes, applied once the transaction is durable"""
+
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.deleted = []
+
+    def apply(self):
+        deleted = set(self.deleted)
+        if self.updated or deleted:
+            shared_cache.invalidate_equations([eq.id for eq in self.updated] + self.deleted)
+        upserted = [eq for eq in self.created + self.updated if eq.id not in deleted]
+        if upserted:
+            similarity.record_upsert(upserted)
+        if deleted:
+            similarity.record_delete(self.deleted)
+        if self.created:
+            events.publish_created(self.created)
+        if self.updated:
+            events.publish_updated(self.updated)
+        if self.deleted:
+            events.publish_deleted(self.deleted)
+
+
+def _coefficients(operation):
+    missing = [field for field in ('a', 'b', 'c') if field not in operation]
+    if missing:
+        raise OperationError(f'Missing required fields: {", ".join(missing)}')
+    try:
+        return float(operation['a']), float(operation['b']), float(operation['c'])
+    except (ValueError, TypeError):
+        raise OperationError('Coefficients a, b, c must be valid numbers')
+
+
+def _equation_id(operation, results):
+    """Integer id of an operation, resolving "$<n>" references to earlier results"""
+    value = operation.get('id')
+    if isinstance(value, str) and value.startswith('$'):
+        # Digits only: int() would also take "-1", which Python indexing resolves from the end
+        reference = value[1:]
+        if not (reference.isascii() and reference.isdigit()) or int(reference) >= len(results):
+            raise OperationError(f'id {value} does not refer to an earlier operation')
+        referenced = results[int(reference)]
+        if 'data' not in referenced or 'id' not in referenced['data']:
+            raise OperationError(f'Operation {value[1:]} has no id to refer to')
+        return referenced['data']['id']
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise OperationError('id must be an integer or "$<index>" of an earlier operation')
+    return value
+
+
+def _find(equation_id):
+    equation = db.session.get(Equation, equation_id)
+    if equation is None:
+        raise OperationError(f'Equation with ID {equation_id} not found', 404)
+    return equation
+
+
+def _execute(operation, results, effects, minimal):
+    """Run one operation in the current transaction; returns (status, data)"""
+    kind = operation.get('op')
+
+    if kind == 'create':
+        equation = Equation(*_coefficients(operation))
+        db.session.add(equation)
+        db.session.flush()
+        effects.created.append(equation)
+        return 201, {'id': equation.id} if minimal else equation.to_dict()
+
+    if kind == 'get':
+        return 200, _find(_equation_id(operation, results)).to_dict()
+
+    if kind == 'update':
+        equation = _find(_equation_id(operation, results))
+        equation.a, equation.b, equation.c = _coefficients(operation)
+        equation.solve_equation()
+        db.session.flush()
+        if equation not in effects.updated:
+            effects.updated.append(equation)
+        return 200, {'id': equation.id} if minimal else equation.to_dict()
+
+    if kind == 'delete':
+        equation = _find(_equation_id(operation, results))
+        data = {'id': equation.id} if minimal else equation.to_dict()
+        db.session.delete(equation)
+        db.session.flush()
+        effects.deleted.append(equation.id)
+        return 200, data
+
+    if kind == 'stats':
+        return 200, equation_stats()
+
+    raise OperationError(f'op must be one of: {", ".join(OPERATIONS)}')
+
+
+def run(operations, atomic=True, minimal=False):
+    """
+    Execute operations in order.
+    Returns (results, failed_index): one {"op", "status", "data" | "error"} per operation run;
+    failed_index is the operation that rolled back an atomic batch, else None
+    """
+    results = []
+    effects = Effects()
+
+    for index, operation in enumerate(operations):
+        kind = operation.get('op') if isinstance(operation, dict) else None
+        if not atomic:
+            effects = Effects()
+        try:
+            if not isinstance(operation, dict):
+                raise OperationError('Each operation must be an object')
+            status, data = _execute(operation, results, effects, minimal)
+            if not atomic and kind in WRITES:
+                db.session.commit()
+                effects.apply()
+            results.append({'op': kind, 'status': status, 'data': data})
+
+        except Exception as e:
+            # Atomic: the whole batch is undone. Non-atomic: only this operation was pending
+            db.session.rollback()
+            status = e.status if isinstance(e, OperationError) else 500
+            results.append({'op': kind, 'status': status, 'error': str(e)})
+            if atomic:
+                return results, index
+
+    if atomic:
+        db.session.commit()
+        effects.apply()
+    return results, None
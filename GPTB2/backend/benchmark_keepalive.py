@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Load test cho keep-alive: throughput và latency khi tái sử dụng kết nối so với mở kết nối mới
+Runs concurrent clients for a fixed time against one URL, either reusing one HTTP/1.1
+connection per client (--mode keepalive) or opening a new TCP connection per request
+(--mode close, what nginx did towards the backend before the upstream keepalive pool).
+
+Through nginx (end to end, compare before/after the nginx.conf change):
+    python benchmark_keepalive.py --url http://localhost/api/equation?limit=20
+Directly against one backend, both modes side by side (the cost the upstream pool removes):
+    python benchmark_keepalive.py --url http://localhost:5000/api/equation?limit=20 --mode both
+
+Usage:
+    python benchmark_keepalive.py [--url URL] [--concurrency 16] [--duration 10] [--mode keepalive|close|both]
+"""
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def client(url, keepalive, deadline, samples, errors, lock):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    headers = {} if keepalive else {'Connection': 'close'}
+    local_samples, local_errors = [], 0
+    connection = None
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = connection_class(parts.hostname, parts.port, timeout=10)
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors += 1
+            if not keepalive or response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            if connection is not None:
+                connection.close()
+            connection = None
+            continue
+        local_samples.append((time.perf_counter() - started) * 1000)
+
+    if connection is not None:
+        connection.close()
+    with lock:
+        samples.extend(local_samples)
+        errors.append(local_errors)
+
+
+def run(url, keepalive, concurrency, duration):
+    samples, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=client, args=(url, keepalive, deadline, samples, errors, lock))
+               for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare keep-alive and connection-per-request load')
+    parser.add_argument('--url', default='http://localhost/api/equation?limit=20')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--mode', choices=['keepalive', 'close', 'both'], default='keepalive')
+    args = parser.parse_args()
+
+    modes = ['close', 'keepalive'] if args.mode == 'both' else [args.mode]
+    print(f"{args.url}, {args.concurrency} clients, {args.duration:g} s per mode\n")
+    print(f"{'mode':>9} | {'requests':>8} | {'req/s':>8} | {'p50 ms':>7} | {'p95 ms':>7} | "
+          f"{'p99 ms':>7} | {'errors':>6}")
+    print('-' * 70)
+
+    for mode in modes:
+        samples, errors = run(args.url, mode == 'keepalive', args.concurrency, args.duration)
+        if not samples:
+            print(f"{mode:>9} | no successful requests ({errors} errors)")
+            continue
+        print(f"{mode:>9} | {len(samples):>8} | {len(samples) / args.duration:>8.0f} | "
+              f"{percentile(samples, 0.50):>7.2f} | {percentile(samples, 0.95):>7.2f} | "
+              f"{percentile(samples, 0.99):>7.2f} | {errors:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark throughput theo số backend replica (1 → N) sau nginx least_conn
+For each replica count: scales the compose backend service, restarts the frontend so nginx
+resolves the new replica set, waits until the API answers, then runs the keep-alive load of
+benchmark_keepalive.py against the API entry point.
+
+All load comes from one client address, so start the stack with the per-client rate limit
+raised out of the way (ADMISSION_RATE_PER_SECOND=100000 docker compose up -d), then run from
+GPTB2/backend:
+    python benchmark_replicas.py [--replicas 1 2 4] [--url http://localhost:5000/api/equation?limit=20]
+                                 [--concurrency 32] [--duration 20]
+"""
+import time
+import argparse
+import subprocess
+import urllib.request
+from pathlib import Path
+from benchmark_keepalive import run, percentile
+
+COMPOSE_FILE = Path(__file__).resolve().parent.parent / 'docker-compose.yaml'
+
+
+def compose(*args):
+    subprocess.run(['docker', 'compose', '-f', str(COMPOSE_FILE), *args], check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def wait_ready(url, replicas, timeout=120):
+    """Wait until the API answers through nginx and `replicas` backends report healthy"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        healthy = subprocess.run(
+            ['docker', 'ps', '--filter', 'label=com.docker.compose.service=backend',
+             '--filter', 'health=healthy', '--format', '{{.Names}}'],
+            capture_output=True, text=True
+        ).stdout.split()
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                if response.status == 200 and len(healthy) >= replicas:
+                    return
+        except OSError:
+            pass
+        time.sleep(2)
+    raise RuntimeError(f"{replicas} backend replicas not ready after {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput from 1 to N backend replicas')
+    parser.add_argument('--replicas', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--url', default='http://localhost:5000/api/equation?limit=20')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.url}, {args.concurrency} clients, {args.duration:g} s per step\n")
+    print(f"{'replicas':>8} | {'req/s':>8} | {'speedup':>7} | {'p50 ms':>7} | {'p99 ms':>7} | {'errors':>6}")
+    print('-' * 60)
+
+    baseline = None
+    for replicas in args.replicas:
+        compose('up', '-d', '--no-recreate', '--scale', f'backend={replicas}', 'backend')
+        compose('restart', 'frontend')
+        wait_ready(args.url, replicas)
+
+        samples, errors = run(args.url, True, args.concurrency, args.duration)
+        if not samples:
+            print(f"{replicas:>8} | no successful requests ({errors} errors)")
+            continue
+        throughput = len(samples) / args.duration
+        baseline = baseline or throughput
+        print(f"{replicas:>8} | {throughput:>8.0f} | {throughput / baseline:>6.2f}x | "
+              f"{percentile(samples, 0.50):>7.2f} | {percentile(samples, 0.99):>7.2f} | {errors:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark cho API wire formats: payload size và encode/decode time của JSON, MessagePack, CBOR
+Uses the list response shape ({"message", "status", "count", "data": [to_dict(), ...]}).
+
+Usage:
+    python benchmark_serialization.py [--rows 1000] [--repeat 50]
+"""
+import gzip
+import json
+import time
+import random
+import argparse
+from datetime import datetime
+from models import Equation
+from serialization import CODECS
+
+
+def list_payload(rows):
+    rng = random.Random(7)
+    data = []
+    for i in range(1, rows + 1):
+        equation = Equation(rng.uniform(-100, 100), rng.uniform(-100, 100), rng.uniform(-100, 100))
+        equation.id = i
+        equation.created_at = equation.updated_at = datetime(2025, 1, 1, 12, 0, 0)
+        data.append(equation.to_dict())
+    return {'message': f'Retrieved {rows} equations', 'status': 'success', 'count': rows, 'data': data}
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON, MessagePack and CBOR for API payloads')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    payload = list_payload(args.rows)
+    # Same settings as Flask's jsonify() in production (sorted keys, ASCII-only, compact)
+    formats = [('application/json',
+                lambda obj: json.dumps(obj, separators=(',', ':'), sort_keys=True).encode('utf-8'),
+                json.loads)]
+    formats += [(codec.mimetype, codec.dumps, codec.loads) for codec in CODECS]
+
+    print(f"List response with {args.rows} equations, best of {args.repeat} runs\n")
+    print(f"{'format':<20} | {'bytes':>9} | {'gzip bytes':>10} | {'encode ms':>9} | {'decode ms':>9}")
+    print('-' * 70)
+    for mimetype, dumps, loads in formats:
+        body = dumps(payload)
+        assert loads(body) == payload
+        print(f"{mimetype:<20} | {len(body):>9} | {len(gzip.compress(body, 6)):>10} | "
+              f"{best_of(args.repeat, lambda: dumps(payload)):>9.2f} | {best_of(args.repeat, lambda: loads(body)):>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark cho similar-equations index: query latency theo kích thước bảng
+Compares the k-d tree (similarity.KDTree) with a linear scan over the same points.
+
+Usage:
+    python benchmark_similarity.py [--sizes 1000 10000 100000] [--queries 200] [--k 5]
+"""
+import sys
+import time
+import math
+import random
+import argparse
+import statistics
+from similarity import KDTree
+
+
+def random_points(rng, count):
+    return [(i, (rng.uniform(-100, 100), rng.uniform(-100, 100), rng.uniform(-100, 100)))
+            for i in range(1, count + 1)]
+
+
+def linear_scan(items, query, k):
+    return sorted((math.dist(point, query), item_id) for item_id, point in items)[:k]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def timed(fn, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark k-NN query latency vs table size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    print(f"Python {sys.version.split()[0]}, k={args.k}, {args.queries} queries per size\n")
+    print(f"{'rows':>8} | {'build ms':>9} | {'kd p50 ms':>9} | {'kd p99 ms':>9} | "
+          f"{'scan p50 ms':>11} | {'insert us':>9} | {'delete us':>9}")
+    print('-' * 84)
+
+    for size in args.sizes:
+        items = random_points(rng, size)
+        queries = [tuple(rng.uniform(-100, 100) for _ in range(3)) for _ in range(args.queries)]
+
+        started = time.perf_counter()
+        tree = KDTree(items)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        kd = timed(lambda q: tree.nearest(q, args.k), queries)
+        scan = timed(lambda q: linear_scan(items, q, args.k), queries[:max(1, args.queries // 10)])
+
+        # Incremental maintenance cost, amortized over rebuilds
+        started = time.perf_counter()
+        for i in range(size + 1, size + 1001):
+            tree.insert(i, (rng.uniform(-100, 100), rng.uniform(-100, 100), rng.uniform(-100, 100)))
+        insert_us = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        for i in range(1, 1001):
+            tree.remove(i)
+        delete_us = (time.perf_counter() - started) * 1000
+
+        print(f"{size:>8} | {build_ms:>9.1f} | {statistics.median(kd):>9.3f} | {percentile(kd, 0.99):>9.3f} | "
+              f"{statistics.median(scan):>11.3f} | {insert_us:>9.2f} | {delete_us:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Scale-invariant canonical form of an equation
+
+k·(a, b, c) is the same equation for any k != 0: (1, -5, 6) and (2, -10, 12) have the same
+roots and solution text. The canonical form divides by the leading (first non-zero)
+coefficient and rounds each ratio to SIGNIFICANT_DIGITS significant digits; its hash is
+stored in equations.canonical_hash (idx_canonical_hash), so the list filter, caches and
+dedup checks can key on it instead of on raw floats.
+
+The rounding is what makes the form well-defined: coefficients are stored as single-precision
+FLOAT (~7 digits), so 0.6 / 0.1 read back from MySQL is 5.99999994..., not 6. Six digits
+absorb that noise; equations that agree to six significant digits share a hash.
+
+Usage (inside the backend container, once after mysql/upgrade/04-add-canonical-hash.sql):
+    python canonical.py backfill [--batch-size 5000]
+"""
+import hashlib
+import argparse
+import re
+
+SIGNIFICANT_DIGITS = 6
+HASH_LENGTH = 32
+HASH_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _round(value):
+    # float(text) of a fixed number of significant digits; + 0.0 turns -0.0 into 0.0
+    return float(f'{value:.{SIGNIFICANT_DIGITS}g}') + 0.0
+
+
+def canonical_form(a, b, c):
+    """(a, b, c) divided by the leading non-zero coefficient and rounded; (0, 0, 0) stays"""
+    leading = next((value for value in (a, b, c) if value != 0), None)
+    if leading is None:
+        return (0.0, 0.0, 0.0)
+    return tuple(_round(value / leading) for value in (a, b, c))
+
+
+def canonical_hash(a, b, c):
+    """Hex hash of the canonical form, equal for all scalar multiples of an equation"""
+    text = ','.join(repr(value) for value in canonical_form(float(a), float(b), float(c)))
+    return hashlib.sha256(text.encode()).hexdigest()[:HASH_LENGTH]
+
+
+def parse_hash(value):
+    """?canonical_hash= argument; None when absent, ValueError when malformed"""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if not HASH_PATTERN.match(value):
+        raise ValueError(f'canonical_hash must be {HASH_LENGTH} hexadecimal characters')
+    return value
+
+
+def backfill(session, batch_size=BACKFILL_BATCH_SIZE):
+    """Fill canonical_hash of rows written before the column existed; returns rows updated"""
+    from sqlalchemy import select, update, bindparam
+    from models import Equation
+
+    table = Equation.__table__
+    # updated_at is kept: a derived column is not a change delta-sync clients must refetch
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam('row_id'), table.c.created_at == bindparam('row_created_at'))
+        .values(canonical_hash=bindparam('row_hash'), updated_at=table.c.updated_at)
+    )
+    updated = 0
+    while True:
+        rows = session.execute(
+            select(table.c.id, table.c.created_at, table.c.a, table.c.b, table.c.c)
+            .where(table.c.canonical_hash.is_(None))
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return updated
+        session.connection().execute(statement, [
+            {'row_id': row.id, 'row_created_at': row.created_at, 'row_hash': canonical_hash(row.a, row.b, row.c)}
+            for row in rows
+        ])
+        session.commit()
+        updated += len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain equations.canonical_hash')
+    parser.add_argument('command', choices=['backfill'])
+    parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from app import app
+    from models import db
+
+    with app.app_context():
+        updated = backfill(db.session, args.batch_size)
+        print(f"✅ Backfilled canonical_hash of {updated} equations")
+
+
+if __name__ == '__main__':
+    main()
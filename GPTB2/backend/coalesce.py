@@ -0,0 +1,136 @@
+"""
+Request coalescing (single-flight) for GPTB2 backend
+Concurrent identical read requests within a worker share one in-flight computation: the first
+request (leader) runs the view, the others wait for it and answer with a copy of its response.
+
+Opt in per endpoint by decorating the view below @app.route:
+
+    @app.route('/api/equations/stats', methods=['GET'])
+    @coalesce.single_flight()
+    def get_equation_stats(): ...
+
+Only GET/HEAD requests are coalesced. A follower may receive data read just before a write that
+committed while it waited; that is no staler than the leader's own answer.
+"""
+import logging
+import threading
+from collections import Counter
+from functools import wraps
+from flask import current_app, request
+
+logger = logging.getLogger('gptb2.coalesce')
+
+EXTENSION_KEY = 'coalesce'
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn, timeout=None):
+        """
+        Run fn() once for all concurrent callers with the same key.
+        Returns (result, shared) where shared is True for callers that reused another call's result.
+        Exceptions raised by the leader are re-raised in every follower.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(timeout):
+                # The leader is stuck; answer independently rather than wait indefinitely
+                logger.warning("Single-flight leader for %r still running after %ss", key, timeout)
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result, False
+
+
+def default_key():
+    """Same route, same arguments, same representation"""
+    return (request.method, request.endpoint, request.full_path, request.headers.get('Accept', ''))
+
+
+def single_flight(key=default_key):
+    """Decorator coalescing concurrent identical requests to a read-only view"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            state = current_app.extensions.get(EXTENSION_KEY)
+            if (state is None or not current_app.config['COALESCING_ENABLED']
+                    or request.method not in ('GET', 'HEAD')):
+                return view(*args, **kwargs)
+
+            def render():
+                # Share the finished body and headers, never the Response object itself
+                response = current_app.make_response(view(*args, **kwargs))
+                return response.get_data(), response.status_code, list(response.headers.items())
+
+            (body, status, headers), shared = state['flight'].do(
+                key(), render, timeout=current_app.config['COALESCING_TIMEOUT_SECONDS']
+            )
+            endpoint = request.endpoint
+            with state['lock']:
+                state['stats']['coalesced' if shared else 'executed'][endpoint] += 1
+
+            response = current_app.response_class(body, status=status, headers=headers)
+            if shared:
+                response.headers['X-Coalesced'] = 'true'
+            return response
+        return wrapper
+    return decorator
+
+
+def stats(app=None):
+    """Per-endpoint counts of executed and coalesced requests in this worker"""
+    state = (app or current_app).extensions.get(EXTENSION_KEY)
+    if state is None:
+        return {}
+    with state['lock']:
+        executed = dict(state['stats']['executed'])
+        coalesced = dict(state['stats']['coalesced'])
+    return {
+        endpoint: {
+            'executed': executed.get(endpoint, 0),
+            'coalesced': coalesced.get(endpoint, 0),
+        }
+        for endpoint in sorted(set(executed) | set(coalesced))
+    }
+
+
+def init_app(app):
+    """Enable single-flight coalescing for views decorated with @single_flight()"""
+    app.config.setdefault('COALESCING_ENABLED', True)
+    app.config.setdefault('COALESCING_TIMEOUT_SECONDS', 30.0)
+
+    app.extensions[EXTENSION_KEY] = {
+        'flight': SingleFlight(),
+        'lock': threading.Lock(),
+        'stats': {'executed': Counter(), 'coalesced': Counter()},
+    }
@@ -0,0 +1,131 @@
+"""
+Opt-in dedup mode for POST /api/equation and POST /api/equations/bulk
+
+Clients re-submit the same coefficients constantly. In dedup mode (?dedup=true, or
+DEDUP_ENABLED=true for every create) coefficients already stored return the existing equation
+and bump its hit counter instead of inserting another row.
+
+The registry is equation_dedup, keyed by an exact hash of the coefficients (not the canonical
+hash: (2, -10, 12) is stored on its own). Claiming a key is one upsert per request:
+- MySQL: INSERT ... ON DUPLICATE KEY UPDATE hits = hits + n. For a single equation the update
+  also sets equation_id = LAST_INSERT_ID(equation_id), so the existing id comes back with the
+  statement; a bulk claim reads the ids with one SELECT for the whole batch
+- SQLite (and other dialects): INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+A new key is inserted with equation_id NULL and filled in the same transaction. The upsert
+holds the key's row lock until commit, so a concurrent duplicate waits and then finds the
+stored equation: two racing requests never create two rows.
+
+A registered equation that was since deleted, archived or updated to other coefficients is
+detected when it is read back and replaced by a new one.
+"""
+import struct
+import hashlib
+from collections import Counter
+from datetime import datetime
+from flask import current_app, request
+from sqlalchemy import case, func, select, update
+from models import db, Equation, EquationDedup, insert_equations
+
+
+def requested():
+    """Whether this create runs in dedup mode: ?dedup= overrides DEDUP_ENABLED"""
+    value = request.args.get('dedup')
+    if value is None:
+        return current_app.config.get('DEDUP_ENABLED', False)
+    return value.lower() == 'true'
+
+
+def coefficient_hash(a, b, c):
+    """
+    Exact hash of the coefficients as the FLOAT columns store them (single precision), so a row
+    read back from MySQL hashes like the request that created it; + 0.0 folds -0.0 into 0.0
+    """
+    values = [float(value) + 0.0 for value in (a, b, c)]
+    try:
+        packed = struct.pack('<3f', *values)
+    except OverflowError:
+        packed = struct.pack('<3d', *values)
+    return hashlib.sha256(packed).hexdigest()[:32]
+
+
+def _claim(counts, now):
+    """Upsert one registry row per hash; returns {hash: stored equation_id or None}"""
+    table = EquationDedup.__table__
+    rows = [
+        {'coefficient_hash': key, 'hits': hits, 'created_at': now, 'last_hit_at': now}
+        for key, hits in counts.items()
+    ]
+    dialect = db.session.get_bind().dialect
+
+    if dialect.name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        statement = mysql_insert(table).values(rows)
+        assignments = {
+            'hits': table.c.hits + statement.inserted.hits,
+            'last_hit_at': statement.inserted.last_hit_at,
+        }
+        if len(rows) == 1:
+            # Affected rows: 1 inserted, 2 updated; lastrowid carries the existing id
+            assignments['equation_id'] = func.last_insert_id(table.c.equation_id)
+            result = db.session.execute(statement.on_duplicate_key_update(**assignments))
+            existing = result.lastrowid if result.rowcount != 1 else None
+            return {rows[0]['coefficient_hash']: existing or None}
+        db.session.execute(statement.on_duplicate_key_update(**assignments))
+        stored = db.session.execute(
+            select(table.c.coefficient_hash, table.c.equation_id).where(table.c.coefficient_hash.in_(counts))
+        )
+        return dict(stored.all())
+
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    statement = sqlite_insert(table).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.coefficient_hash],
+        set_={'hits': table.c.hits + statement.excluded.hits, 'last_hit_at': statement.excluded.last_hit_at},
+    ).returning(table.c.coefficient_hash, table.c.equation_id)
+    return dict(db.session.execute(statement).all())
+
+
+def create(equations):
+    """
+    Store solved equations in dedup mode, in the current transaction (the caller commits).
+    Returns (results, created): results has one (equation, deduplicated) per input, in order;
+    created lists the equations actually inserted
+    """
+    now = datetime.utcnow()
+    keys = [coefficient_hash(eq.a, eq.b, eq.c) for eq in equations]
+    claimed = _claim(Counter(keys), now)
+
+    stored_ids = {key: equation_id for key, equation_id in claimed.items() if equation_id}
+    stored = {}
+    if stored_ids:
+        by_id = {eq.id: eq for eq in Equation.query.filter(Equation.id.in_(set(stored_ids.values())))}
+        for key, equation_id in stored_ids.items():
+            equation = by_id.get(equation_id)
+            # Deleted, archived or updated since it was registered: store a new one
+            if equation is not None and coefficient_hash(equation.a, equation.b, equation.c) == key:
+                stored[key] = equation
+
+    # The first submission of each missing key is inserted; repeats in the batch reuse it
+    created = {}
+    for key, equation in zip(keys, equations):
+        if key not in stored and key not in created:
+            created[key] = equation
+    if created:
+        insert_equations(list(created.values()))
+        table = EquationDedup.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.coefficient_hash.in_(created))
+            .values(equation_id=case(
+                {key: equation.id for key, equation in created.items()},
+                value=table.c.coefficient_hash
+            ))
+        )
+
+    results = []
+    for key, equation in zip(keys, equations):
+        if key in stored:
+            results.append((stored[key], True))
+        else:
+            results.append((created[key], created[key] is not equation))
+    return results, list(created.values())
@@ -0,0 +1,72 @@
+"""
+Delta sync for GET /api/equation?since=<sync_token>
+Clients keep a copy of the equation list and ask only for what changed since their last sync:
+rows with updated_at at or after the token (idx_updated_at) plus tombstones from the
+equation_deletions log (written by a trigger on equations, see models.py).
+
+A sync token is the server's UTC time when the previous response started reading, minus
+DELTA_SYNC_WINDOW_SECONDS. The window re-sends rows whose updated_at was stamped just before
+a read but committed just after it (and absorbs clock skew between app hosts and MySQL);
+re-sent rows are idempotent upserts for the client.
+
+Tokens older than the resync horizon get the full list with full_resync=true instead of a delta:
+tombstones are pruned after DELTA_TOMBSTONE_RETENTION_DAYS, and archiving a partition drops rows
+without logging them (archive.py), so the client must replace its copy.
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, select
+from models import db, EquationDeletion
+import archive
+
+DEFAULT_WINDOW_SECONDS = 5.0
+DEFAULT_RETENTION_DAYS = 30
+
+
+def new_token():
+    """Token to hand out with a response; take it before reading"""
+    window = timedelta(seconds=current_app.config.get('DELTA_SYNC_WINDOW_SECONDS', DEFAULT_WINDOW_SECONDS))
+    return (datetime.utcnow() - window).isoformat()
+
+
+def parse_token(value):
+    """datetime of a sync token, None when absent; ValueError when malformed"""
+    if value is None or value == '':
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError('since must be a sync_token returned by a previous response')
+
+
+def resync_horizon():
+    """Oldest token that can still be answered with a delta"""
+    horizon = datetime.utcnow() - timedelta(
+        days=current_app.config.get('DELTA_TOMBSTONE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    )
+    archive_dir = current_app.config.get('ARCHIVE_DIR')
+    archived = [entry['archived_at'] for entry in archive.load_manifest(archive_dir)['files']] if archive_dir else []
+    if archived:
+        horizon = max(horizon, datetime.fromisoformat(max(archived)))
+    return horizon
+
+
+def deleted_since(since):
+    """Ids deleted at or after `since`"""
+    return sorted(set(db.session.execute(
+        select(EquationDeletion.equation_id).where(EquationDeletion.deleted_at >= since)
+    ).scalars()))
+
+
+def prune_deletion_log(connection, retention_days, now=None):
+    """Drop tombstones no delta client can still need; returns the number removed"""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    return connection.execute(
+        delete(EquationDeletion).where(EquationDeletion.deleted_at < cutoff)
+    ).rowcount
+
+
+def init_app(app):
+    """Delta sync settings"""
+    app.config.setdefault('DELTA_SYNC_WINDOW_SECONDS', DEFAULT_WINDOW_SECONDS)
+    app.config.setdefault('DELTA_TOMBSTONE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
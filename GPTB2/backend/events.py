@@ -0,0 +1,263 @@
+"""
+Change feed for GPTB2: equation create/update/delete events pushed over Server-Sent Events
+
+Writers call publish_created/publish_updated/publish_deleted after their transaction commits.
+Where the events go depends on EVENTS_PUBLISH_ADDR:
+- empty (development, single process): into this process's ChangeFeed, streamed by app.py's
+  GET /api/events
+- host:port (production): one UDP datagram per event to the events service (events_server.py),
+  a single gevent process that owns the feed and every subscriber. An idle stream there costs
+  a greenlet and a socket instead of a gunicorn worker thread, and one process gives all
+  clients one event order no matter which worker committed the write.
+
+Stream format (one SSE event per committed write; bulk writes are one event per batch):
+    id: <epoch>-<seq>
+    event: created | updated | deleted | reset | ready
+    data: {"equations": [...]} | {"ids": [...]} | {}
+
+The feed keeps the last EVENTS_REPLAY_SIZE events. A client reconnecting with Last-Event-ID
+(sent automatically by EventSource) receives what it missed; if that id has left the buffer or
+belongs to a previous run of the service (different epoch) it receives `reset` and must refetch.
+Datagrams are fire-and-forget: a lost one is a missed event, not a failed write.
+"""
+import json
+import time
+import socket
+import logging
+import threading
+from collections import deque
+from flask import Response, current_app, jsonify, request
+
+logger = logging.getLogger('gptb2.events')
+
+EXTENSION_KEY = 'events'
+
+# Equations per event; keeps each datagram well under the 64 KiB UDP limit
+MAX_EQUATIONS_PER_EVENT = 100
+MAX_IDS_PER_EVENT = 2000
+
+
+class ChangeFeed:
+    """Bounded, numbered buffer of recent events that subscribers block on"""
+
+    def __init__(self, size):
+        # A new epoch per process start, so ids from a previous run are never mistaken for ours
+        self.epoch = format(int(time.time() * 1000), 'x')
+        # (seq, kind, json payload). At least one slot: read() hands subscribers the newest event
+        # from the buffer, so EVENTS_REPLAY_SIZE=0 means "no replay", not "no events"
+        self.events = deque(maxlen=max(1, int(size)))
+        self.seq = 0
+        self.subscribers = 0
+        self.condition = threading.Condition()
+
+    def append(self, kind, data):
+        payload = json.dumps(data, separators=(',', ':'))
+        with self.condition:
+            self.seq += 1
+            self.events.append((self.seq, kind, payload))
+            self.condition.notify_all()
+            return self.seq
+
+    def event_id(self, seq):
+        return f'{self.epoch}-{seq}'
+
+    def parse_event_id(self, event_id):
+        """Sequence number of one of our event ids, or None for ids from another epoch or garbage"""
+        epoch, _, seq = (event_id or '').strip().partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        return seq if seq <= self.seq else None
+
+    def read(self, after, timeout=None):
+        """
+        Events after sequence number `after`, waiting up to `timeout` seconds for the first one.
+        Returns [] on timeout, None when events after `after` have already left the buffer.
+        """
+        with self.condition:
+            if self.seq <= after:
+                self.condition.wait(timeout)
+                if self.seq <= after:
+                    return []
+            if not self.events:
+                return None
+            oldest = self.events[0][0]
+            if after + 1 < oldest:
+                return None
+            # seqs in the buffer are contiguous; indexing near the tail of a deque is cheap
+            return [self.events[index] for index in range(after + 1 - oldest, len(self.events))]
+
+    def subscribe(self, limit):
+        with self.condition:
+            if self.subscribers >= limit:
+                return False
+            self.subscribers += 1
+            return True
+
+    def unsubscribe(self):
+        with self.condition:
+            self.subscribers -= 1
+
+
+def format_event(event_id, kind, payload):
+    return f'id: {event_id}\nevent: {kind}\ndata: {payload}\n\n'
+
+
+def stream(feed, last_event_id, heartbeat, retry_ms):
+    """Generate the SSE body for one subscriber; the caller has already counted it in feed.subscribe()"""
+    try:
+        yield f'retry: {retry_ms}\n\n'
+
+        cursor = feed.parse_event_id(last_event_id) if last_event_id else None
+        with feed.condition:
+            head = feed.seq
+        if cursor is None:
+            # New subscriber, or one we cannot resume: start from now, with an id to resume from later
+            cursor = head
+            yield format_event(feed.event_id(head), 'reset' if last_event_id else 'ready', '{}')
+
+        while True:
+            events = feed.read(cursor, heartbeat)
+            if events is None:
+                # Fell behind the replay buffer (slow client or long disconnect)
+                with feed.condition:
+                    cursor = feed.seq
+                yield format_event(feed.event_id(cursor), 'reset', '{}')
+            elif not events:
+                # Comment line: keeps proxies from timing out and detects closed connections
+                yield ': keepalive\n\n'
+            else:
+                yield ''.join(format_event(feed.event_id(seq), kind, payload) for seq, kind, payload in events)
+                cursor = events[-1][0]
+    finally:
+        feed.unsubscribe()
+
+
+def stream_response():
+    """Response for GET /api/events served from this process's feed"""
+    config = current_app.config
+    feed = current_app.extensions[EXTENSION_KEY]['feed']
+    if not feed.subscribe(config['EVENTS_MAX_SUBSCRIBERS']):
+        response = jsonify({
+            'message': 'Too many change feed subscribers, please retry later',
+            'status': 'error'
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    body = stream(feed, last_event_id, config['EVENTS_HEARTBEAT_SECONDS'], config['EVENTS_RETRY_MS'])
+    return Response(body, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # nginx must pass events through as they are written
+        'X-Accel-Buffering': 'no',
+    })
+
+
+def _parse_addr(value):
+    host, _, port = value.rpartition(':')
+    return host or '0.0.0.0', int(port)
+
+
+def _emit(kind, data):
+    state = current_app.extensions.get(EXTENSION_KEY)
+    if state is None or not current_app.config['EVENTS_ENABLED']:
+        return
+    addr = current_app.config['EVENTS_PUBLISH_ADDR']
+    if not addr:
+        state['feed'].append(kind, data)
+        return
+    try:
+        if state['addr'] is None:
+            # Resolved once, not per write; retried after a failure (e.g. the service moved)
+            host, port = _parse_addr(addr)
+            state['addr'] = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+        datagram = json.dumps({'kind': kind, 'data': data}, separators=(',', ':')).encode('utf-8')
+        state['socket'].sendto(datagram, state['addr'])
+    except OSError as e:
+        # Never fail a committed write because the events service is down
+        state['addr'] = None
+        logger.warning("Could not publish %s event to %s: %s", kind, addr, e)
+
+
+def _payload(equation):
+    data = equation.to_dict()
+    # A minimal update skips reading the row, so created_at is unknown; clients merge updates
+    # into the row they already have
+    if data['created_at'] is None:
+        del data['created_at']
+    return data
+
+
+def _publish_equations(kind, equations):
+    equations = [eq for eq in equations if eq.id is not None]
+    for start in range(0, len(equations), MAX_EQUATIONS_PER_EVENT):
+        _emit(kind, {'equations': [_payload(eq) for eq in equations[start:start + MAX_EQUATIONS_PER_EVENT]]})
+
+
+def publish_created(equations):
+    """Announce committed inserts"""
+    _publish_equations('created', equations)
+
+
+def publish_updated(equations):
+    """Announce committed updates; equations carry their new values"""
+    _publish_equations('updated', equations)
+
+
+def publish_deleted(ids):
+    """Announce committed deletes"""
+    ids = list(ids)
+    for start in range(0, len(ids), MAX_IDS_PER_EVENT):
+        _emit('deleted', {'ids': ids[start:start + MAX_IDS_PER_EVENT]})
+
+
+def start_listener(app):
+    """Events service only: receive events published by API workers into this process's feed"""
+    feed = app.extensions[EXTENSION_KEY]['feed']
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    listener.bind(_parse_addr(app.config['EVENTS_LISTEN_ADDR']))
+
+    def receive():
+        while True:
+            try:
+                datagram, _ = listener.recvfrom(65535)
+            except OSError:
+                return  # socket closed
+            try:
+                message = json.loads(datagram)
+                feed.append(message['kind'], message['data'])
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("Dropped malformed event datagram: %s", e)
+
+    threading.Thread(target=receive, name='events-listener', daemon=True).start()
+    return listener
+
+
+def stats(app=None):
+    state = (app or current_app).extensions.get(EXTENSION_KEY)
+    if state is None:
+        return {}
+    feed = state['feed']
+    with feed.condition:
+        return {'last_event_id': feed.event_id(feed.seq), 'buffered': len(feed.events), 'subscribers': feed.subscribers}
+
+
+def init_app(app):
+    """Attach the change feed (and the publishing socket when events go to the events service)"""
+    app.config.setdefault('EVENTS_ENABLED', True)
+    app.config.setdefault('EVENTS_PUBLISH_ADDR', '')
+    app.config.setdefault('EVENTS_LISTEN_ADDR', '0.0.0.0:5002')
+    app.config.setdefault('EVENTS_STREAM_URL', '')
+    app.config.setdefault('EVENTS_REPLAY_SIZE', 1000)
+    app.config.setdefault('EVENTS_HEARTBEAT_SECONDS', 15.0)
+    app.config.setdefault('EVENTS_RETRY_MS', 3000)
+    app.config.setdefault('EVENTS_MAX_SUBSCRIBERS', 1000)
+
+    state = {'feed': ChangeFeed(app.config['EVENTS_REPLAY_SIZE']), 'socket': None, 'addr': None}
+    if app.config['EVENTS_PUBLISH_ADDR']:
+        state['socket'] = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        state['socket'].setblocking(False)
+    app.extensions[EXTENSION_KEY] = state
@@ -0,0 +1,60 @@
+"""
+GPTB2 events service - streams the equation change feed (GET /api/events) to browsers
+
+Runs as ONE gevent process, separate from the gunicorn API workers: every subscriber is a
+greenlet waiting on the shared ChangeFeed, so thousands of idle EventSource connections do not
+occupy API worker threads. API workers publish committed writes to it over UDP
+(EVENTS_PUBLISH_ADDR=events:5002, see events.py).
+
+Run: python events_server.py   (listens on EVENTS_PORT, default 5001; UDP on EVENTS_LISTEN_ADDR)
+Keep a single process: the feed and its event ids live in memory.
+"""
+from gevent import monkey
+monkey.patch_all()
+
+import os
+import logging
+from dotenv import load_dotenv
+from flask import Flask, jsonify
+from flask_cors import CORS
+from gevent.pywsgi import WSGIServer
+import events
+
+load_dotenv()
+
+app = Flask(__name__)
+CORS(app)
+
+logging.basicConfig(level=logging.DEBUG if os.getenv('DEBUG', 'false').lower() == 'true' else logging.INFO)
+
+app.config['EVENTS_LISTEN_ADDR'] = os.getenv('EVENTS_LISTEN_ADDR', '0.0.0.0:5002')
+app.config['EVENTS_REPLAY_SIZE'] = int(os.getenv('EVENTS_REPLAY_SIZE', '1000'))
+app.config['EVENTS_HEARTBEAT_SECONDS'] = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+app.config['EVENTS_RETRY_MS'] = int(os.getenv('EVENTS_RETRY_MS', '3000'))
+app.config['EVENTS_MAX_SUBSCRIBERS'] = int(os.getenv('EVENTS_MAX_SUBSCRIBERS', '10000'))
+
+events.init_app(app)
+
+
+@app.route('/ping', methods=['GET'])
+def ping():
+    """Health check with feed statistics"""
+    return jsonify({
+        'message': 'Events service is running',
+        'status': 'success',
+        'feed': events.stats()
+    })
+
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Server-Sent Events stream of equation changes (resumable with Last-Event-ID)"""
+    return events.stream_response()
+
+
+if __name__ == '__main__':
+    events.start_listener(app)
+    port = int(os.getenv('EVENTS_PORT', 5001))
+    print(f"📡 Events service streaming on :{port}, receiving on udp {app.config['EVENTS_LISTEN_ADDR']}")
+    # No access log: a stream is one log line when it closes, hours after it started
+    WSGIServer(('0.0.0.0', port), app, log=None).serve_forever()
@@ -0,0 +1,76 @@
+"""
+Sparse fieldsets and minimal write responses for GPTB2 API
+
+Reads accept `?fields=id,a,b,c`: only the named equation fields are built and serialized, and
+views that load rows themselves SELECT only the columns those fields need.
+
+Writes honor `Prefer: return=minimal` (RFC 7240): the response keeps its envelope but every
+equation object is reduced to its id, and reads that only existed to fill the full
+representation (e.g. previous_values of PUT /api/equation/<id>) are skipped. Responses that
+applied the preference carry `Preference-Applied: return=minimal`.
+"""
+from flask import request
+from sqlalchemy.orm import load_only
+from models import Equation, DICT_FIELDS, DICT_FIELD_COLUMNS
+
+MINIMAL_KEY = 'gptb2.return_minimal'
+
+
+def requested_fields(extra=()):
+    """
+    Field names from ?fields=, de-duplicated in request order; None when absent (full representation).
+    extra: endpoint-specific fields allowed besides Equation.to_dict()'s, e.g. 'roots' or 'distance'.
+    Raises ValueError naming unknown fields.
+    """
+    raw = request.args.get('fields')
+    if raw is None:
+        return None
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    if not fields:
+        raise ValueError('fields must name at least one field')
+    allowed = set(DICT_FIELDS) | set(extra)
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}. Allowed: {", ".join(sorted(allowed))}')
+    return fields
+
+
+def load_options(fields):
+    """ORM options loading only the columns `fields` are built from (all columns for None)"""
+    if fields is None:
+        return []
+    columns = {column for name in fields for column in DICT_FIELD_COLUMNS.get(name, ())}
+    # The primary key is always loaded; load_only() needs at least one attribute
+    columns.add('id')
+    return [load_only(*(getattr(Equation, column) for column in sorted(columns)))]
+
+
+def project(data, fields):
+    """Reduce an already-built equation dict (e.g. from the shared cache) to `fields`"""
+    if fields is None:
+        return data
+    return {name: data[name] for name in fields if name in data}
+
+
+def prefers_minimal():
+    """
+    True when the client sent Prefer: return=minimal.
+    Call only from views that honor it: the response is then marked with Preference-Applied.
+    """
+    for preference in request.headers.getlist('Prefer'):
+        for token in preference.split(','):
+            if token.split(';')[0].strip().replace(' ', '').lower() == 'return=minimal':
+                request.environ[MINIMAL_KEY] = True
+                return True
+    return False
+
+
+def _mark_preference_applied(response):
+    if request.environ.get(MINIMAL_KEY):
+        response.headers['Preference-Applied'] = 'return=minimal'
+    return response
+
+
+def init_app(app):
+    """Report applied Prefer: return=minimal on responses"""
+    app.after_request(_mark_preference_applied)
@@ -0,0 +1,139 @@
+"""
+SQL query instrumentation for GPTB2 backend
+Records statement count, total DB time and the slowest statement per request,
+logs slow statements and warns about repeated same-shape statements (N+1)
+"""
+import re
+import time
+import logging
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('gptb2.sql')
+
+# Literals and placeholders are collapsed so statements differing only by values share a shape
+_PARAM_MARKER = re.compile(r'%\(\w+\)s|%s|:\w+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_statement(statement):
+    """Reduce a SQL statement to its shape (values and IN-lists collapsed)"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _PARAM_MARKER.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(...)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryStats:
+    """Per-request statement counters"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.shapes = Counter()
+
+    def record(self, statement, duration):
+        """Record one executed statement and its duration in seconds"""
+        self.count += 1
+        self.total_time += duration
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+        self.shapes[normalize_statement(statement)] += 1
+
+    def repeated_shapes(self, threshold):
+        """Return {shape: count} for shapes executed at least `threshold` times"""
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+    def to_dict(self):
+        """Convert stats to dictionary for logging/JSON"""
+        return {
+            'query_count': self.count,
+            'db_time_ms': round(self.total_time * 1000, 3),
+            'slowest_ms': round(self.slowest_time * 1000, 3),
+            'slowest_statement': self.slowest_statement
+        }
+
+
+def current_stats():
+    """Return QueryStats of the active request, or None outside instrumented requests"""
+    if not has_request_context():
+        return None
+    return g.get('query_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('query_start_time')
+    if not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+
+    stats = current_stats()
+    if stats is None:
+        return
+    stats.record(statement, duration)
+
+    threshold_ms = current_app.config['SLOW_QUERY_THRESHOLD_MS']
+    if duration * 1000 >= threshold_ms:
+        logger.warning(
+            "Slow query (%.1f ms) on %s %s [%s]: %s",
+            duration * 1000, request.method, request.path, request.endpoint, statement
+        )
+
+
+def _start_request():
+    g.pop('query_stats', None)
+    if current_app.config['SQL_INSTRUMENTATION_ENABLED']:
+        g.query_stats = QueryStats()
+
+
+def _finish_request(response):
+    stats = current_stats()
+    if stats is None:
+        return response
+
+    n_plus_one_threshold = current_app.config['N_PLUS_ONE_THRESHOLD']
+    for shape, count in stats.repeated_shapes(n_plus_one_threshold).items():
+        logger.warning(
+            "Possible N+1: %d same-shape statements on %s %s [%s]: %s",
+            count, request.method, request.path, request.endpoint, shape
+        )
+
+    logger.debug(
+        "%s %s [%s] -> %d queries, %.2f ms DB time, slowest %.2f ms",
+        request.method, request.path, request.endpoint,
+        stats.count, stats.total_time * 1000, stats.slowest_time * 1000
+    )
+
+    if current_app.config['SQL_INSTRUMENTATION_HEADERS']:
+        response.headers['X-Query-Count'] = str(stats.count)
+        response.headers['X-DB-Time-Ms'] = f"{stats.total_time * 1000:.3f}"
+    return response
+
+
+def init_app(app):
+    """Register engine listeners and per-request hooks on a Flask app"""
+    app.config.setdefault('SQL_INSTRUMENTATION_ENABLED', True)
+    app.config.setdefault('SQL_INSTRUMENTATION_HEADERS', False)
+    app.config.setdefault('SLOW_QUERY_THRESHOLD_MS', 100.0)
+    app.config.setdefault('N_PLUS_ONE_THRESHOLD', 5)
+
+    # Listening on the Engine class covers engines Flask-SQLAlchemy creates lazily
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -2,9 +2,17 @@
 Database models for GPTB2 application
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, event, func, insert
 from datetime import datetime
+import canonical
 
-db = SQLAlchemy()
+# Instances keep their loaded state after commit, so serializing a freshly
+# written equation does not reload it with another SELECT
+db = SQLAlchemy(session_options={'expire_on_commit': False})
+
+# Columns derived from (a, b, c) by Equation.solve_equation()
+SOLUTION_COLUMNS = ('solution', 'discriminant', 'solution_type', 'root1_real', 'root2_real', 'root_imag',
+                    'canonical_hash')
 
 class Equation(db.Model):
     """
@@ -12,6 +20,16 @@ class Equation(db.Model):
     Represents: ax² + bx + c = 0
     """
     __tablename__ = 'equations'
+    __table_args__ = (
+        # Root-range search: "real root in [lo, hi]" is an index-merge union of the two
+        # (root_imag = 0, rootN_real range) scans; "imaginary part above x" ranges root_imag
+        db.Index('idx_root1', 'root_imag', 'root1_real'),
+        db.Index('idx_root2', 'root_imag', 'root2_real'),
+        # Delta sync: rows changed since a client's sync token
+        db.Index('idx_updated_at', 'updated_at'),
+        # Scalar multiples of an equation (see canonical.py), newest first
+        db.Index('idx_canonical_hash', 'canonical_hash', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     a = db.Column(db.Float, nullable=False, comment='Coefficient of x²')
@@ -20,7 +38,11 @@ class Equation(db.Model):
     solution = db.Column(db.String(200), nullable=True, comment='Solution as string')
     discriminant = db.Column(db.Float, nullable=True, comment='b² - 4ac')
     solution_type = db.Column(db.String(50), nullable=True, comment='Type: two_real, one_real, complex')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, comment='Creation timestamp')
+    root1_real = db.Column(db.Double, nullable=True, comment='Smaller real root, or real part of complex roots')
+    root2_real = db.Column(db.Double, nullable=True, comment='Larger real root, or real part of complex roots')
+    root_imag = db.Column(db.Double, nullable=True, comment='|Imaginary part| of the roots, 0 for real roots')
+    canonical_hash = db.Column(db.String(32), nullable=True, comment='Hash of the scale-free form, shared by k·(a, b, c)')
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='Creation timestamp (partition key)')
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='Last update timestamp')
     
     def __init__(self, a, b, c):
@@ -34,6 +56,8 @@ class Equation(db.Model):
         """Solve quadratic equation and store results"""
         import math
         
+        self.canonical_hash = canonical.canonical_hash(self.a, self.b, self.c)
+        
         # Handle case where a = 0 (not quadratic)
         if self.a == 0:
             if self.b == 0:
@@ -43,11 +67,13 @@ class Equation(db.Model):
                 else:
                     self.solution = "No solution (contradiction)"
                     self.solution_type = "none"
+                self.set_roots(None, None, None)
             else:
                 # Linear equation: bx + c = 0
                 x = -self.c / self.b
                 self.solution = f"x = {x:.6f}"
                 self.solution_type = "linear"
+                self.set_roots(x, x, 0.0)
             self.discriminant = None
             return
         
@@ -61,12 +87,14 @@ class Equation(db.Model):
             x2 = (-self.b - sqrt_discriminant) / (2 * self.a)
             self.solution = f"x₁ = {x1:.6f}, x₂ = {x2:.6f}"
             self.solution_type = "two_real"
+            self.set_roots(min(x1, x2), max(x1, x2), 0.0)
             
         elif self.discriminant == 0:
             # One repeated real root
             x = -self.b / (2 * self.a)
             self.solution = f"x = {x:.6f} (repeated root)"
             self.solution_type = "one_real"
+            self.set_roots(x, x, 0.0)
             
         else:
             # Complex roots
@@ -74,9 +102,29 @@ class Equation(db.Model):
             imaginary_part = math.sqrt(-self.discriminant) / (2 * self.a)
             self.solution = f"x₁ = {real_part:.6f} + {imaginary_part:.6f}i, x₂ = {real_part:.6f} - {imaginary_part:.6f}i"
             self.solution_type = "complex"
+            self.set_roots(real_part, real_part, abs(imaginary_part))
+    
+    def set_roots(self, root1_real, root2_real, root_imag):
+        """Store numeric roots for indexed root-range search"""
+        self.root1_real = root1_real
+        self.root2_real = root2_real
+        self.root_imag = root_imag
     
-    def to_dict(self):
-        """Convert model to dictionary for JSON serialization"""
+    def roots_dict(self):
+        """Numeric roots as returned by the search endpoint"""
+        return {
+            'root1_real': self.root1_real,
+            'root2_real': self.root2_real,
+            'root_imag': self.root_imag
+        }
+    
+    def to_dict(self, fields=None):
+        """
+        Convert model to dictionary for JSON serialization
+        fields: names of DICT_FIELDS to include (sparse fieldset); None builds all of them
+        """
+        if fields is not None:
+            return {name: DICT_FIELDS[name](self) for name in fields if name in DICT_FIELDS}
         return {
             'id': self.id,
             'a': self.a,
@@ -86,10 +134,140 @@ class Equation(db.Model):
             'discriminant': self.discriminant,
             'solution_type': self.solution_type,
             'equation_string': f"{self.a}x² + {self.b}x + {self.c} = 0",
+            'canonical_hash': self.canonical_hash,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def __repr__(self):
         """String representation of the equation"""
-        return f"<Equation {self.a}x² + {self.b}x + {self.c} = 0, Solution: {self.solution}>"
\ No newline at end of file
+        return f"<Equation {self.a}x² + {self.b}x + {self.c} = 0, Solution: {self.solution}>"
+
+
+# Builders for each Equation.to_dict() field, used for sparse fieldsets
+DICT_FIELDS = {
+    'id': lambda eq: eq.id,
+    'a': lambda eq: eq.a,
+    'b': lambda eq: eq.b,
+    'c': lambda eq: eq.c,
+    'solution': lambda eq: eq.solution,
+    'discriminant': lambda eq: eq.discriminant,
+    'solution_type': lambda eq: eq.solution_type,
+    'equation_string': lambda eq: f"{eq.a}x² + {eq.b}x + {eq.c} = 0",
+    'canonical_hash': lambda eq: eq.canonical_hash,
+    'created_at': lambda eq: eq.created_at.isoformat() if eq.created_at else None,
+    'updated_at': lambda eq: eq.updated_at.isoformat() if eq.updated_at else None,
+}
+
+# Columns each to_dict() field is built from, so sparse reads can SELECT only those
+DICT_FIELD_COLUMNS = {
+    'id': ('id',),
+    'a': ('a',),
+    'b': ('b',),
+    'c': ('c',),
+    'solution': ('solution',),
+    'discriminant': ('discriminant',),
+    'solution_type': ('solution_type',),
+    'equation_string': ('a', 'b', 'c'),
+    'canonical_hash': ('canonical_hash',),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+}
+
+
+class EquationDeletion(db.Model):
+    """
+    Deletion log (tombstones) for delta sync: one row per deleted equation id
+    Written by a trigger on equations, so every DELETE (single, bulk, ad-hoc SQL) is logged
+    inside the deleting statement; pruned by `python archive.py prune`
+    """
+    __tablename__ = 'equation_deletions'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    equation_id = db.Column(db.Integer, nullable=False, comment='Id of the deleted equation')
+    deleted_at = db.Column(db.DateTime, nullable=False, index=True, comment='Deletion time (UTC)')
+
+
+class EquationDedup(db.Model):
+    """
+    Dedup registry for opt-in dedup creates (see dedup.py): one row per distinct (a, b, c)
+    A separate table because equations is partitioned on created_at, and MySQL requires the
+    partitioning column in every unique key, so equations cannot have a unique coefficient key
+    """
+    __tablename__ = 'equation_dedup'
+    
+    coefficient_hash = db.Column(db.String(32), primary_key=True, comment='dedup.coefficient_hash(a, b, c)')
+    equation_id = db.Column(db.Integer, nullable=True, comment='Stored equation; NULL only while being created')
+    hits = db.Column(db.BigInteger, nullable=False, default=1, comment='Times these coefficients were submitted')
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='First submission')
+    last_hit_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, comment='Latest submission')
+
+
+# Created after all tables so equation_deletions exists; IF NOT EXISTS because create_all()
+# also runs against databases initialised by mysql/init
+event.listen(db.metadata, 'after_create', DDL(
+    "CREATE TRIGGER IF NOT EXISTS trg_equations_deleted AFTER DELETE ON equations FOR EACH ROW "
+    "INSERT INTO equation_deletions (equation_id, deleted_at) VALUES (OLD.id, UTC_TIMESTAMP())"
+).execute_if(dialect='mysql'))
+event.listen(db.metadata, 'after_create', DDL(
+    "CREATE TRIGGER IF NOT EXISTS trg_equations_deleted AFTER DELETE ON equations FOR EACH ROW BEGIN "
+    "INSERT INTO equation_deletions (equation_id, deleted_at) VALUES (OLD.id, strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now')); END"
+).execute_if(dialect='sqlite'))
+
+
+def insert_equations(equations):
+    """
+    Insert new equations with one multi-row INSERT and assign their ids.
+    Ids come from INSERT ... RETURNING where the dialect supports it (SQLite, MariaDB);
+    MySQL has no RETURNING, so ids are derived from lastrowid, which is the first id of
+    the statement: with innodb_autoinc_lock_mode <= 1 a multi-row insert receives
+    consecutive ids. Either way ids increase in row order within the statement.
+    """
+    if not equations:
+        return equations
+    
+    dialect = db.session.get_bind().dialect
+    if not dialect.insert_returning and dialect.name != 'mysql':
+        db.session.add_all(equations)
+        db.session.flush()
+        return equations
+    
+    now = datetime.utcnow()
+    rows = []
+    for equation in equations:
+        equation.created_at = now
+        equation.updated_at = now
+        row = {'a': equation.a, 'b': equation.b, 'c': equation.c, 'created_at': now, 'updated_at': now}
+        row.update({column: getattr(equation, column) for column in SOLUTION_COLUMNS})
+        rows.append(row)
+    
+    table = Equation.__table__
+    statement = insert(table).values(rows)
+    if dialect.insert_returning:
+        ids = sorted(db.session.execute(statement.returning(table.c.id)).scalars())
+    else:
+        first_id = db.session.execute(statement).lastrowid
+        ids = range(first_id, first_id + len(rows))
+    
+    for equation, equation_id in zip(equations, ids):
+        equation.id = equation_id
+    return equations
+
+
+def equation_stats():
+    """Total count, count per solution type and the latest equation (as a dict, or None)"""
+    total_count = Equation.query.count()
+    if total_count == 0:
+        return {'total_equations': 0, 'by_solution_type': {}, 'latest_equation': None}
+    
+    solution_type_counts = db.session.query(
+        Equation.solution_type,
+        func.count(Equation.id)
+    ).group_by(Equation.solution_type).all()
+    latest_equation = Equation.query.order_by(Equation.created_at.desc()).first()
+    
+    return {
+        'total_equations': total_count,
+        'by_solution_type': {solution_type: count for solution_type, count in solution_type_counts},
+        'latest_equation': latest_equation.to_dict() if latest_equation else None
+    }
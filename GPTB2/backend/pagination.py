@@ -0,0 +1,62 @@
+"""
+Keyset pagination for GET /api/equation?limit=<n>[&cursor=<next_cursor>]
+
+Pages follow the list's order (created_at DESC, id DESC). A cursor is the (created_at, id) of the
+last row of the previous page, so the next page is a range scan on idx_created_at (InnoDB
+secondary indexes carry the primary key) that starts where the previous one stopped, instead of
+an OFFSET that reads and discards every earlier row. Rows inserted while a client pages are not
+skipped or repeated; they sort before the first page and reach the client through the change
+feed or delta sync.
+"""
+from datetime import datetime
+from sqlalchemy import and_, or_
+from models import Equation
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def parse_limit(value):
+    """Page size from ?limit=, None when absent (unpaged); ValueError when malformed"""
+    if value is None or value == '':
+        return None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_cursor(value):
+    """(created_at, id) of a cursor, None when absent; ValueError when malformed"""
+    if value is None or value == '':
+        return None
+    created_at, _, equation_id = value.rpartition('_')
+    try:
+        return datetime.fromisoformat(created_at), int(equation_id)
+    except (TypeError, ValueError):
+        raise ValueError('cursor must be a next_cursor returned by a previous page')
+
+
+def encode_cursor(equation):
+    return f'{equation.created_at.isoformat()}_{equation.id}'
+
+
+def page(query, limit, cursor=None):
+    """
+    One page of `query` in list order and the cursor of the next page (None on the last page)
+    """
+    if cursor is not None:
+        created_at, equation_id = cursor
+        query = query.filter(or_(
+            Equation.created_at < created_at,
+            and_(Equation.created_at == created_at, Equation.id < equation_id)
+        ))
+    # One extra row tells whether another page follows without a COUNT
+    rows = query.order_by(Equation.created_at.desc(), Equation.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1])
@@ -0,0 +1,141 @@
+"""
+Content negotiation for GPTB2 API
+/api responses honor `Accept: application/msgpack` (or application/cbor) and request bodies
+may be sent with the matching Content-Type. Views keep using jsonify() and request.get_json():
+the JSON provider and request class below pick the wire format, so field names and values are
+identical to the JSON representation. JSON stays the default, including for `Accept: */*`.
+
+msgpack and cbor2 are optional; a format whose library is missing is simply not offered.
+"""
+import datetime
+import decimal
+from flask import Request, has_request_context, request
+from server_timing import TimingJSONProvider, phase
+
+JSON_MIMETYPE = 'application/json'
+
+
+def _default(value):
+    """Types jsonify() would stringify, encoded the same way"""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not serializable')
+
+
+class Codec:
+    """A binary wire format with json-module-like dumps/loads"""
+
+    def __init__(self, mimetype, dumps, loads, aliases=()):
+        self.mimetype = mimetype
+        self.mimetypes = (mimetype,) + tuple(aliases)
+        self._dumps = dumps
+        self._loads = loads
+
+    def dumps(self, obj):
+        return self._dumps(obj)
+
+    def loads(self, data):
+        # Request.get_json() turns ValueError into a 400/415 like malformed JSON
+        try:
+            return self._loads(data)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(str(e)) from e
+
+
+def _load_codecs():
+    codecs = []
+    try:
+        import msgpack
+        codecs.append(Codec(
+            'application/msgpack',
+            lambda obj: msgpack.packb(obj, use_bin_type=True, default=_default),
+            lambda data: msgpack.unpackb(data, raw=False),
+            aliases=('application/x-msgpack', 'application/vnd.msgpack')
+        ))
+    except ImportError:
+        pass
+    try:
+        import cbor2
+        codecs.append(Codec(
+            'application/cbor',
+            lambda obj: cbor2.dumps(obj, default=lambda encoder, value: encoder.encode(_default(value))),
+            cbor2.loads
+        ))
+    except ImportError:
+        pass
+    return codecs
+
+
+CODECS = _load_codecs()
+CODECS_BY_MIMETYPE = {mimetype: codec for codec in CODECS for mimetype in codec.mimetypes}
+
+
+def negotiated_codec():
+    """Binary codec the client prefers for this /api response, or None for JSON"""
+    if not CODECS or not has_request_context() or not request.path.startswith('/api/'):
+        return None
+    offered = [JSON_MIMETYPE] + list(CODECS_BY_MIMETYPE)
+    # JSON is listed first so it wins ties such as */* or an absent Accept header
+    best = request.accept_mimetypes.best_match(offered, default=JSON_MIMETYPE)
+    return CODECS_BY_MIMETYPE.get(best)
+
+
+class NegotiatingJSONProvider(TimingJSONProvider):
+    """jsonify() that answers in the negotiated format; JSON behaviour is unchanged"""
+
+    def response(self, *args, **kwargs):
+        codec = negotiated_codec()
+        if codec is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        with phase('serialize'):
+            body = codec.dumps(obj)
+        return self._app.response_class(body, mimetype=codec.mimetype)
+
+
+class NegotiatingRequest(Request):
+    """request.get_json() that also decodes msgpack/CBOR bodies"""
+
+    _json_module = Request.json_module
+
+    @property
+    def is_json(self):
+        return super().is_json or self.mimetype in CODECS_BY_MIMETYPE
+
+    @property
+    def json_module(self):
+        codec = CODECS_BY_MIMETYPE.get(self.mimetype)
+        return _TimedCodec(codec) if codec else self._json_module
+
+    @json_module.setter
+    def json_module(self, value):
+        # Flask assigns app.json here for every request
+        self._json_module = value
+
+
+class _TimedCodec:
+    __slots__ = ('codec',)
+
+    def __init__(self, codec):
+        self.codec = codec
+
+    def loads(self, data, **kwargs):
+        with phase('parse'):
+            return self.codec.loads(data)
+
+
+def _vary_on_accept(response):
+    if request.path.startswith('/api/'):
+        response.vary.add('Accept')
+    return response
+
+
+def init_app(app):
+    """Enable msgpack/CBOR negotiation; replaces the JSON provider installed by server_timing"""
+    app.json = NegotiatingJSONProvider(app)
+    app.request_class = NegotiatingRequest
+    app.after_request(_vary_on_accept)
@@ -0,0 +1,117 @@
+"""
+Server-Timing response headers for GPTB2 backend
+Breaks API response time down by phase (parse, validate, solve, db, serialize, total)
+
+The db phase comes from this module's own engine listeners, so it is reported whether or
+not SQL instrumentation (instrumentation.py) is enabled; they only time sampled requests.
+"""
+import time
+import random
+from flask import current_app, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Header order; phases that did not run in a request are omitted
+PHASES = ('parse', 'validate', 'solve', 'db', 'serialize')
+
+
+class phase:
+    """
+    Context manager accumulating wall time into a named phase of the current request.
+    A no-op when the request is not sampled.
+    """
+    __slots__ = ('name', 'timings', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.timings = g.get('server_timing') if has_request_context() else None
+
+    def __enter__(self):
+        if self.timings is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.timings is not None:
+            elapsed = time.perf_counter() - self.start
+            self.timings[self.name] = self.timings.get(self.name, 0.0) + elapsed
+        return False
+
+
+class TimingJSONProvider(DefaultJSONProvider):
+    """JSON provider that attributes body decoding to 'parse' and encoding to 'serialize'"""
+
+    def dumps(self, obj, **kwargs):
+        with phase('serialize'):
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        with phase('parse'):
+            return super().loads(s, **kwargs)
+
+
+def format_header(timings, total, db_queries=0):
+    """Build the Server-Timing header value; durations are in milliseconds"""
+    metrics = []
+    for name in PHASES:
+        if name == 'db' and db_queries:
+            metrics.append(f'db;dur={timings["db"] * 1000:.3f};desc="{db_queries} queries"')
+        elif name in timings:
+            metrics.append(f'{name};dur={timings[name] * 1000:.3f}')
+    metrics.append(f'total;dur={total * 1000:.3f}')
+    return ', '.join(metrics)
+
+
+def _sampled_timings():
+    return g.get('server_timing') if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sampled_timings() is not None:
+        conn.info.setdefault('server_timing_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _sampled_timings()
+    start_times = conn.info.get('server_timing_start')
+    if timings is None or not start_times:
+        return
+    timings['db'] = timings.get('db', 0.0) + time.perf_counter() - start_times.pop()
+    g.server_timing_queries += 1
+
+
+def _start_request():
+    g.pop('server_timing', None)
+    if not request.path.startswith('/api/'):
+        return
+    sample_rate = current_app.config['SERVER_TIMING_SAMPLE_RATE']
+    if sample_rate >= 1.0 or (sample_rate > 0.0 and random.random() < sample_rate):
+        g.server_timing = {}
+        g.server_timing_queries = 0
+        g.server_timing_start = time.perf_counter()
+
+
+def _finish_request(response):
+    timings = g.get('server_timing')
+    if timings is None:
+        return response
+    total = time.perf_counter() - g.server_timing_start
+    response.headers['Server-Timing'] = format_header(timings, total, g.server_timing_queries)
+    # Cross-origin callers (the React dev server) only see the timings with this header
+    response.headers['Timing-Allow-Origin'] = current_app.config['SERVER_TIMING_ALLOW_ORIGIN']
+    return response
+
+
+def init_app(app):
+    """Register Server-Timing hooks and the timing JSON provider on a Flask app"""
+    app.config.setdefault('SERVER_TIMING_SAMPLE_RATE', 0.0)
+    app.config.setdefault('SERVER_TIMING_ALLOW_ORIGIN', '*')
+
+    app.json = TimingJSONProvider(app)
+    # Listening on the Engine class covers engines Flask-SQLAlchemy creates lazily
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,265 @@
+"""
+Host-wide read cache for GET /api/equation/<id>
+An mmap-backed hash table in shared memory (/dev/shm) that every gunicorn worker on the host
+maps directly: hits cost a memory read, with no IPC round-trip and no external service.
+
+Layout: header | one generation counter per set | sets of `ways` fixed-size slots
+- keys hash to a set; a full set evicts its entry closest to expiry (i.e. the oldest store)
+- readers take no lock: each slot carries a sequence number that is odd while it is being
+  written (seqlock) and a CRC of the payload, so torn reads become misses
+- writers serialize with a POSIX record lock (per process) plus a thread lock (per worker)
+- invalidating a key bumps its set's generation; a store carrying an older generation is
+  dropped, so a worker that read the row before a concurrent PUT/DELETE cannot re-cache it
+- the geometry is part of the file name (<SHARED_CACHE_PATH>-<sets>x<ways>x<slot>.cache): a
+  file other processes may have mapped is never resized or re-laid out, so workers started
+  with another SHARED_CACHE_SIZE_MB simply use another table
+"""
+import os
+import json
+import time
+import zlib
+import mmap
+import fcntl
+import struct
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from flask import current_app
+
+logger = logging.getLogger('gptb2.cache')
+
+EXTENSION_KEY = 'shared_cache'
+MAGIC = b'GPTB2SC1'
+HEADER = struct.Struct('<8sIII')           # magic, sets, ways, slot size
+HEADER_SIZE = 64
+GENERATION = struct.Struct('<Q')
+SEQUENCE = struct.Struct('<Q')
+SLOT = struct.Struct('<QqdII')             # sequence, key (0 = empty), expires_at, length, crc32
+
+
+def default_path():
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, 'gptb2-equation-cache')
+
+
+class SharedCache:
+    """Fixed-size set-associative cache of bytes payloads keyed by positive integers"""
+
+    def __init__(self, path, size_bytes, slot_bytes=1024, ways=8):
+        self.slot_bytes = slot_bytes
+        self.ways = ways
+        self.sets = max(1, (size_bytes - HEADER_SIZE) // (ways * (slot_bytes + GENERATION.size)))
+        self.path = f'{path}-{self.sets}x{ways}x{slot_bytes}.cache'
+        self.slots_offset = HEADER_SIZE + self.sets * GENERATION.size
+        self.size = self.slots_offset + self.sets * ways * slot_bytes
+        self.max_payload = slot_bytes - SLOT.size
+        self.thread_lock = threading.Lock()
+        self.stats = dict.fromkeys(
+            ('hits', 'misses', 'stores', 'stale_stores', 'oversize', 'evictions', 'invalidations'), 0
+        )
+
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        expected = HEADER.pack(MAGIC, self.sets, ways, slot_bytes)
+        with self._write_lock():
+            size = os.fstat(self.fd).st_size
+            if size == 0:
+                # First worker with this geometry: nobody can have mapped an empty file
+                os.ftruncate(self.fd, self.size)
+            header = os.pread(self.fd, HEADER.size, 0)
+            if header == bytes(HEADER.size) and os.fstat(self.fd).st_size == self.size:
+                # Sized but not initialized yet (its creator died in between)
+                os.pwrite(self.fd, expected, 0)
+                header = expected
+            valid = header == expected and os.fstat(self.fd).st_size == self.size
+        if not valid:
+            # Another version or a damaged file: truncating it would SIGBUS its other users
+            os.close(self.fd)
+            raise ValueError(f'{self.path} does not hold a cache with this layout')
+        self.map = mmap.mmap(self.fd, self.size)
+
+    def close(self):
+        self.map.close()
+        os.close(self.fd)
+
+    @contextmanager
+    def _write_lock(self):
+        # lockf locks belong to the process, so threads of one worker also need the thread lock
+        with self.thread_lock:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN)
+
+    def _set_index(self, key):
+        return key % self.sets
+
+    def _slot_offset(self, set_index, way):
+        return self.slots_offset + (set_index * self.ways + way) * self.slot_bytes
+
+    def generation(self, key):
+        """Take before reading the source of truth; pass to put()"""
+        return GENERATION.unpack_from(self.map, HEADER_SIZE + self._set_index(key) * GENERATION.size)[0]
+
+    def _bump_generation(self, set_index):
+        offset = HEADER_SIZE + set_index * GENERATION.size
+        GENERATION.pack_into(self.map, offset, GENERATION.unpack_from(self.map, offset)[0] + 1)
+
+    def get(self, key):
+        set_index = self._set_index(key)
+        now = time.time()
+        for way in range(self.ways):
+            offset = self._slot_offset(set_index, way)
+            sequence, slot_key, expires_at, length, crc = SLOT.unpack_from(self.map, offset)
+            if slot_key != key or sequence & 1:
+                continue
+            if expires_at < now or length > self.max_payload:
+                break
+            payload = self.map[offset + SLOT.size:offset + SLOT.size + length]
+            if SEQUENCE.unpack_from(self.map, offset)[0] != sequence or zlib.crc32(payload) != crc:
+                break
+            self.stats['hits'] += 1
+            return payload
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key, payload, ttl, generation):
+        if len(payload) > self.max_payload:
+            self.stats['oversize'] += 1
+            return False
+
+        set_index = self._set_index(key)
+        with self._write_lock():
+            if self.generation(key) != generation:
+                self.stats['stale_stores'] += 1
+                return False
+
+            now = time.time()
+            victim, victim_expires = None, None
+            for way in range(self.ways):
+                offset = self._slot_offset(set_index, way)
+                _, slot_key, expires_at, _, _ = SLOT.unpack_from(self.map, offset)
+                if slot_key == key or slot_key == 0 or expires_at < now:
+                    victim = offset
+                    break
+                if victim is None or expires_at < victim_expires:
+                    victim, victim_expires = offset, expires_at
+            else:
+                self.stats['evictions'] += 1
+
+            self._write_slot(victim, key, now + ttl, payload)
+        self.stats['stores'] += 1
+        return True
+
+    def _write_slot(self, offset, key, expires_at, payload):
+        sequence = SEQUENCE.unpack_from(self.map, offset)[0]
+        SEQUENCE.pack_into(self.map, offset, sequence + 1)
+        self.map[offset + SLOT.size:offset + SLOT.size + len(payload)] = payload
+        SLOT.pack_into(self.map, offset, sequence + 1, key, expires_at, len(payload), zlib.crc32(payload))
+        SEQUENCE.pack_into(self.map, offset, sequence + 2)
+
+    def invalidate(self, keys):
+        with self._write_lock():
+            for key in keys:
+                set_index = self._set_index(key)
+                self._bump_generation(set_index)
+                for way in range(self.ways):
+                    offset = self._slot_offset(set_index, way)
+                    if SLOT.unpack_from(self.map, offset)[1] == key:
+                        self._write_slot(offset, 0, 0.0, b'')
+                self.stats['invalidations'] += 1
+
+    def clear(self):
+        with self._write_lock():
+            for set_index in range(self.sets):
+                self._bump_generation(set_index)
+                for way in range(self.ways):
+                    offset = self._slot_offset(set_index, way)
+                    if SLOT.unpack_from(self.map, offset)[1]:
+                        self._write_slot(offset, 0, 0.0, b'')
+
+    def occupancy(self):
+        now = time.time()
+        used = 0
+        for index in range(self.sets * self.ways):
+            _, key, expires_at, _, _ = SLOT.unpack_from(self.map, self.slots_offset + index * self.slot_bytes)
+            if key and expires_at >= now:
+                used += 1
+        return {'slots': self.sets * self.ways, 'used': used, 'size_bytes': self.size, 'path': self.path}
+
+
+def get_cache(app=None):
+    """This worker's mapping of the shared cache (opened on first use), or None when disabled"""
+    app = app or current_app
+    state = app.extensions.get(EXTENSION_KEY)
+    if state is None or not app.config['SHARED_CACHE_ENABLED']:
+        return None
+    # Opened lazily so each gunicorn worker maps the file itself after fork
+    if state['cache'] is None or state['pid'] != os.getpid():
+        with state['lock']:
+            if state['cache'] is None or state['pid'] != os.getpid():
+                try:
+                    state['cache'] = SharedCache(
+                        app.config['SHARED_CACHE_PATH'],
+                        app.config['SHARED_CACHE_SIZE_MB'] * 1024 * 1024,
+                        slot_bytes=app.config['SHARED_CACHE_SLOT_BYTES']
+                    )
+                except (OSError, ValueError) as e:
+                    logger.warning("Shared cache disabled, cannot map %s: %s", app.config['SHARED_CACHE_PATH'], e)
+                    app.config['SHARED_CACHE_ENABLED'] = False
+                    return None
+                state['pid'] = os.getpid()
+    return state['cache']
+
+
+def lookup_equation(equation_id):
+    """Return (cached equation dict or None, generation to pass to store_equation)"""
+    cache = get_cache()
+    if cache is None:
+        return None, None
+    payload = cache.get(equation_id)
+    if payload is not None:
+        return json.loads(payload), None
+    return None, cache.generation(equation_id)
+
+
+def store_equation(equation_data, generation):
+    cache = get_cache()
+    if cache is None or generation is None:
+        return
+    payload = json.dumps(equation_data, separators=(',', ':')).encode('utf-8')
+    cache.put(equation_data['id'], payload, current_app.config['SHARED_CACHE_TTL_SECONDS'], generation)
+
+
+def invalidate_equations(ids):
+    """Drop ids from the host-wide cache; call after the write has committed"""
+    cache = get_cache()
+    if cache is not None and ids:
+        cache.invalidate(ids)
+
+
+def stats():
+    """Per-worker counters plus the shared table's occupancy"""
+    cache = get_cache()
+    if cache is None:
+        return {'enabled': False, 'pid': os.getpid()}
+    lookups = cache.stats['hits'] + cache.stats['misses']
+    return dict(
+        cache.stats,
+        enabled=True,
+        pid=os.getpid(),
+        hit_rate=round(cache.stats['hits'] / lookups, 4) if lookups else None,
+        shared=cache.occupancy()
+    )
+
+
+def init_app(app):
+    """Attach the host-wide equation cache to a Flask app"""
+    app.config.setdefault('SHARED_CACHE_ENABLED', True)
+    app.config.setdefault('SHARED_CACHE_PATH', default_path())
+    app.config.setdefault('SHARED_CACHE_SIZE_MB', 16)
+    app.config.setdefault('SHARED_CACHE_SLOT_BYTES', 1024)
+    app.config.setdefault('SHARED_CACHE_TTL_SECONDS', 300.0)
+
+    app.extensions[EXTENSION_KEY] = {'cache': None, 'pid': None, 'lock': threading.Lock()}
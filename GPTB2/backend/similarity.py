@@ -0,0 +1,373 @@
+"""
+Similar-equations lookup for GPTB2 backend
+In-memory k-d trees over the (a, b, c) coefficients of the equations table, one per worker.
+
+The index is built from the database on first use (or at worker start when
+SIMILARITY_INDEX_WARM is on) and kept current incrementally:
+- writes handled by this worker update it directly (record_upsert / record_delete)
+- rows other workers or replicas created or updated are pulled every SIMILARITY_INDEX_REFRESH_SECONDS:
+  ids above the last pulled id, plus rows updated since the last pull (minus an overlap window
+  for commits that land late). Only these pulls move the watermark; this worker's own writes
+  never do, so a lower id committed elsewhere is not skipped
+- results are checked against the rows read for the response; stale entries are fixed and the query re-run,
+  which is how rows other processes deleted or archived leave the index
+- optionally (SIMILARITY_INDEX_REBUILD_SECONDS > 0, off by default), a periodic full rebuild; it
+  runs in a background thread, one at a time, while requests keep searching the previous trees.
+  It reads the whole table and builds the trees in Python while holding the GIL (about 1 s per
+  100k rows), stalling the worker's request threads, so keep it rare on large tables
+"""
+import math
+import time
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_, select
+from models import db, Equation
+
+logger = logging.getLogger('gptb2.similarity')
+
+EXTENSION_KEY = 'similarity_index'
+
+
+def scale_free(a, b, c):
+    """
+    Project (a, b, c) onto the unit sphere with the first non-zero coefficient positive,
+    so k·(a, b, c) maps to the same point for any k != 0 (same equation, same roots)
+    """
+    norm = math.sqrt(a * a + b * b + c * c)
+    if norm == 0:
+        return (0.0, 0.0, 0.0)
+    sign = next(1.0 if value > 0 else -1.0 for value in (a, b, c) if value != 0)
+    return (sign * a / norm, sign * b / norm, sign * c / norm)
+
+
+class _Node:
+    __slots__ = ('point', 'id', 'axis', 'left', 'right', 'alive')
+
+    def __init__(self, point, item_id, axis):
+        self.point = point
+        self.id = item_id
+        self.axis = axis
+        self.left = None
+        self.right = None
+        self.alive = True
+
+
+class KDTree:
+    """
+    k-d tree with incremental insert and lazy delete.
+    Deleted nodes stay in place as tombstones; the tree is rebuilt balanced once
+    tombstones or unbalanced inserts outnumber the live points.
+    """
+
+    def __init__(self, items=(), dims=3):
+        self.dims = dims
+        self.nodes = {}
+        self.root = None
+        self.dead = 0
+        self.inserted = 0
+        self._build_from(list(items))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, item_id):
+        return item_id in self.nodes
+
+    def point(self, item_id):
+        node = self.nodes.get(item_id)
+        return node.point if node else None
+
+    def _build_from(self, items):
+        """items: [(id, point), ...]"""
+        self.nodes = {}
+        self.dead = 0
+        self.inserted = 0
+        self.root = self._build(items, 0)
+
+    def _build(self, items, depth):
+        if not items:
+            return None
+        axis = depth % self.dims
+        items.sort(key=lambda item: item[1][axis])
+        median = len(items) // 2
+        item_id, point = items[median]
+        node = _Node(point, item_id, axis)
+        self.nodes[item_id] = node
+        node.left = self._build(items[:median], depth + 1)
+        node.right = self._build(items[median + 1:], depth + 1)
+        return node
+
+    def rebuild(self):
+        self._build_from([(node.id, node.point) for node in self.nodes.values()])
+
+    def insert(self, item_id, point):
+        """Insert or move a point"""
+        point = tuple(float(value) for value in point)
+        existing = self.nodes.get(item_id)
+        if existing is not None:
+            if existing.point == point:
+                return
+            self.remove(item_id)
+
+        if self.root is None:
+            self.root = self.nodes[item_id] = _Node(point, item_id, 0)
+            return
+
+        parent = self.root
+        while True:
+            side = 'right' if point[parent.axis] >= parent.point[parent.axis] else 'left'
+            child = getattr(parent, side)
+            if child is None:
+                node = _Node(point, item_id, (parent.axis + 1) % self.dims)
+                setattr(parent, side, node)
+                self.nodes[item_id] = node
+                break
+            parent = child
+
+        self.inserted += 1
+        if self.inserted > max(64, len(self.nodes) // 2):
+            self.rebuild()
+
+    def remove(self, item_id):
+        node = self.nodes.pop(item_id, None)
+        if node is None:
+            return False
+        node.alive = False
+        self.dead += 1
+        if self.dead > max(64, len(self.nodes)):
+            self.rebuild()
+        return True
+
+    def nearest(self, point, k):
+        """Return [(distance, id), ...] for the k live points closest to `point`, closest first"""
+        if k <= 0:
+            return []
+        heap = []  # max-heap of (-squared distance, -id): ties resolve to the lower id
+        stack = [(self.root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if node is None or (len(heap) == k and bound > -heap[0][0]):
+                continue
+            if node.alive:
+                distance = sum((p - q) * (p - q) for p, q in zip(node.point, point))
+                entry = (-distance, -node.id)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+            diff = point[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            # Every point beyond the splitting plane is at least |diff| away along this axis
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        return sorted((math.sqrt(-distance), -item_id) for distance, item_id in heap)
+
+
+class SimilarityIndex:
+    """Raw and scale-normalized coefficient trees for one worker, guarded by one lock"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # Held while a full build runs, and by the thread pulling increments: never both twice
+        self.build_lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.raw = None
+        self.normalized = None
+        # Sync watermark: highest id and updated_at horizon read from the database
+        self.synced_id = 0
+        self.synced_since = None
+        self.built_at = None
+        self.synced_at = None
+
+    @property
+    def loaded(self):
+        return self.raw is not None
+
+    def load(self, rows, since):
+        """(Re)build both trees from (id, a, b, c) rows read from the database at `since`"""
+        rows = list(rows)
+        raw = KDTree((row[0], (row[1], row[2], row[3])) for row in rows)
+        normalized = KDTree((row[0], scale_free(row[1], row[2], row[3])) for row in rows)
+        with self.lock:
+            self.raw, self.normalized = raw, normalized
+            self.synced_id = max((row[0] for row in rows), default=0)
+            self.synced_since = since
+            self.built_at = self.synced_at = time.monotonic()
+
+    def pull(self, rows, since):
+        """Apply rows changed in the database since the last pull and advance the watermark"""
+        rows = list(rows)
+        with self.lock:
+            self.upsert(rows)
+            self.synced_id = max([self.synced_id] + [row[0] for row in rows])
+            self.synced_since = since
+            self.synced_at = time.monotonic()
+
+    def upsert(self, rows):
+        with self.lock:
+            if not self.loaded:
+                return
+            for item_id, a, b, c in rows:
+                self.raw.insert(item_id, (a, b, c))
+                self.normalized.insert(item_id, scale_free(a, b, c))
+
+    def remove(self, ids):
+        with self.lock:
+            if not self.loaded:
+                return
+            for item_id in ids:
+                self.raw.remove(item_id)
+                self.normalized.remove(item_id)
+
+    def nearest(self, a, b, c, k, normalize=False):
+        with self.lock:
+            if normalize:
+                return self.normalized.nearest(scale_free(a, b, c), k)
+            return self.raw.nearest((a, b, c), k)
+
+    def matches(self, equation):
+        """True when the indexed point for this row still equals its coefficients"""
+        return self.raw.point(equation.id) == (equation.a, equation.b, equation.c)
+
+    def __len__(self):
+        return len(self.raw) if self.loaded else 0
+
+
+def _all_rows(since_id=None, since=None):
+    """(id, a, b, c) of every row, or of rows above since_id or updated at or after since"""
+    statement = select(Equation.id, Equation.a, Equation.b, Equation.c)
+    if since_id is not None:
+        changed = Equation.id > since_id
+        if since is not None:
+            changed = or_(changed, Equation.updated_at >= since)
+        statement = statement.where(changed)
+    return [tuple(row) for row in db.session.execute(statement)]
+
+
+def _sync_horizon(app):
+    """
+    updated_at the next pull starts from: now minus the delta-sync window, which covers
+    rows stamped before this read but committed after it, and clock skew with MySQL
+    """
+    return datetime.utcnow() - timedelta(seconds=app.config.get('DELTA_SYNC_WINDOW_SECONDS', 5.0))
+
+
+def get_index(app=None):
+    return (app or current_app).extensions[EXTENSION_KEY]
+
+
+def ensure_fresh(app=None):
+    """
+    Return the worker's index, loading it on first use and pulling in rows other workers
+    wrote since the last sync. When periodic rebuilds are on and it is older than the rebuild
+    interval, one background thread rebuilds it; until it is done, requests search the current trees
+    """
+    # The real app object, not the context-local proxy: a rebuild thread may need it
+    app = app or current_app._get_current_object()
+    index = get_index(app)
+
+    if not index.loaded:
+        # Nothing to serve yet: the first build runs inline, once, and the others wait for it
+        with index.build_lock:
+            if not index.loaded:
+                _build(app, index)
+        return index
+
+    now = time.monotonic()
+    rebuild_seconds = app.config['SIMILARITY_INDEX_REBUILD_SECONDS']
+    if rebuild_seconds > 0 and now - index.built_at >= rebuild_seconds \
+            and index.build_lock.acquire(blocking=False):
+        threading.Thread(target=_rebuild_in_background, args=(app, index),
+                         name='similarity-rebuild', daemon=True).start()
+
+    if now - index.synced_at >= app.config['SIMILARITY_INDEX_REFRESH_SECONDS'] \
+            and index.sync_lock.acquire(blocking=False):
+        try:
+            since = _sync_horizon(app)
+            index.pull(_all_rows(since_id=index.synced_id, since=index.synced_since), since)
+        finally:
+            index.sync_lock.release()
+    return index
+
+
+def _build(app, index):
+    started = time.perf_counter()
+    since = _sync_horizon(app)
+    index.load(_all_rows(), since)
+    logger.info("Similarity index built: %d equations in %.1f ms",
+                len(index), (time.perf_counter() - started) * 1000)
+
+
+def _rebuild_in_background(app, index):
+    """Full rebuild started by ensure_fresh(), which acquired index.build_lock for it"""
+    try:
+        with app.app_context():
+            _build(app, index)
+    except Exception as e:
+        # The old trees stay in use; retry after another interval rather than on every request
+        index.built_at = time.monotonic()
+        logger.warning("Similarity index rebuild failed: %s", e)
+    finally:
+        index.build_lock.release()
+
+
+def record_upsert(equations):
+    """Reflect committed creates/updates in this worker's index (no-op until it is loaded)"""
+    index = current_app.extensions.get(EXTENSION_KEY)
+    if index is not None:
+        index.upsert((eq.id, eq.a, eq.b, eq.c) for eq in equations if eq.id is not None)
+
+
+def record_delete(ids):
+    """Reflect committed deletes in this worker's index (no-op until it is loaded)"""
+    index = current_app.extensions.get(EXTENSION_KEY)
+    if index is not None:
+        index.remove(ids)
+
+
+def find_similar(a, b, c, k, normalize=False, max_attempts=3):
+    """
+    Return [(distance, Equation), ...] for the k nearest stored equations.
+    Candidates are read back with one SELECT ... WHERE id IN (...); rows deleted or changed
+    by another worker are corrected in the index and the search repeated.
+    """
+    index = ensure_fresh()
+    for _ in range(max_attempts):
+        neighbours = index.nearest(a, b, c, k, normalize)
+        ids = [item_id for _, item_id in neighbours]
+        rows = {eq.id: eq for eq in Equation.query.filter(Equation.id.in_(ids))} if ids else {}
+
+        missing = [item_id for item_id in ids if item_id not in rows]
+        changed = [eq for eq in rows.values() if not index.matches(eq)]
+        if not missing and not changed:
+            return [(distance, rows[item_id]) for distance, item_id in neighbours]
+        index.remove(missing)
+        record_upsert(changed)
+
+    # Still racing with writers: answer with what was read, in distance order
+    return [(distance, rows[item_id]) for distance, item_id in neighbours if item_id in rows]
+
+
+def _warm(app):
+    try:
+        with app.app_context():
+            ensure_fresh(app)
+    except Exception as e:
+        # The database may not be reachable yet at container start; the first request builds it
+        logger.warning("Similarity index warm-up failed: %s", e)
+
+
+def init_app(app):
+    """Attach a per-worker similarity index to a Flask app"""
+    app.config.setdefault('SIMILARITY_INDEX_WARM', False)
+    app.config.setdefault('SIMILARITY_INDEX_REFRESH_SECONDS', 5.0)
+    app.config.setdefault('SIMILARITY_INDEX_REBUILD_SECONDS', 0.0)
+    app.config.setdefault('SIMILARITY_MAX_K', 100)
+
+    app.extensions[EXTENSION_KEY] = SimilarityIndex()
+    if app.config['SIMILARITY_INDEX_WARM']:
+        # Gunicorn imports the app in each worker after fork, so this runs at worker start
+        threading.Thread(target=_warm, args=(app,), name='similarity-warm', daemon=True).start()
@@ -0,0 +1,54 @@
+"""
+Pure solve for GET /api/solve?a=&b=&c=
+
+A solution is a function of (a, b, c) alone, so its response never changes and can be cached
+by browsers, nginx and CDNs for good. Every equation has exactly one canonical URL: numbers
+are written in one form (integers without a fraction, everything else as Python's shortest
+round-trip repr, -0 as 0), parameters in a, b, c order, nothing else. Requests in any other
+form are redirected there, so caches never hold the same answer under several keys.
+"""
+import math
+import hashlib
+from urllib.parse import quote
+
+# Part of every ETag: bump when the solver or the response shape changes
+SOLVER_VERSION = '1'
+PARAMETERS = ('a', 'b', 'c')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Equation.to_dict() fields of a solve response (no id or timestamps: nothing is stored).
+# canonical_hash lets clients share answers across scalar multiples (see canonical.py)
+FIELDS = ('a', 'b', 'c', 'equation_string', 'solution', 'discriminant', 'solution_type', 'canonical_hash')
+
+
+def canonical_number(value):
+    """Canonical text of a coefficient; ValueError when it is not a finite number"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f'{value!r} is not a finite number')
+    if number == 0:
+        return '0'
+    if number.is_integer() and abs(number) < 1e16:
+        return str(int(number))
+    return repr(number)
+
+
+def canonical_query(args):
+    """
+    (coefficients, canonical query string) of request args; ValueError when a coefficient
+    is missing or malformed
+    """
+    missing = [name for name in PARAMETERS if not args.get(name)]
+    if missing:
+        raise ValueError(f'Missing required parameters: {", ".join(missing)}')
+    try:
+        texts = [canonical_number(args[name]) for name in PARAMETERS]
+    except (TypeError, ValueError):
+        raise ValueError('Coefficients a, b, c must be finite numbers')
+    query = '&'.join(f'{name}={quote(text, safe="")}' for name, text in zip(PARAMETERS, texts))
+    return tuple(float(text) for text in texts), query
+
+
+def etag(query, mimetype):
+    """Strong ETag of one representation of a solve response"""
+    digest = hashlib.sha1(f'{SOLVER_VERSION}|{query}|{mimetype}'.encode()).hexdigest()
+    return digest[:32]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script cho admission control (token bucket, concurrency limit, load shedding)
+"""
+import time
+import threading
+from flask import Flask
+from models import db
+import admission
+
+
+def create_test_app(**config):
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config.update(config)
+
+    db.init_app(app)
+    admission.init_app(app)
+
+    from app import ping, get_all_equations
+
+    app.add_url_rule('/ping', 'ping', ping, methods=['GET'])
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+
+    release = threading.Event()
+
+    @app.route('/api/slow')
+    def slow():
+        release.wait(5)
+        return {'status': 'success'}
+
+    app.release = release
+    return app
+
+
+def test_token_bucket():
+    """Bursts beyond the bucket get 429 with Retry-After, and tokens refill over time"""
+    limiter = admission.RateLimiter(rate=2, burst=2)
+    assert limiter.acquire('a', now=0.0) == 0
+    assert limiter.acquire('a', now=0.0) == 0
+    assert limiter.acquire('a', now=0.0) == 0.5
+    assert limiter.acquire('b', now=0.0) == 0
+    assert limiter.acquire('a', now=0.5) == 0
+
+    app = create_test_app(ADMISSION_RATE_PER_SECOND=1, ADMISSION_BURST=2)
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            assert client.get('/api/equation').status_code == 200
+            assert client.get('/api/equation').status_code == 200
+            response = client.get('/api/equation')
+            assert response.status_code == 429
+            assert response.headers['Retry-After'] == '1'
+            assert response.get_json()['reason'] == 'rate_limited'
+
+            # Health checks are never limited
+            assert client.get('/ping').status_code == 200
+            print(f"✅ Rate limited: {response.get_json()}")
+            db.drop_all()
+
+
+def test_rate_split_across_processes():
+    """Each of ADMISSION_PROCESSES processes enforces its share of the per-client rate"""
+    app = create_test_app(ADMISSION_RATE_PER_SECOND=20, ADMISSION_BURST=40, ADMISSION_PROCESSES=4)
+    limiter = app.extensions[admission.EXTENSION_KEY]['rate_limiter']
+    assert limiter.rate == 5 and limiter.burst == 10
+
+    app = create_test_app(ADMISSION_RATE_PER_SECOND=1, ADMISSION_BURST=2, ADMISSION_PROCESSES=8)
+    limiter = app.extensions[admission.EXTENSION_KEY]['rate_limiter']
+    assert limiter.rate == 0.125 and limiter.burst == 1
+    print(f"✅ Per-process share: rate={limiter.rate}/s burst={limiter.burst}")
+
+
+def test_queue_delay_shedding():
+    """Requests that already waited too long upstream are rejected without running"""
+    assert admission.queue_delay('t=100.250', now=101.0) == 0.75
+    assert abs(admission.queue_delay('t=1700000000250000', now=1700000001.0) - 0.75) < 1e-6
+    assert admission.queue_delay('garbage') is None
+
+    app = create_test_app(ADMISSION_MAX_QUEUE_DELAY_MS=1000)
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            now = time.time()
+            response = client.get('/api/equation', headers={'X-Request-Start': f't={now - 0.2:.3f}'})
+            assert response.status_code == 200
+
+            # Low priority (list-all) is shed at half the delay
+            response = client.get('/api/equation', headers={'X-Request-Start': f't={now - 0.7:.3f}'})
+            assert response.status_code == 503
+            assert response.headers['Retry-After'] == '1'
+            assert response.get_json()['reason'] == 'queue_delay'
+            db.drop_all()
+
+
+def test_concurrency_limit_and_priority():
+    """Full workers queue briefly, then reject fast; expensive endpoints are shed first"""
+    app = create_test_app(
+        ADMISSION_MAX_CONCURRENT=2,
+        ADMISSION_LOW_PRIORITY_CONCURRENT=1,
+        ADMISSION_MAX_QUEUE=1,
+        ADMISSION_QUEUE_TIMEOUT_MS=50
+    )
+    limiter = app.extensions['admission']['concurrency']
+
+    def call(path, results):
+        with app.test_client() as client:
+            results.append(client.get(path).status_code)
+
+    results = []
+    holders = [threading.Thread(target=call, args=('/api/slow', results)) for _ in range(2)]
+    for thread in holders:
+        thread.start()
+    while limiter.in_flight < 2:
+        time.sleep(0.001)
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            # Low priority never waits for a slot
+            response = client.get('/api/equation')
+            assert response.status_code == 503 and response.get_json()['reason'] == 'shed'
+
+            # Normal priority waits up to the queue timeout, then gets 503
+            started = time.perf_counter()
+            response = client.get('/api/slow')
+            assert response.status_code == 503 and response.get_json()['reason'] == 'queue_timeout'
+            assert time.perf_counter() - started < 1
+
+            app.release.set()
+            for thread in holders:
+                thread.join()
+            assert results == [200, 200] and limiter.in_flight == 0
+
+            assert client.get('/api/equation').status_code == 200
+            stats = admission.stats(app)
+            assert stats['shed'] == 1 and stats['queue_timeout'] == 1 and stats['in_flight'] == 0
+            print(f"✅ Admission stats: {stats}")
+            db.drop_all()
+
+
+def test_bounded_queue():
+    """Beyond the queue bound a request is rejected immediately"""
+    limiter = admission.ConcurrencyLimiter(limit=1, max_queue=0, timeout=5, low_priority_limit=1)
+    assert limiter.acquire() is None
+    started = time.perf_counter()
+    assert limiter.acquire() == 'queue_full'
+    assert time.perf_counter() - started < 0.1
+    limiter.release()
+    assert limiter.acquire() is None
+
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_rate_split_across_processes()
+    test_queue_delay_shedding()
+    test_concurrency_limit_and_priority()
+    test_bounded_queue()
+    print("\n=== ADMISSION CONTROL TEST COMPLETED ===")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script cho archival job (Parquet cold storage) và GET ?include_archived=true
+"""
+import os
+from datetime import date, datetime
+from flask import Flask
+from models import db
+import archive
+import canonical
+
+
+def create_test_app(archive_dir):
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['ARCHIVE_DIR'] = archive_dir
+
+    db.init_app(app)
+
+    from app import create_equation, get_equation
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'get_equation', get_equation, methods=['GET'])
+
+    return app
+
+
+def test_partition_helpers():
+    """Monthly partition naming and REORGANIZE generation"""
+    assert archive.partition_name(date(2025, 1, 1)) == 'p202501'
+    assert archive.partition_month('p202512') == date(2025, 12, 1)
+    assert archive.partition_month('p_future') is None
+    assert archive.add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert archive.add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+    statement = archive.future_partitions_sql(['p202511', 'p202512', 'p_future'], date(2025, 12, 15), 2)
+    assert statement == (
+        "ALTER TABLE equations REORGANIZE PARTITION p_future INTO ("
+        "PARTITION p202601 VALUES LESS THAN ('2026-02-01'), "
+        "PARTITION p202602 VALUES LESS THAN ('2026-03-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+    )
+    assert archive.future_partitions_sql(['p202603', 'p_future'], date(2026, 1, 10), 2) is None
+    print("✅ Partition helpers")
+
+
+def _pyarrow_rows(path):
+    pa, pq = archive._pyarrow()
+    return pq.read_table(path).to_pylist()
+
+
+def test_archive_round_trip(tmp_path):
+    """Rows exported to Parquet can be served by id on request"""
+    archive_dir = str(tmp_path / 'archive')
+    created = datetime(2024, 1, 15, 10, 30)
+    # ARCHIVE_COLUMNS order: every stored column, including roots and canonical_hash
+    batches = [
+        [(1, 1.0, -5.0, 6.0, 'x₁ = 3.000000, x₂ = 2.000000', 1.0, 'two_real',
+          2.0, 3.0, 0.0, canonical.canonical_hash(1, -5, 6), created, created)],
+        [(2, 0.0, 2.0, -4.0, 'x = 2.000000', None, 'linear',
+          2.0, 2.0, 0.0, canonical.canonical_hash(0, 2, -4), created, created),
+         (3, 1.0, 0.0, 1.0, 'x₁ = 0.000000 + 1.000000i, x₂ = 0.000000 - 1.000000i', -4.0, 'complex',
+          0.0, 0.0, 1.0, canonical.canonical_hash(1, 0, 1), created, created)],
+    ]
+
+    entry = archive.write_archive(archive_dir, 'p202401', iter(batches))
+    assert entry['row_count'] == 3 and entry['min_id'] == 1 and entry['max_id'] == 3
+    assert os.path.exists(os.path.join(archive_dir, 'equations_p202401.parquet'))
+    assert archive.load_manifest(archive_dir)['files'][0]['partition'] == 'p202401'
+
+    row = archive.find_archived_equation(archive_dir, 2)
+    assert row['solution_type'] == 'linear' and row['discriminant'] is None
+    assert row['created_at'] == '2024-01-15T10:30:00' and row['archived'] is True
+    assert row['canonical_hash'] == canonical.canonical_hash(0, 1, -2)
+    assert archive.find_archived_equation(archive_dir, 99) is None
+    stored = _pyarrow_rows(os.path.join(archive_dir, 'equations_p202401.parquet'))
+    assert set(stored[2]) == set(archive.ARCHIVE_COLUMNS) and stored[2]['root_imag'] == 1.0
+    assert entry['max_updated_at'] == '2024-01-15T10:30:00'
+    print("✅ Parquet export and lookup by id")
+
+    # A partition written to after its export is not dropped
+    assert archive.export_matches(entry, 3, created)
+    assert not archive.export_matches(entry, 2, created)
+    assert not archive.export_matches(entry, 3, datetime(2025, 3, 1, 9, 0))
+    print("✅ Changes made during the export are detected before the drop")
+
+    app = create_test_app(archive_dir)
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            # Archived rows are only served when asked explicitly
+            response = client.get('/api/equation/3')
+            assert response.status_code == 404
+
+            response = client.get('/api/equation/3?include_archived=true')
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['message'] == 'Equation retrieved from archive'
+            assert data['data']['solution_type'] == 'complex' and data['data']['archived'] is True
+
+            response = client.get('/api/equation/42?include_archived=true')
+            assert response.status_code == 404
+            print("✅ GET /api/equation/<id>?include_archived=true")
+
+            db.drop_all()
+
+    archive.discard_archive(archive_dir, 'p202401')
+    assert archive.load_manifest(archive_dir)['files'] == []
+    assert not os.path.exists(os.path.join(archive_dir, 'equations_p202401.parquet'))
+    print("✅ Discarded export removed from the manifest")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_partition_helpers()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_archive_round_trip(Path(tmp))
+    print("\n=== ARCHIVE TEST COMPLETED ===")
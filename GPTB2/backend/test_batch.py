@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script cho batch API (POST /api/batch)
+"""
+from flask import Flask
+from models import db, Equation
+import instrumentation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+
+    from app import run_batch
+
+    app.add_url_rule('/api/batch', 'run_batch', run_batch, methods=['POST'])
+
+    return app
+
+
+def test_atomic_batch():
+    """Operations run in order in one transaction; "$n" refers to earlier results"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            response = client.post('/api/batch', json={'operations': [
+                {'op': 'create', 'a': 1, 'b': -3, 'c': 2},
+                {'op': 'create', 'a': 1, 'b': 2, 'c': 5},
+                {'op': 'update', 'id': '$0', 'a': 1, 'b': -5, 'c': 6},
+                {'op': 'get', 'id': '$0'},
+                {'op': 'delete', 'id': '$1'},
+                {'op': 'stats'},
+            ]})
+            body = response.get_json()
+            assert response.status_code == 200 and body['status'] == 'success'
+            assert [result['status'] for result in body['results']] == [201, 201, 200, 200, 200, 200]
+            assert body['results'][3]['data']['solution'] == body['results'][2]['data']['solution']
+            assert body['results'][3]['data']['b'] == -5.0
+            assert body['results'][5]['data']['total_equations'] == 1
+            assert Equation.query.count() == 1
+            print(f"✅ 6 operations in one request: {response.headers['X-Query-Count']} queries")
+
+            # Prefer: return=minimal answers writes with only the id
+            response = client.post('/api/batch', headers={'Prefer': 'return=minimal'},
+                                   json={'operations': [{'op': 'create', 'a': 2, 'b': 0, 'c': -8}]})
+            assert list(response.get_json()['results'][0]['data']) == ['id']
+            db.drop_all()
+
+
+def test_atomic_rollback():
+    """The first failing operation rolls the whole batch back"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            response = client.post('/api/batch', json={'operations': [
+                {'op': 'create', 'a': 1, 'b': -3, 'c': 2},
+                {'op': 'get', 'id': 999},
+                {'op': 'create', 'a': 1, 'b': 0, 'c': 0},
+            ]})
+            body = response.get_json()
+            assert response.status_code == 404 and body['failed_index'] == 1
+            assert len(body['results']) == 2
+            assert Equation.query.count() == 0
+            print(f"✅ Rolled back: {body['message']}")
+
+            for payload in ({}, {'operations': []}, {'operations': [{'op': 'x'}] * 51},
+                            {'operations': [{'op': 'stats'}], 'atomic': 'no'}):
+                assert client.post('/api/batch', json=payload).status_code == 400
+            response = client.post('/api/batch', json={'operations': [{'op': 'explode'}]})
+            assert response.status_code == 400
+            response = client.post('/api/batch', json={'operations': [{'op': 'get', 'id': '$0'}]})
+            assert response.status_code == 400
+            # Only indexes of earlier operations: no negative, signed or forward references
+            for reference in ('$-1', '$+0', '$ 0', '$1'):
+                response = client.post('/api/batch', json={'operations': [
+                    {'op': 'create', 'a': 1, 'b': 0, 'c': -1},
+                    {'op': 'get', 'id': reference},
+                ]})
+                assert response.status_code == 400 and response.get_json()['failed_index'] == 1, reference
+            assert Equation.query.count() == 0
+            print("✅ Malformed batches rejected with 400")
+            db.drop_all()
+
+
+def test_non_atomic_batch():
+    """atomic=false commits each write and reports failures per operation"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            response = client.post('/api/batch', json={'atomic': False, 'operations': [
+                {'op': 'create', 'a': 1, 'b': -3, 'c': 2},
+                {'op': 'update', 'id': 999, 'a': 1, 'b': 0, 'c': 0},
+                {'op': 'create', 'a': 1, 'b': 'x', 'c': 0},
+                {'op': 'create', 'a': 1, 'b': 0, 'c': -4},
+            ]})
+            body = response.get_json()
+            assert response.status_code == 200 and body['status'] == 'partial_success'
+            assert [result['status'] for result in body['results']] == [201, 404, 400, 201]
+            assert Equation.query.count() == 2
+            print(f"✅ Partial batch: {body['message']}")
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_atomic_batch()
+    test_atomic_rollback()
+    test_non_atomic_batch()
+    print("\n=== BATCH API TEST COMPLETED ===")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script cho bulk PUT và bulk DELETE (/api/equations/bulk)
+"""
+from flask import Flask
+from models import db
+import instrumentation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+
+    from app import (get_all_equations, create_bulk_equations,
+                     update_bulk_equations, delete_bulk_equations)
+
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+    app.add_url_rule('/api/equations/bulk', 'update_bulk_equations', update_bulk_equations, methods=['PUT'])
+    app.add_url_rule('/api/equations/bulk', 'delete_bulk_equations', delete_bulk_equations, methods=['DELETE'])
+
+    return app
+
+
+def test_bulk_update():
+    """Bulk PUT re-solves every row in one UPDATE and reports per id"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equations/bulk', json={'equations': [
+                {'a': 1, 'b': -5, 'c': 6},
+                {'a': 1, 'b': 0, 'c': 1},
+                {'a': 0, 'b': 2, 'c': -4},
+            ]})
+
+            response = client.put('/api/equations/bulk', json={'equations': [
+                {'id': 1, 'a': 1, 'b': -4, 'c': 4},
+                {'id': 2, 'a': 1, 'b': -3, 'c': 2},
+                {'id': 99, 'a': 1, 'b': 1, 'c': 1},
+                {'id': 1, 'a': 5, 'b': 5, 'c': 5},
+                {'id': 3, 'a': 'x', 'b': 1, 'c': 1},
+            ]})
+            assert response.status_code == 200
+            data = response.get_json()
+            print(f"✅ {data['message']}")
+            assert data['status'] == 'partial_success'
+            assert data['updated_count'] == 2 and data['not_found_count'] == 1 and data['error_count'] == 2
+            assert [r['status'] for r in data['results']] == ['updated', 'updated', 'not_found']
+            assert data['results'][0]['data']['solution_type'] == 'one_real'
+            assert data['results'][0]['data']['created_at'] is not None
+            # One SELECT of the targeted ids + one UPDATE ... CASE
+            assert response.headers['X-Query-Count'] == '2'
+
+            stored = {eq['id']: eq for eq in client.get('/api/equation').get_json()['data']}
+            assert stored[1]['solution_type'] == 'one_real'
+            assert stored[2]['solution'] == 'x₁ = 2.000000, x₂ = 1.000000'
+            assert stored[3]['solution_type'] == 'linear'
+
+            response = client.put('/api/equations/bulk', json={'equations': []})
+            assert response.status_code == 400
+
+            db.drop_all()
+
+
+def test_bulk_delete():
+    """Bulk DELETE by ids or by filter runs as one DELETE statement"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equations/bulk', json={'equations': [
+                {'a': 1, 'b': -5, 'c': 6},
+                {'a': 1, 'b': 0, 'c': 1},
+                {'a': 1, 'b': 1, 'c': 1},
+                {'a': 0, 'b': 2, 'c': -4},
+            ]})
+
+            response = client.delete('/api/equations/bulk', json={'ids': [1, 42]})
+            data = response.get_json()
+            print(f"✅ {data['message']}")
+            assert data['results'] == [{'id': 1, 'status': 'deleted'}, {'id': 42, 'status': 'not_found'}]
+            assert response.headers['X-Query-Count'] == '1'
+
+            response = client.delete('/api/equations/bulk', json={'filter': {'solution_type': 'complex'}})
+            data = response.get_json()
+            print(f"✅ {data['message']}")
+            assert data['status'] == 'success'
+            assert [r['id'] for r in data['results']] == [2, 3]
+
+            remaining = client.get('/api/equation').get_json()['data']
+            assert [eq['id'] for eq in remaining] == [4]
+
+            response = client.delete('/api/equations/bulk', json={'filter': {'color': 'red'}})
+            assert response.status_code == 400
+            response = client.delete('/api/equations/bulk', json={})
+            assert response.status_code == 400
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_bulk_update()
+    test_bulk_delete()
+    print("\n=== BULK UPDATE/DELETE TEST COMPLETED ===")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script cho canonical hash (scalar multiples of an equation)
+"""
+import struct
+from flask import Flask
+from models import db, Equation
+import canonical
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+
+    db.init_app(app)
+
+    from app import get_all_equations
+
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+
+    return app
+
+
+def _float32(value):
+    """Value as read back from a MySQL FLOAT column"""
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def test_canonical_form():
+    """k·(a, b, c) shares one form and hash; other equations do not"""
+    assert canonical.canonical_form(2, -10, 12) == (1.0, -5.0, 6.0)
+    assert canonical.canonical_form(0, -2, 4) == (0.0, 1.0, -2.0)
+    assert canonical.canonical_form(0, 0, 0) == (0.0, 0.0, 0.0)
+    assert canonical.canonical_form(-3, 0, 3) == (1.0, 0.0, -1.0)
+    assert str(canonical.canonical_form(-3, 0, 3)[1]) == '0.0'
+
+    base = canonical.canonical_hash(1, -5, 6)
+    assert len(base) == 32
+    for multiple in ((2, -10, 12), (-0.5, 2.5, -3), (0.1, -0.5, 0.6), (1e-20, -5e-20, 6e-20)):
+        assert canonical.canonical_hash(*multiple) == base, multiple
+    # Single-precision storage noise does not change the hash
+    assert canonical.canonical_hash(*map(_float32, (0.1, -0.5, 0.6))) == base
+    assert canonical.canonical_hash(1, -5, 6.001) != base
+    assert canonical.canonical_hash(0, 0, 1) != canonical.canonical_hash(0, 0, 0)
+    print(f"✅ Scalar multiples share canonical hash {base}")
+
+    assert canonical.parse_hash(None) is None
+    assert canonical.parse_hash(base.upper()) == base
+    for value in ('', 'xyz', base[:-1], base + '0'):
+        try:
+            canonical.parse_hash(value)
+            assert False, value
+        except ValueError:
+            pass
+    print("✅ Malformed hashes rejected")
+
+
+def test_canonical_hash_filter():
+    """GET /api/equation?canonical_hash= lists the stored multiples of one equation"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            db.session.add_all([Equation(1, -5, 6), Equation(2, -10, 12), Equation(1, -3, 2), Equation(-3, 15, -18)])
+            db.session.commit()
+
+            equation = Equation.query.filter_by(a=2.0).one()
+            assert equation.to_dict()['canonical_hash'] == canonical.canonical_hash(1, -5, 6)
+
+            target = canonical.canonical_hash(1, -5, 6)
+            response = client.get(f'/api/equation?canonical_hash={target}')
+            body = response.get_json()
+            assert response.status_code == 200 and body['count'] == 3
+            # Same roots (the solution text lists them in another order when k < 0)
+            ids = [eq['id'] for eq in body['data']]
+            assert {(eq.root1_real, eq.root2_real) for eq in Equation.query.filter(Equation.id.in_(ids))} == {(2.0, 3.0)}
+            print(f"✅ Filtered list: {body['count']} multiples of (1, -5, 6)")
+
+            response = client.get(f'/api/equation?canonical_hash={target}&limit=2&fields=id,canonical_hash')
+            body = response.get_json()
+            assert body['count'] == 2 and body['next_cursor']
+            assert all(set(eq) == {'id', 'canonical_hash'} for eq in body['data'])
+            response = client.get(f'/api/equation?canonical_hash={target}&limit=2&cursor={body["next_cursor"]}')
+            assert response.get_json()['count'] == 1
+            print("✅ Filtered keyset pages")
+
+            for query in ('canonical_hash=nothex', f'canonical_hash={target}&since='):
+                assert client.get(f'/api/equation?{query}').status_code == 400, query
+            print("✅ Malformed or delta-sync filters rejected with 400")
+            db.drop_all()
+
+
+def test_backfill():
+    """Rows written before the column existed get their hash in batches"""
+    app = create_test_app()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Equation(1, -5, 6), Equation(2, -4, 2), Equation(0, 1, 1)])
+        db.session.commit()
+        before = {eq.id: eq.updated_at for eq in Equation.query}
+        db.session.execute(Equation.__table__.update().values(canonical_hash=None, updated_at=Equation.updated_at))
+        db.session.commit()
+        db.session.expire_all()
+
+        assert canonical.backfill(db.session, batch_size=2) == 3
+        for equation in Equation.query:
+            assert equation.canonical_hash == canonical.canonical_hash(equation.a, equation.b, equation.c)
+            assert equation.updated_at == before[equation.id]
+        assert canonical.backfill(db.session) == 0
+        print("✅ Backfill filled 3 rows in batches of 2, updated_at untouched")
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    test_canonical_form()
+    test_canonical_hash_filter()
+    test_backfill()
+    print("\n=== CANONICAL HASH TEST COMPLETED ===")
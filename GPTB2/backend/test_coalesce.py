@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script cho single-flight request coalescing
+"""
+import time
+import threading
+from flask import Flask, jsonify, request
+from models import db
+import coalesce
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+
+    db.init_app(app)
+    coalesce.init_app(app)
+
+    from app import get_equation_stats, get_worker_metrics
+
+    app.add_url_rule('/api/equations/stats', 'get_equation_stats', get_equation_stats, methods=['GET'])
+    app.add_url_rule('/api/metrics', 'get_worker_metrics', get_worker_metrics, methods=['GET'])
+
+    app.calls = 0
+    app.release = threading.Event()
+
+    @app.route('/api/slow', methods=['GET', 'POST'])
+    @coalesce.single_flight()
+    def slow():
+        app.calls += 1
+        app.release.wait(5)
+        return jsonify({'status': 'success', 'n': request.args.get('n')})
+
+    return app
+
+
+def test_single_flight_shares_one_call():
+    """Concurrent callers with one key run fn once; errors propagate to everyone"""
+    flight = coalesce.SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', fn)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('k', fn))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)  # let every follower block on the leader
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [(42, False)] + [(42, True)] * 4
+    assert flight.calls == {}
+
+    def boom():
+        raise ValueError('db down')
+    try:
+        flight.do('k', boom)
+        assert False, 'expected ValueError'
+    except ValueError:
+        pass
+    assert flight.do('k', lambda: 1) == (1, False)
+
+
+def test_concurrent_requests_coalesced():
+    """Identical concurrent GETs share the leader's response and are counted"""
+    app = create_test_app()
+    responses = []
+
+    def call(path):
+        with app.test_client() as client:
+            response = client.get(path)
+            responses.append((response.status_code, response.get_json(), response.headers.get('X-Coalesced')))
+
+    threads = [threading.Thread(target=call, args=('/api/slow?n=1',)) for _ in range(5)]
+    threads[0].start()
+    while app.calls == 0:
+        pass
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)  # let every follower block on the leader
+    app.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert app.calls == 1
+    assert all(status == 200 and body['n'] == '1' for status, body, _ in responses)
+    assert sorted(str(coalesced) for _, _, coalesced in responses) == ['None'] + ['true'] * 4
+
+    # Different arguments and non-GET requests are never merged
+    with app.test_client() as client:
+        client.get('/api/slow?n=2')
+        client.post('/api/slow')
+    assert app.calls == 3
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.get('/api/equations/stats')
+            metrics = client.get('/api/metrics').get_json()['metrics']['coalescing']
+            assert metrics['slow'] == {'executed': 2, 'coalesced': 4}
+            assert metrics['get_equation_stats'] == {'executed': 1, 'coalesced': 0}
+            print(f"✅ Coalescing metrics: {metrics}")
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_single_flight_shares_one_call()
+    test_concurrent_requests_coalesced()
+    print("\n=== COALESCING TEST COMPLETED ===")
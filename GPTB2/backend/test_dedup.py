@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script cho dedup mode (POST /api/equation?dedup=true, POST /api/equations/bulk?dedup=true)
+"""
+from flask import Flask
+from models import db, Equation, EquationDedup
+import instrumentation
+import dedup
+
+
+def create_test_app(dedup_enabled=False):
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+    app.config['DEDUP_ENABLED'] = dedup_enabled
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+
+    from app import create_equation, create_bulk_equations, update_equation, delete_equation
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'update_equation', update_equation, methods=['PUT'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'delete_equation', delete_equation, methods=['DELETE'])
+
+    return app
+
+
+def test_coefficient_hash():
+    """Exact coefficients as stored in single precision; -0 is 0; multiples differ"""
+    assert dedup.coefficient_hash(1, -5, 6) == dedup.coefficient_hash(1.0, -5.0, 6.0)
+    assert dedup.coefficient_hash(0.0, 1, 2) == dedup.coefficient_hash(-0.0, 1, 2)
+    assert dedup.coefficient_hash(2, -10, 12) != dedup.coefficient_hash(1, -5, 6)
+    assert dedup.coefficient_hash(0.1, 0, 0) == dedup.coefficient_hash(0.10000000000000001, 0, 0)
+    assert len(dedup.coefficient_hash(1e300, 0, 0)) == 32
+    print("✅ Coefficient hash")
+
+
+def test_dedup_create():
+    """A repeated POST returns the stored equation and bumps its hit counter"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            first = client.post('/api/equation?dedup=true', json={'a': 1, 'b': -5, 'c': 6})
+            assert first.status_code == 201 and 'deduplicated' not in first.get_json()
+            equation_id = first.get_json()['data']['id']
+
+            again = client.post('/api/equation?dedup=true', json={'a': 1.0, 'b': -5, 'c': 6})
+            body = again.get_json()
+            assert again.status_code == 200 and body['deduplicated'] is True
+            assert body['data']['id'] == equation_id and body['data']['solution'] == first.get_json()['data']['solution']
+            assert Equation.query.count() == 1
+            assert db.session.get(EquationDedup, dedup.coefficient_hash(1, -5, 6)).hits == 2
+            print(f"✅ Duplicate answered with equation {equation_id} in {again.headers['X-Query-Count']} queries")
+
+            # Without dedup, and for scalar multiples, rows are inserted as before
+            assert client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6}).status_code == 201
+            assert client.post('/api/equation?dedup=true', json={'a': 2, 'b': -10, 'c': 12}).status_code == 201
+            assert Equation.query.count() == 3
+
+            # A stored equation updated to other coefficients no longer answers the old ones
+            client.put(f'/api/equation/{equation_id}', json={'a': 1, 'b': -3, 'c': 2})
+            repaired = client.post('/api/equation?dedup=true', json={'a': 1, 'b': -5, 'c': 6})
+            assert repaired.status_code == 201 and repaired.get_json()['data']['id'] != equation_id
+            replacement = repaired.get_json()['data']['id']
+            assert db.session.get(EquationDedup, dedup.coefficient_hash(1, -5, 6)).equation_id == replacement
+
+            # Nor does a deleted one
+            client.delete(f'/api/equation/{replacement}')
+            response = client.post('/api/equation?dedup=true', json={'a': 1, 'b': -5, 'c': 6})
+            assert response.status_code == 201
+            print("✅ Updated and deleted equations are replaced")
+            db.drop_all()
+
+
+def test_dedup_bulk():
+    """Bulk creates insert each new coefficient once and keep request order"""
+    app = create_test_app(dedup_enabled=True)
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            stored = client.post('/api/equation', json={'a': 1, 'b': -3, 'c': 2}).get_json()['data']
+
+            response = client.post('/api/equations/bulk', json={'equations': [
+                {'a': 1, 'b': 0, 'c': -4},
+                {'a': 1, 'b': -3, 'c': 2},
+                {'a': 1, 'b': 'x', 'c': 0},
+                {'a': 1, 'b': 0, 'c': -4},
+            ]})
+            body = response.get_json()
+            assert response.status_code == 200 and body['status'] == 'partial_success'
+            assert body['created_count'] == 1 and body['deduplicated_indexes'] == [1, 3]
+            ids = [eq['id'] for eq in body['created_equations']]
+            assert len(ids) == 3 and ids[0] == ids[2] and ids[1] == stored['id']
+            assert Equation.query.count() == 2
+            assert db.session.get(EquationDedup, dedup.coefficient_hash(1, 0, -4)).hits == 2
+            print(f"✅ Bulk dedup: {body['message']}")
+
+            response = client.post('/api/equations/bulk', json={'equations': [{'a': 1, 'b': 0, 'c': -4}]})
+            assert response.status_code == 200 and response.get_json()['created_count'] == 0
+            response = client.post('/api/equations/bulk?dedup=false', json={'equations': [{'a': 1, 'b': 0, 'c': -4}]})
+            assert response.status_code == 201 and 'deduplicated_indexes' not in response.get_json()
+            assert Equation.query.count() == 3
+            print("✅ DEDUP_ENABLED default and ?dedup=false opt-out")
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_coefficient_hash()
+    test_dedup_create()
+    test_dedup_bulk()
+    print("\n=== DEDUP MODE TEST COMPLETED ===")
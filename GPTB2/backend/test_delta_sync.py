@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script cho delta sync (GET /api/equation?since=, tombstones, full resync)
+"""
+from datetime import datetime, timedelta
+from flask import Flask
+from models import db, EquationDeletion
+import delta_sync
+import instrumentation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+    # No overlap window, so the test can tell rows before and after a token apart
+    app.config['DELTA_SYNC_WINDOW_SECONDS'] = 0
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+    delta_sync.init_app(app)
+
+    from app import (create_equation, get_all_equations, update_equation,
+                     delete_equation, delete_bulk_equations)
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'update_equation', update_equation, methods=['PUT'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'delete_equation', delete_equation, methods=['DELETE'])
+    app.add_url_rule('/api/equations/bulk', 'delete_bulk_equations', delete_bulk_equations, methods=['DELETE'])
+
+    return app
+
+
+def test_delta_sync():
+    """A delta returns only changed rows and tombstones since the token"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            for b in (-5, -3, 0, 2):
+                client.post('/api/equation', json={'a': 1, 'b': b, 'c': 1})
+
+            assert 'sync_token' not in client.get('/api/equation').get_json()
+            full = client.get('/api/equation?since=').get_json()
+            assert full['count'] == 4 and 'delta' not in full
+            token = full['sync_token']
+            print(f"✅ Full list carries sync_token {token}")
+
+            client.put('/api/equation/2', json={'a': 2, 'b': -3, 'c': 1})
+            client.post('/api/equation', json={'a': 1, 'b': 7, 'c': 1})
+            client.delete('/api/equation/3')
+            client.delete('/api/equations/bulk', json={'ids': [4]})
+
+            response = client.get(f'/api/equation?since={token}')
+            delta = response.get_json()
+            assert delta['delta'] is True
+            assert [eq['id'] for eq in delta['data']] == [2, 5]
+            assert delta['deleted'] == [3, 4]
+            assert delta['sync_token'] > token
+            assert int(response.headers['X-Query-Count']) == 2
+            print("✅ Delta: 2 changed rows, 2 tombstones (trigger-logged), 2 statements")
+
+            # Deletes are logged by the trigger, so the DELETE itself stays one statement
+            response = client.delete('/api/equation/1')
+            assert int(response.headers['X-Query-Count']) == 1
+            assert db.session.query(EquationDeletion).count() == 3
+
+            empty = client.get(f"/api/equation?since={delta['sync_token']}").get_json()
+            assert empty['data'] == [] and empty['deleted'] == [1]
+            print("✅ Next delta holds only the newest tombstone")
+
+            assert client.get('/api/equation?since=yesterday').status_code == 400
+            print("✅ Malformed token rejected with 400")
+
+            stale = (datetime.utcnow() - timedelta(days=31)).isoformat()
+            resync = client.get(f'/api/equation?since={stale}').get_json()
+            assert resync['full_resync'] is True and resync['count'] == 2
+            print("✅ Token older than the tombstone retention gets a full resync")
+
+            with db.engine.begin() as connection:
+                removed = delta_sync.prune_deletion_log(connection, 30, now=datetime.utcnow() + timedelta(days=31))
+            assert removed == 3
+            print("✅ Deletion log pruned")
+
+
+if __name__ == "__main__":
+    test_delta_sync()
+    print("\n=== DELTA SYNC TEST COMPLETED ===")
@@ -228,7 +228,7 @@ def main():
     print("4. ✅ RUN pip install - Dependencies would be installed")
     print("5. ✅ COPY . . - Application code ready")
     print("6. ✅ EXPOSE 5000 - Port configuration ready")
-    print("7. ✅ CMD python app.py - Application start command ready")
+    print("7. ✅ CMD gunicorn app:app - Application start command ready")
     
     print("\n📝 DOCKER BUILD COMMAND:")
     print("sudo docker build -t gptb2-backend .")
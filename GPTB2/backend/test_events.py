@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script cho change feed (Server-Sent Events, Last-Event-ID replay, UDP publish)
+"""
+import json
+import time
+from flask import Flask
+from models import db
+import events
+
+
+def create_test_app(**config):
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['EVENTS_HEARTBEAT_SECONDS'] = 0.05
+    app.config['EVENTS_REPLAY_SIZE'] = 3
+    app.config.update(config)
+
+    db.init_app(app)
+    events.init_app(app)
+
+    from app import (create_equation, update_equation, delete_equation,
+                     delete_bulk_equations, stream_events)
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'update_equation', update_equation, methods=['PUT'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'delete_equation', delete_equation, methods=['DELETE'])
+    app.add_url_rule('/api/equations/bulk', 'delete_bulk_equations', delete_bulk_equations, methods=['DELETE'])
+    app.add_url_rule('/api/events', 'stream_events', stream_events, methods=['GET'])
+
+    return app
+
+
+def parse_events(chunk):
+    """SSE text -> [(id, event, data)]; comments and retry lines are skipped"""
+    parsed = []
+    for block in chunk.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if line and not line.startswith(':') and ': ' in line)
+        if 'event' in fields:
+            parsed.append((fields['id'], fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+def next_events(body):
+    """Read chunks until one carries events (skipping keepalives)"""
+    for _ in range(10):
+        parsed = parse_events(next(body).decode('utf-8'))
+        if parsed:
+            return parsed
+    raise AssertionError('no events received')
+
+
+def test_change_feed_buffer():
+    """Replay after a sequence number, timeouts, and falling out of the buffer"""
+    feed = events.ChangeFeed(3)
+    assert feed.read(0, timeout=0.01) == []
+    for i in range(5):
+        feed.append('created', {'n': i})
+    assert [seq for seq, _, _ in feed.read(3)] == [4, 5]
+    assert feed.read(1) is None  # event 2 was evicted
+    assert feed.parse_event_id(feed.event_id(4)) == 4
+    assert feed.parse_event_id('0-4') is None and feed.parse_event_id(feed.event_id(99)) is None
+    print("✅ ChangeFeed replay, timeout and eviction")
+
+    # EVENTS_REPLAY_SIZE=0: no replay, but live events still reach subscribers
+    feed = events.ChangeFeed(0)
+    feed.append('created', {'n': 1})
+    assert [seq for seq, _, _ in feed.read(0)] == [1]
+    feed.append('created', {'n': 2})
+    assert [seq for seq, _, _ in feed.read(1)] == [2] and feed.read(0) is None
+    print("✅ Replay size 0 keeps the newest event only")
+
+
+def test_event_stream():
+    """Writes appear on the stream as they commit; Last-Event-ID resumes or resets"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            response = client.get('/api/events')
+            assert response.status_code == 200
+            assert response.mimetype == 'text/event-stream'
+            body = response.response
+            assert next(body).decode('utf-8').startswith('retry: ')
+            (ready_id, kind, _), = next_events(body)
+            assert kind == 'ready'
+
+            client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6})
+            (created_id, kind, data), = next_events(body)
+            assert kind == 'created' and data['equations'][0]['solution_type'] == 'two_real'
+            print("✅ created event streamed after commit")
+
+            client.put('/api/equation/1', json={'a': 1, 'b': 2, 'c': 5})
+            client.delete('/api/equation/1')
+            received = next_events(body)
+            assert [kind for _, kind, _ in received] == ['updated', 'deleted']
+            assert received[0][2]['equations'][0]['solution_type'] == 'complex'
+            assert received[1][2] == {'ids': [1]}
+            body.close()
+            print("✅ updated and deleted events streamed in order")
+
+            # Reconnect with the id of the created event: the two missed events are replayed
+            response = client.get('/api/events', headers={'Last-Event-ID': created_id})
+            body = response.response
+            next(body)
+            assert [kind for _, kind, _ in next_events(body)] == ['updated', 'deleted']
+            body.close()
+            print("✅ Last-Event-ID replays missed events")
+
+            # The ready id has been evicted from the 3-event buffer: the client must refetch
+            for i in range(3):
+                client.post('/api/equation', json={'a': 1, 'b': i, 'c': 0})
+            response = client.get('/api/events', headers={'Last-Event-ID': ready_id})
+            body = response.response
+            next(body)
+            assert [kind for _, kind, _ in next_events(body)] == ['reset']
+            body.close()
+            assert events.stats()['subscribers'] == 0
+            print("✅ Evicted Last-Event-ID gets a reset event")
+
+
+def test_publish_to_events_service():
+    """With EVENTS_PUBLISH_ADDR, API workers send events to the events service over UDP"""
+    service = Flask(__name__)
+    service.config['EVENTS_LISTEN_ADDR'] = '127.0.0.1:0'
+    events.init_app(service)
+    listener = events.start_listener(service)
+    port = listener.getsockname()[1]
+
+    app = create_test_app(EVENTS_PUBLISH_ADDR=f'127.0.0.1:{port}')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equation', json={'a': 1, 'b': -3, 'c': 2})
+            assert client.get('/api/events').status_code == 404
+
+    feed = service.extensions['events']['feed']
+    deadline = time.time() + 2
+    while feed.seq == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    (seq, kind, payload), = feed.read(0)
+    assert kind == 'created' and json.loads(payload)['equations'][0]['id'] == 1
+    assert app.extensions['events']['feed'].seq == 0
+    listener.close()
+    print("✅ Event delivered to the events service over UDP")
+
+
+if __name__ == "__main__":
+    test_change_feed_buffer()
+    test_event_stream()
+    test_publish_to_events_service()
+    print("\n=== EVENTS TEST COMPLETED ===")
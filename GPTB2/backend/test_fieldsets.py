@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script cho sparse fieldsets (?fields=) và Prefer: return=minimal
+"""
+from flask import Flask
+from sqlalchemy import event
+from models import db
+import fieldsets
+import instrumentation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+    fieldsets.init_app(app)
+
+    from app import (create_equation, get_all_equations, get_equation, update_equation,
+                     delete_equation, create_bulk_equations, update_bulk_equations)
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'get_equation', get_equation, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'update_equation', update_equation, methods=['PUT'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'delete_equation', delete_equation, methods=['DELETE'])
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+    app.add_url_rule('/api/equations/bulk', 'update_bulk_equations', update_bulk_equations, methods=['PUT'])
+
+    return app
+
+
+MINIMAL = {'Prefer': 'return=minimal'}
+
+
+def query_count(response):
+    return int(response.headers['X-Query-Count'])
+
+
+def test_sparse_fieldsets():
+    """?fields= builds only the named fields and SELECTs only their columns"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equations/bulk', json={'equations': [{'a': 1, 'b': -5, 'c': 6}, {'a': 1, 'b': 2, 'c': 5}]})
+
+            statements = []
+            capture = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', capture)
+            try:
+                response = client.get('/api/equation?fields=id,solution_type')
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', capture)
+            assert response.status_code == 200
+            assert response.get_json()['data'] == [
+                {'id': 1, 'solution_type': 'two_real'},
+                {'id': 2, 'solution_type': 'complex'}
+            ]
+            select_list = statements[0].split(' FROM ')[0]
+            assert 'solution_type' in select_list and 'discriminant' not in select_list
+            print("✅ GET /api/equation?fields=id,solution_type selects 2 columns")
+
+            response = client.get('/api/equation/1?fields=equation_string')
+            assert response.get_json()['data'] == {'equation_string': '1.0x² + -5.0x + 6.0 = 0'}
+            print("✅ GET /api/equation/1?fields=equation_string")
+
+            response = client.get('/api/equation?fields=id,bogus')
+            assert response.status_code == 400
+            assert 'bogus' in response.get_json()['message']
+            print("✅ Unknown field rejected with 400")
+
+            # Without fields= the full representation is unchanged
+            full = client.get('/api/equation/1').get_json()['data']
+            assert {'equation_string', 'created_at', 'updated_at', 'discriminant'} <= set(full)
+            print("✅ Full representation without fields=")
+
+
+def test_prefer_return_minimal():
+    """Writes with Prefer: return=minimal answer with ids only and skip read-backs"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            response = client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6}, headers=MINIMAL)
+            assert response.status_code == 201
+            assert response.get_json()['data'] == {'id': 1}
+            assert response.headers['Preference-Applied'] == 'return=minimal'
+            print("✅ POST minimal: data = {'id': 1}")
+
+            response = client.post('/api/equations/bulk', headers=MINIMAL,
+                                   json={'equations': [{'a': 1, 'b': i, 'c': -i} for i in range(3)]})
+            assert response.get_json()['created_equations'] == [{'id': 2}, {'id': 3}, {'id': 4}]
+            print("✅ Bulk POST minimal: ids only")
+
+            # PUT: no read of previous values, one UPDATE
+            response = client.put('/api/equation/1', json={'a': 2, 'b': -7, 'c': 3}, headers=MINIMAL)
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['data'] == {'id': 1} and 'previous_values' not in data
+            assert query_count(response) == 1
+            assert client.get('/api/equation/1').get_json()['data']['a'] == 2.0
+            print(f"✅ PUT minimal: {query_count(response)} statement, no previous_values")
+
+            response = client.put('/api/equation/999', json={'a': 1, 'b': 1, 'c': 1}, headers=MINIMAL)
+            assert response.status_code == 404
+            print("✅ PUT minimal on missing id: 404")
+
+            # Bulk PUT: ids-only SELECT + UPDATE, results without data
+            response = client.put('/api/equations/bulk', headers=MINIMAL, json={'equations': [
+                {'id': 2, 'a': 1, 'b': 0, 'c': -4}, {'id': 999, 'a': 1, 'b': 0, 'c': 1}
+            ]})
+            data = response.get_json()
+            assert data['results'] == [{'id': 2, 'status': 'updated'}, {'id': 999, 'status': 'not_found'}]
+            assert client.get('/api/equation/2').get_json()['data']['solution_type'] == 'two_real'
+            print("✅ Bulk PUT minimal: results without data")
+
+            # DELETE: one DELETE, nothing read back
+            response = client.delete('/api/equation/3', headers=MINIMAL)
+            assert response.status_code == 200
+            assert response.get_json()['deleted_equation'] == {'id': 3}
+            assert query_count(response) == 1
+            assert client.delete('/api/equation/3', headers=MINIMAL).status_code == 404
+            print("✅ DELETE minimal: deleted_equation = {'id': 3}")
+
+            # Other preferences are ignored and the full representation returned
+            response = client.put('/api/equation/1', json={'a': 1, 'b': -5, 'c': 6},
+                                  headers={'Prefer': 'return=representation'})
+            assert 'previous_values' in response.get_json()
+            assert 'Preference-Applied' not in response.headers
+            print("✅ Prefer: return=representation keeps the full response")
+
+
+if __name__ == "__main__":
+    test_sparse_fieldsets()
+    test_prefer_return_minimal()
+    print("\n=== FIELDSETS TEST COMPLETED ===")
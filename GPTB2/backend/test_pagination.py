@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script cho keyset pagination (GET /api/equation?limit=&cursor=)
+"""
+from datetime import datetime
+from flask import Flask
+from models import db, Equation
+import delta_sync
+import instrumentation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+    delta_sync.init_app(app)
+
+    from app import get_all_equations
+
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+
+    return app
+
+
+def test_keyset_pages():
+    """Pages walk the list in order without gaps or repeats, one statement each"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Two rows share a created_at: the id breaks the tie
+            for i, day in enumerate([1, 2, 2, 3, 4, 5, 6]):
+                equation = Equation(1, -i, 0)
+                equation.created_at = datetime(2025, 1, day)
+                db.session.add(equation)
+            db.session.commit()
+
+            unpaged = [eq['id'] for eq in client.get('/api/equation').get_json()['data']]
+
+            ids, cursor, pages = [], None, 0
+            while True:
+                url = '/api/equation?limit=3&since=' + (f'&cursor={cursor}' if cursor else '')
+                response = client.get(url)
+                body = response.get_json()
+                assert int(response.headers['X-Query-Count']) == 1
+                assert 'sync_token' in body
+                ids += [eq['id'] for eq in body['data']]
+                pages += 1
+                cursor = body['next_cursor']
+                if cursor is None:
+                    break
+            assert pages == 3 and ids == [7, 6, 5, 4, 3, 2, 1]
+            assert sorted(ids) == sorted(unpaged)
+            print(f"✅ 3 keyset pages cover the list in order: {ids}")
+
+            body = client.get('/api/equation?limit=2&fields=id,a').get_json()
+            assert body['data'] == [{'id': 7, 'a': 1.0}, {'id': 6, 'a': 1.0}]
+            assert body['next_cursor'].endswith('_6')
+            print("✅ Sparse fieldsets still produce a cursor")
+
+            for query in ('limit=0', 'limit=x', 'limit=2&cursor=bogus', 'cursor=2025-01-01T00:00:00_1',
+                          'limit=2&since=2025-01-01T00:00:00'):
+                assert client.get(f'/api/equation?{query}').status_code == 400, query
+            print("✅ Malformed limit/cursor and paged deltas rejected with 400")
+
+
+if __name__ == "__main__":
+    test_keyset_pages()
+    print("\n=== PAGINATION TEST COMPLETED ===")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script khóa số lượng SQL statements của các write paths
+(no post-commit refetch, single-statement INSERT/UPDATE/DELETE)
+"""
+from flask import Flask
+from models import db
+import instrumentation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+
+    from app import (create_equation, get_all_equations, get_equation,
+                     update_equation, delete_equation, create_bulk_equations)
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'get_equation', get_equation, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'update_equation', update_equation, methods=['PUT'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'delete_equation', delete_equation, methods=['DELETE'])
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+
+    return app
+
+
+def query_count(response):
+    return int(response.headers['X-Query-Count'])
+
+
+def test_write_path_query_counts():
+    """Write paths finish in the minimum number of statements"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            # POST: one INSERT, response built from memory
+            response = client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6})
+            assert response.status_code == 201
+            created = response.get_json()['data']
+            assert created['id'] == 1 and created['created_at'] and created['updated_at']
+            assert query_count(response) == 1
+            print(f"✅ POST /api/equation: {query_count(response)} statement")
+
+            # Bulk POST: one INSERT for all 50 rows, no per-row refetch
+            bulk = {'equations': [{'a': 1, 'b': i, 'c': -i} for i in range(50)]}
+            response = client.post('/api/equations/bulk', json=bulk)
+            assert response.status_code == 201
+            data = response.get_json()
+            assert [eq['id'] for eq in data['created_equations']] == list(range(2, 52))
+            assert all(eq['created_at'] for eq in data['created_equations'])
+            assert query_count(response) == 1
+            print(f"✅ POST /api/equations/bulk (50 rows): {query_count(response)} statement")
+
+            # PUT: read previous values + one UPDATE by primary key, no refetch
+            response = client.put('/api/equation/1', json={'a': 2, 'b': -7, 'c': 3})
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['data']['a'] == 2.0 and data['data']['updated_at']
+            assert data['previous_values']['equation_string'] == '1.0x² + -5.0x + 6.0 = 0'
+            assert query_count(response) == 2
+            print(f"✅ PUT /api/equation/1: {query_count(response)} statements")
+
+            # DELETE: one DELETE ... RETURNING by primary key
+            response = client.delete('/api/equation/2')
+            assert response.status_code == 200
+            assert response.get_json()['deleted_equation']['id'] == 2
+            assert query_count(response) == 1
+            print(f"✅ DELETE /api/equation/2: {query_count(response)} statement")
+
+            response = client.delete('/api/equation/2')
+            assert response.status_code == 404
+            assert query_count(response) == 1
+
+            response = client.get('/api/equation/2')
+            assert response.status_code == 404
+
+            # GET list: one SELECT regardless of row count
+            response = client.get('/api/equation')
+            assert response.get_json()['count'] == 50
+            assert query_count(response) == 1
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_write_path_query_counts()
+    print("\n=== QUERY COUNT TEST COMPLETED ===")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script cho SQL query instrumentation (query count, slow-query log, N+1 detection)
+"""
+import logging
+from flask import Flask
+from models import db, Equation
+import instrumentation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+
+    # Initialize database and instrumentation
+    db.init_app(app)
+    instrumentation.init_app(app)
+
+    from app import create_equation, get_all_equations, get_equation, create_bulk_equations
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'get_equation', get_equation, methods=['GET'])
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+
+    @app.route('/n-plus-one')
+    def n_plus_one():
+        # One SELECT per id: the pattern the N+1 detector should flag
+        for equation_id in range(1, 7):
+            db.session.get(Equation, equation_id)
+        return {'status': 'success'}
+
+    return app
+
+
+def test_normalize_statement():
+    """Statements differing only by values share one shape"""
+    first = instrumentation.normalize_statement("SELECT * FROM equations WHERE id = 1")
+    second = instrumentation.normalize_statement("SELECT *  FROM equations\nWHERE id = 42")
+    assert first == second == "SELECT * FROM equations WHERE id = ?"
+
+    in_list = instrumentation.normalize_statement("DELETE FROM equations WHERE id IN (?, ?, ?)")
+    assert in_list == "DELETE FROM equations WHERE id IN (...)"
+
+    pyformat = instrumentation.normalize_statement("SELECT a FROM equations WHERE id = %(pk_1)s")
+    assert pyformat == "SELECT a FROM equations WHERE id = ?"
+    print("✅ normalize_statement collapses literals and placeholders")
+
+
+def test_query_count_headers():
+    """Every instrumented request reports its statement count and DB time"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            response = client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6})
+            assert response.status_code == 201
+            assert int(response.headers['X-Query-Count']) >= 1
+            assert float(response.headers['X-DB-Time-Ms']) >= 0
+            print(f"✅ POST /api/equation: {response.headers['X-Query-Count']} queries")
+
+            response = client.get('/api/equation')
+            assert response.status_code == 200
+            assert response.headers['X-Query-Count'] == '1'
+            print(f"✅ GET /api/equation: {response.headers['X-Query-Count']} query")
+
+            db.drop_all()
+
+
+def test_slow_query_and_n_plus_one_logging(caplog):
+    """Slow statements and repeated same-shape statements are logged with their endpoint"""
+    app = create_test_app()
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = 0
+    app.config['N_PLUS_ONE_THRESHOLD'] = 5
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            with caplog.at_level(logging.WARNING, logger='gptb2.sql'):
+                response = client.get('/n-plus-one')
+            assert response.status_code == 200
+            assert response.headers['X-Query-Count'] == '6'
+
+            messages = [record.getMessage() for record in caplog.records]
+            assert any(m.startswith('Slow query') and '[n_plus_one]' in m for m in messages)
+            assert any(m.startswith('Possible N+1: 6 same-shape statements') for m in messages)
+            print("✅ Slow query and N+1 warnings logged")
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_normalize_statement()
+    test_query_count_headers()
+    print("\n=== QUERY INSTRUMENTATION TEST COMPLETED ===")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script cho GET /api/equations/search (tìm kiếm theo giá trị nghiệm)
+"""
+from flask import Flask
+from models import db, Equation
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+
+    db.init_app(app)
+
+    from app import create_bulk_equations, search_equations_by_roots
+
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+    app.add_url_rule('/api/equations/search', 'search_equations_by_roots', search_equations_by_roots, methods=['GET'])
+
+    return app
+
+
+def test_numeric_roots():
+    """solve_equation stores sorted real roots and |imaginary part|"""
+    eq = Equation(-1, 5, -6)  # roots 2 and 3 with a < 0
+    assert (eq.root1_real, eq.root2_real, eq.root_imag) == (2.0, 3.0, 0.0)
+    eq = Equation(1, 2, 26)  # -1 ± 5i
+    assert (eq.root1_real, eq.root2_real, eq.root_imag) == (-1.0, -1.0, 5.0)
+    eq = Equation(0, 2, -4)
+    assert (eq.root1_real, eq.root2_real, eq.root_imag) == (2.0, 2.0, 0.0)
+    eq = Equation(0, 0, 5)
+    assert (eq.root1_real, eq.root2_real, eq.root_imag) == (None, None, None)
+    print("✅ Numeric roots stored")
+
+
+def test_root_range_search():
+    """Searches by real root range and by imaginary part"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equations/bulk', json={'equations': [
+                {'a': 1, 'b': -5, 'c': 6},    # 1: roots 2, 3
+                {'a': 1, 'b': -1, 'c': -6},   # 2: roots -2, 3
+                {'a': 1, 'b': -9, 'c': 20},   # 3: roots 4, 5
+                {'a': 1, 'b': 2, 'c': 37},    # 4: -1 ± 6i
+                {'a': 1, 'b': 2, 'c': 2},     # 5: -1 ± 1i
+                {'a': 0, 'b': 4, 'c': -10},   # 6: linear, 2.5
+                {'a': 0, 'b': 0, 'c': 1},     # 7: no solution
+            ]})
+
+            response = client.get('/api/equations/search?kind=real&root_min=2&root_max=3')
+            data = response.get_json()
+            assert [eq['id'] for eq in data['data']] == [1, 2, 6]
+            assert data['data'][0]['roots'] == {'root1_real': 2.0, 'root2_real': 3.0, 'root_imag': 0.0}
+            print(f"✅ Real root in [2, 3]: {data['count']} equations")
+
+            response = client.get('/api/equations/search?imag_min=5')
+            assert [eq['id'] for eq in response.get_json()['data']] == [4]
+            print("✅ Imaginary part >= 5")
+
+            response = client.get('/api/equations/search?kind=complex&root_max=0&limit=1')
+            data = response.get_json()
+            assert [eq['id'] for eq in data['data']] == [4] and data['limit'] == 1
+
+            response = client.get('/api/equations/search?kind=real')
+            assert [eq['id'] for eq in response.get_json()['data']] == [1, 2, 3, 6]
+
+            assert client.get('/api/equations/search').status_code == 400
+            assert client.get('/api/equations/search?root_min=abc').status_code == 400
+            assert client.get('/api/equations/search?kind=imaginary').status_code == 400
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_numeric_roots()
+    test_root_range_search()
+    print("\n=== ROOT SEARCH TEST COMPLETED ===")
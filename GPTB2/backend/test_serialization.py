@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script cho MessagePack/CBOR content negotiation
+"""
+import json
+import cbor2
+import msgpack
+from flask import Flask
+from models import db
+import server_timing
+import serialization
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+
+    db.init_app(app)
+    server_timing.init_app(app)
+    serialization.init_app(app)
+
+    from app import ping, create_equation, get_all_equations, get_equation, create_bulk_equations
+
+    app.add_url_rule('/ping', 'ping', ping, methods=['GET'])
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'get_equation', get_equation, methods=['GET'])
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+
+    return app
+
+
+def test_msgpack_and_cbor_round_trip():
+    """Binary request bodies are accepted and binary responses match the JSON fields exactly"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            response = client.post('/api/equation', data=msgpack.packb({'a': 1, 'b': -5, 'c': 6}),
+                                   content_type='application/msgpack', headers={'Accept': 'application/msgpack'})
+            assert response.status_code == 201
+            assert response.mimetype == 'application/msgpack'
+            created = msgpack.unpackb(response.data)
+            assert created['data']['solution'] == 'x₁ = 3.000000, x₂ = 2.000000'
+
+            response = client.post('/api/equations/bulk', data=cbor2.dumps({'equations': [{'a': 1, 'b': 0.1, 'c': -2}]}),
+                                   content_type='application/cbor')
+            assert response.status_code == 201
+            assert response.mimetype == 'application/json'
+
+            as_json = client.get('/api/equation').get_json()
+            as_msgpack = msgpack.unpackb(client.get('/api/equation', headers={'Accept': 'application/msgpack'}).data)
+            as_cbor = cbor2.loads(client.get('/api/equation', headers={'Accept': 'application/cbor'}).data)
+            assert as_json == as_msgpack == as_cbor
+            assert as_msgpack['data'][0]['b'] == 0.1
+            print(f"✅ JSON, msgpack and CBOR list responses are identical ({as_json['count']} equations)")
+
+            db.drop_all()
+
+
+def test_negotiation_defaults():
+    """JSON wins ties and absent preferences; non-API routes are never negotiated"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equation', json={'a': 1, 'b': 2, 'c': 1})
+
+            for accept in (None, '*/*', 'application/json, application/msgpack', 'text/html'):
+                response = client.get('/api/equation/1', headers={'Accept': accept} if accept else {})
+                assert response.mimetype == 'application/json', accept
+                assert 'Accept' in response.headers['Vary']
+
+            response = client.get('/api/equation/1', headers={'Accept': 'application/msgpack;q=1, application/json;q=0.5'})
+            assert response.mimetype == 'application/msgpack'
+            response = client.get('/api/equation/1', headers={'Accept': 'application/x-msgpack'})
+            assert response.mimetype == 'application/msgpack'
+
+            response = client.get('/ping', headers={'Accept': 'application/msgpack'})
+            assert json.loads(response.data)['message'] == 'pong'
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_msgpack_and_cbor_round_trip()
+    test_negotiation_defaults()
+    print("\n=== SERIALIZATION TEST COMPLETED ===")
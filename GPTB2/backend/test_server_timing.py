@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script cho Server-Timing response headers
+"""
+from flask import Flask
+from models import db
+import instrumentation
+import server_timing
+
+
+def create_test_app(sample_rate, sql_instrumentation=True):
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SERVER_TIMING_SAMPLE_RATE'] = sample_rate
+    app.config['SQL_INSTRUMENTATION_ENABLED'] = sql_instrumentation
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+    server_timing.init_app(app)
+
+    from app import ping, create_equation, get_all_equations
+
+    app.add_url_rule('/ping', 'ping', ping, methods=['GET'])
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation', 'get_all_equations', get_all_equations, methods=['GET'])
+
+    return app
+
+
+def parse_header(value):
+    """Parse 'name;dur=1.0;desc="x", ...' into {name: duration_ms}"""
+    metrics = {}
+    for entry in value.split(', '):
+        name, *params = entry.split(';')
+        durations = [float(p[4:]) for p in params if p.startswith('dur=')]
+        metrics[name] = durations[0]
+    return metrics
+
+
+def test_server_timing_phases():
+    """A sampled write reports every phase it went through"""
+    app = create_test_app(sample_rate=1.0)
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            response = client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6})
+            assert response.status_code == 201
+
+            metrics = parse_header(response.headers['Server-Timing'])
+            print(f"✅ Server-Timing: {response.headers['Server-Timing']}")
+            assert list(metrics) == ['parse', 'validate', 'solve', 'db', 'serialize', 'total']
+            assert metrics['total'] >= max(v for k, v in metrics.items() if k != 'total')
+            assert response.headers['Timing-Allow-Origin'] == '*'
+
+            # Reads skip phases that never ran
+            response = client.get('/api/equation')
+            metrics = parse_header(response.headers['Server-Timing'])
+            assert list(metrics) == ['db', 'serialize', 'total']
+
+            # Non-API routes are never timed
+            response = client.get('/ping')
+            assert 'Server-Timing' not in response.headers
+
+            db.drop_all()
+
+
+def test_server_timing_db_without_sql_instrumentation():
+    """The db phase does not depend on SQL_INSTRUMENTATION_ENABLED"""
+    app = create_test_app(sample_rate=1.0, sql_instrumentation=False)
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            response = client.post('/api/equation', json={'a': 1, 'b': -3, 'c': 2})
+            assert response.status_code == 201
+            header = response.headers['Server-Timing']
+            assert 'db' in parse_header(header) and 'queries"' in header
+            assert 'X-Query-Count' not in response.headers
+            print(f"✅ db phase without SQL instrumentation: {header}")
+
+            db.drop_all()
+
+
+def test_server_timing_disabled():
+    """Sample rate 0 turns the header off"""
+    app = create_test_app(sample_rate=0.0)
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            response = client.post('/api/equation', json={'a': 1, 'b': 0, 'c': 1})
+            assert response.status_code == 201
+            assert 'Server-Timing' not in response.headers
+            print("✅ Server-Timing disabled by config")
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_server_timing_phases()
+    test_server_timing_db_without_sql_instrumentation()
+    test_server_timing_disabled()
+    print("\n=== SERVER-TIMING TEST COMPLETED ===")
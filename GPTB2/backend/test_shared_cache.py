@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script cho host-wide shared-memory cache của GET /api/equation/<id>
+"""
+import os
+from flask import Flask
+from models import db
+import instrumentation
+import shared_cache
+
+
+def create_test_app(cache_path):
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+    app.config['SHARED_CACHE_PATH'] = cache_path
+    app.config['SHARED_CACHE_SIZE_MB'] = 1
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+    shared_cache.init_app(app)
+
+    from app import (create_equation, get_equation, update_equation, delete_equation,
+                     delete_bulk_equations, get_cache_stats, get_equations_by_ids)
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'get_equation', get_equation, methods=['GET'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'update_equation', update_equation, methods=['PUT'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'delete_equation', delete_equation, methods=['DELETE'])
+    app.add_url_rule('/api/equations/bulk', 'delete_bulk_equations', delete_bulk_equations, methods=['DELETE'])
+    app.add_url_rule('/api/cache/stats', 'get_cache_stats', get_cache_stats, methods=['GET'])
+    app.add_url_rule('/api/equations', 'get_equations_by_ids', get_equations_by_ids, methods=['GET'])
+
+    return app
+
+
+def test_cache_put_get_invalidate(tmp_path):
+    """Stores, generation checks, invalidation and eviction of the mmap table"""
+    cache = shared_cache.SharedCache(str(tmp_path / 'cache'), 64 * 1024, slot_bytes=256, ways=4)
+    try:
+        generation = cache.generation(7)
+        assert cache.put(7, b'{"id":7}', ttl=60, generation=generation)
+        assert cache.get(7) == b'{"id":7}'
+        assert cache.get(8) is None
+
+        # A PUT/DELETE between the DB read and the store makes the store a no-op
+        generation = cache.generation(9)
+        cache.invalidate([9])
+        assert not cache.put(9, b'stale', ttl=60, generation=generation)
+        assert cache.get(9) is None
+
+        cache.invalidate([7])
+        assert cache.get(7) is None
+
+        assert not cache.put(1, b'x' * 300, ttl=60, generation=cache.generation(1))
+        assert cache.put(2, b'expired', ttl=-1, generation=cache.generation(2))
+        assert cache.get(2) is None
+
+        # Keys of one set beyond its ways evict the oldest store
+        keys = [3 + i * cache.sets for i in range(cache.ways + 1)]
+        for ttl, key in enumerate(keys, start=10):
+            assert cache.put(key, str(key).encode(), ttl=ttl, generation=cache.generation(key))
+        assert cache.get(keys[0]) is None and cache.get(keys[-1]) == str(keys[-1]).encode()
+        assert cache.stats['evictions'] == 1
+        assert cache.stats['hits'] == 2
+        print(f"✅ Shared cache stats: {cache.stats}")
+    finally:
+        cache.close()
+
+
+def test_cache_shared_between_processes(tmp_path):
+    """An entry stored by one process is a hit in another, and its invalidation is seen too"""
+    path = str(tmp_path / 'cache')
+    cache = shared_cache.SharedCache(path, 64 * 1024, slot_bytes=256)
+    try:
+        pid = os.fork()
+        if pid == 0:
+            child = shared_cache.SharedCache(path, 64 * 1024, slot_bytes=256)
+            child.put(5, b'from child', ttl=60, generation=child.generation(5))
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert cache.get(5) == b'from child'
+
+        pid = os.fork()
+        if pid == 0:
+            shared_cache.SharedCache(path, 64 * 1024, slot_bytes=256).invalidate([5])
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert cache.get(5) is None
+        print("✅ Entries and invalidations shared across processes")
+    finally:
+        cache.close()
+
+
+def test_cache_geometry_never_resizes_a_live_file(tmp_path):
+    """Another size maps another file; a file with a foreign layout is left alone"""
+    path = str(tmp_path / 'cache')
+    small = shared_cache.SharedCache(path, 64 * 1024, slot_bytes=256)
+    try:
+        assert small.put(5, b'kept', ttl=60, generation=small.generation(5))
+        large = shared_cache.SharedCache(path, 128 * 1024, slot_bytes=256)
+        assert large.path != small.path and large.get(5) is None
+        large.close()
+        assert small.get(5) == b'kept' and os.path.getsize(small.path) == small.size
+
+        with open(small.path, 'r+b') as f:
+            f.write(b'OTHERVER')
+        try:
+            shared_cache.SharedCache(path, 64 * 1024, slot_bytes=256)
+            assert False, 'foreign layout accepted'
+        except ValueError:
+            pass
+        assert os.path.getsize(small.path) == small.size
+        print("✅ Geometry in the file name; foreign files are not truncated")
+    finally:
+        small.close()
+
+
+def test_get_equation_uses_shared_cache(tmp_path):
+    """GET by id is served from the cache until PUT/DELETE invalidates it"""
+    app = create_test_app(str(tmp_path / 'cache'))
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6})
+            client.post('/api/equation', json={'a': 1, 'b': 0, 'c': -4})
+
+            response = client.get('/api/equation/1')
+            assert response.headers['X-Cache'] == 'MISS'
+            response = client.get('/api/equation/1')
+            assert response.headers['X-Cache'] == 'HIT'
+            assert response.headers['X-Query-Count'] == '0'
+            assert response.get_json()['data']['equation_string'] == '1.0x² + -5.0x + 6.0 = 0'
+
+            client.put('/api/equation/1', json={'a': 2, 'b': -7, 'c': 3})
+            response = client.get('/api/equation/1')
+            assert response.headers['X-Cache'] == 'MISS'
+            assert response.get_json()['data']['a'] == 2.0
+
+            client.delete('/api/equation/1')
+            assert client.get('/api/equation/1').status_code == 404
+
+            client.get('/api/equation/2')
+            client.delete('/api/equations/bulk', json={'ids': [2]})
+            assert client.get('/api/equation/2').status_code == 404
+
+            stats = client.get('/api/cache/stats').get_json()['stats']
+            assert stats['enabled'] and stats['pid'] == os.getpid()
+            assert stats['hits'] == 1 and stats['misses'] == 5
+            assert stats['shared']['used'] == 0
+            print(f"✅ Cache stats: hits={stats['hits']} misses={stats['misses']} hit_rate={stats['hit_rate']}")
+
+            db.drop_all()
+
+
+def test_multi_get_uses_shared_cache(tmp_path):
+    """GET /api/equations?ids= serves cached ids and reads the rest with one SELECT"""
+    app = create_test_app(str(tmp_path / 'cache'))
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            for b in (-5, 0, 2):
+                client.post('/api/equation', json={'a': 1, 'b': b, 'c': 1})
+            client.get('/api/equation/2')
+
+            response = client.get('/api/equations?ids=3,2,9,1,3')
+            body = response.get_json()
+            assert [eq['id'] for eq in body['data']] == [3, 2, 1]
+            assert body['not_found'] == [9]
+            assert response.headers['X-Query-Count'] == '1'
+            print("✅ Multi-get: 1 cached + 2 from one SELECT, in request order")
+
+            response = client.get('/api/equations?ids=1,3')
+            assert response.headers['X-Query-Count'] == '0'
+            assert client.get('/api/equations?ids=1&fields=id,a').get_json()['data'] == [{'id': 1, 'a': 1.0}]
+            print("✅ Multi-get misses are stored in the cache")
+
+            for query in ('', 'ids=', 'ids=1,x', 'ids=' + ','.join(str(i) for i in range(101)), 'ids=1&fields=nope'):
+                assert client.get(f'/api/equations?{query}').status_code == 400, query
+            print("✅ Invalid ids rejected with 400")
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_cache_put_get_invalidate, test_cache_shared_between_processes,
+                 test_cache_geometry_never_resizes_a_live_file,
+                 test_get_equation_uses_shared_cache, test_multi_get_uses_shared_cache):
+        with tempfile.TemporaryDirectory() as directory:
+            test(pathlib.Path(directory))
+    print("\n=== SHARED CACHE TEST COMPLETED ===")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test script cho similar-equations k-d tree index và GET /api/equations/similar
+"""
+import math
+import random
+import threading
+from datetime import datetime
+from flask import Flask
+from models import db
+import similarity
+
+
+def create_test_app():
+    """Create Flask app for testing"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+
+    db.init_app(app)
+    similarity.init_app(app)
+
+    from app import (create_equation, update_equation, delete_equation,
+                     create_bulk_equations, find_similar_equations)
+
+    app.add_url_rule('/api/equation', 'create_equation', create_equation, methods=['POST'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'update_equation', update_equation, methods=['PUT'])
+    app.add_url_rule('/api/equation/<int:equation_id>', 'delete_equation', delete_equation, methods=['DELETE'])
+    app.add_url_rule('/api/equations/bulk', 'create_bulk_equations', create_bulk_equations, methods=['POST'])
+    app.add_url_rule('/api/equations/similar', 'find_similar_equations', find_similar_equations, methods=['GET'])
+
+    return app
+
+
+def brute_force(points, query, k):
+    return sorted((math.dist(point, query), item_id) for item_id, point in points.items())[:k]
+
+
+def test_kd_tree_matches_brute_force():
+    """Nearest neighbours agree with a linear scan through inserts, moves and deletes"""
+    rng = random.Random(42)
+    points = {i: tuple(rng.uniform(-10, 10) for _ in range(3)) for i in range(1, 501)}
+    tree = similarity.KDTree(points.items())
+
+    for i in range(501, 701):
+        points[i] = tuple(rng.uniform(-10, 10) for _ in range(3))
+        tree.insert(i, points[i])
+    for i in rng.sample(sorted(points), 300):
+        del points[i]
+        tree.remove(i)
+    for i in rng.sample(sorted(points), 50):
+        points[i] = tuple(rng.uniform(-10, 10) for _ in range(3))
+        tree.insert(i, points[i])
+
+    assert len(tree) == len(points)
+    for _ in range(50):
+        query = tuple(rng.uniform(-12, 12) for _ in range(3))
+        found, expected = tree.nearest(query, 7), brute_force(points, query, 7)
+        assert [item_id for _, item_id in found] == [item_id for _, item_id in expected]
+        assert all(math.isclose(d1, d2) for (d1, _), (d2, _) in zip(found, expected))
+    print(f"✅ k-d tree matches brute force over {len(points)} points")
+
+
+def test_scale_free():
+    """Proportional coefficients map to the same normalized point"""
+    assert similarity.scale_free(2, -10, 12) == similarity.scale_free(1, -5, 6)
+    assert similarity.scale_free(-1, 5, -6) == similarity.scale_free(1, -5, 6)
+    assert similarity.scale_free(0, 0, 0) == (0.0, 0.0, 0.0)
+
+
+def test_similar_endpoint():
+    """Endpoint answers from the index and follows creates, updates and deletes"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equations/bulk', json={'equations': [
+                {'a': 1, 'b': -5, 'c': 6},    # 1
+                {'a': 1, 'b': -5, 'c': 7},    # 2
+                {'a': 2, 'b': -10, 'c': 12},  # 3: 2x the first one
+                {'a': 9, 'b': 9, 'c': 9},     # 4
+            ]})
+
+            response = client.get('/api/equations/similar?a=1&b=-5&c=6&k=2')
+            assert response.status_code == 200
+            data = response.get_json()
+            assert [eq['id'] for eq in data['data']] == [1, 2]
+            assert data['data'][0]['distance'] == 0.0 and data['data'][1]['distance'] == 1.0
+            print(f"✅ Raw neighbours: {[eq['id'] for eq in data['data']]}")
+
+            response = client.get('/api/equations/similar?a=1&b=-5&c=6&k=2&normalize=true')
+            assert [eq['id'] for eq in response.get_json()['data']] == [1, 3]
+
+            # Incremental updates from this worker's writes
+            client.post('/api/equation', json={'a': 1, 'b': -5, 'c': 6.5})
+            client.delete('/api/equation/2')
+            client.put('/api/equation/4', json={'a': 1, 'b': -5, 'c': 5.9})
+            response = client.get('/api/equations/similar?a=1&b=-5&c=6&k=3')
+            assert [eq['id'] for eq in response.get_json()['data']] == [1, 4, 5]
+            assert len(similarity.get_index()) == 4
+
+            response = client.get('/api/equations/similar?a=1&b=-5')
+            assert response.status_code == 400
+            response = client.get('/api/equations/similar?a=1&b=-5&c=x')
+            assert response.status_code == 400
+
+            db.drop_all()
+
+
+def test_index_heals_from_other_writers():
+    """Rows written outside this worker's index are picked up or dropped on the next query"""
+    app = create_test_app()
+    app.config['SIMILARITY_INDEX_REFRESH_SECONDS'] = 0
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equations/bulk', json={'equations': [
+                {'a': 1, 'b': 0, 'c': 0}, {'a': 2, 'b': 0, 'c': 0}, {'a': 3, 'b': 0, 'c': 0},
+            ]})
+            client.get('/api/equations/similar?a=1&b=0&c=0')
+
+            # Another worker deletes 1 and inserts 4
+            db.session.execute(db.text("DELETE FROM equations WHERE id = 1"))
+            db.session.execute(db.text(
+                "INSERT INTO equations (id, a, b, c, created_at) VALUES (4, 1.1, 0, 0, CURRENT_TIMESTAMP)"
+            ))
+            db.session.commit()
+
+            response = client.get('/api/equations/similar?a=1&b=0&c=0&k=2')
+            assert [eq['id'] for eq in response.get_json()['data']] == [4, 2]
+            assert 1 not in similarity.get_index().raw
+            print("✅ Index healed after external writes")
+
+            # Another replica commits 5, then this worker creates 6: 5 must not be skipped
+            db.session.execute(db.text(
+                "INSERT INTO equations (id, a, b, c, created_at) VALUES (5, 1.05, 0, 0, CURRENT_TIMESTAMP)"
+            ))
+            db.session.commit()
+            client.post('/api/equation', json={'a': 9, 'b': 0, 'c': 0})
+            response = client.get('/api/equations/similar?a=1&b=0&c=0&k=2')
+            assert [eq['id'] for eq in response.get_json()['data']] == [5, 4]
+            print("✅ Lower id from another replica pulled after a local create")
+
+            # Another replica moves 2: picked up by updated_at, not by id
+            db.session.execute(db.text(
+                "UPDATE equations SET a = 1.01, updated_at = :now WHERE id = 2"
+            ), {'now': datetime.utcnow()})
+            db.session.commit()
+            response = client.get('/api/equations/similar?a=1&b=0&c=0&k=1')
+            assert similarity.get_index().raw.point(2) == (1.01, 0.0, 0.0)
+            assert [eq['id'] for eq in response.get_json()['data']] == [2]
+            print("✅ Update from another replica pulled by updated_at")
+
+            db.drop_all()
+
+
+def test_rebuild_runs_once_in_background():
+    """An expired index is rebuilt by one background thread while requests use the old trees"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            client.post('/api/equations/bulk', json={'equations': [{'a': 1, 'b': 0, 'c': 0}, {'a': 2, 'b': 0, 'c': 0}]})
+            index = similarity.ensure_fresh()
+            old_tree = index.raw
+
+            # Periodic rebuilds are off by default
+            assert app.config['SIMILARITY_INDEX_REBUILD_SECONDS'] == 0
+            assert similarity.ensure_fresh() is index and index.raw is old_tree
+            assert not [t for t in threading.enumerate() if t.name == 'similarity-rebuild']
+            app.config['SIMILARITY_INDEX_REBUILD_SECONDS'] = 1e-9
+
+            # A rebuild is already running: requests neither wait nor start another one
+            index.build_lock.acquire()
+            assert similarity.ensure_fresh() is index and index.raw is old_tree
+            assert not [t for t in threading.enumerate() if t.name == 'similarity-rebuild']
+            index.build_lock.release()
+
+            similarity.ensure_fresh()
+            for thread in threading.enumerate():
+                if thread.name == 'similarity-rebuild':
+                    thread.join()
+            assert index.raw is not old_tree and len(index) == 2
+            assert not index.build_lock.locked()
+            print("✅ Expired index rebuilt once, in the background")
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_kd_tree_matches_brute_force()
+    test_scale_free()
+    test_similar_endpoint()
+    test_index_heals_from_other_writers()
+    test_rebuild_runs_once_in_background()
+    print("\n=== SIMILARITY TEST COMPLETED ===")
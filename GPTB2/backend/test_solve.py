@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script cho pure solve endpoint (GET /api/solve)
+"""
+from flask import Flask
+from models import db
+import coalesce
+import instrumentation
+import serialization
+import solve
+
+
+def create_test_app():
+    """Create Flask app for testing (no tables: the endpoint must not need them)"""
+    app = Flask(__name__)
+
+    # Configure for SQLite testing
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TESTING'] = True
+    app.config['SQL_INSTRUMENTATION_HEADERS'] = True
+
+    db.init_app(app)
+    instrumentation.init_app(app)
+    serialization.init_app(app)
+    coalesce.init_app(app)
+
+    from app import get_solution
+
+    app.add_url_rule('/api/solve', 'get_solution', get_solution, methods=['GET'])
+
+    return app
+
+
+def test_canonical_numbers():
+    """One text per number, so one URL per equation"""
+    assert [solve.canonical_number(v) for v in ('1', '1.0', '1e0', '-0', '0.0', '0.5', '-2.50')] == \
+        ['1', '1', '1', '0', '0', '0.5', '-2.5']
+    assert solve.canonical_number('1e16') == '1e+16'
+    for value in ('nan', 'inf', '-Infinity', 'x'):
+        try:
+            solve.canonical_number(value)
+            assert False, value
+        except ValueError:
+            pass
+    coefficients, query = solve.canonical_query({'c': '6', 'b': '-5.0', 'a': '1', 'extra': 'x'})
+    assert coefficients == (1.0, -5.0, 6.0) and query == 'a=1&b=-5&c=6'
+    assert solve.canonical_query({'a': '1e16', 'b': '0', 'c': '0'})[1] == 'a=1e%2B16&b=0&c=0'
+    print("✅ Canonical numbers and query")
+
+
+def test_solve_endpoint():
+    """Immutable, ETag-validated answers without a database round-trip"""
+    app = create_test_app()
+
+    with app.test_client() as client:
+        with app.app_context():
+            response = client.get('/api/solve?a=1&b=-5&c=6')
+            body = response.get_json()
+            assert response.status_code == 200
+            assert body['data']['solution_type'] == 'two_real' and 'id' not in body['data']
+            assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+            assert response.headers['X-Query-Count'] == '0'
+            etag = response.headers['ETag']
+            assert etag.startswith('"') and not etag.startswith('W/')
+            print(f"✅ Solved without queries: {body['data']['solution']} ETag {etag}")
+
+            response = client.get('/api/solve?a=1&b=-5&c=6', headers={'If-None-Match': etag})
+            assert response.status_code == 304 and response.headers['ETag'] == etag
+            assert response.get_data() == b''
+            print("✅ If-None-Match answered with 304")
+
+            response = client.get('/api/solve?c=6.0&b=-5&a=1.0')
+            assert response.status_code == 301
+            assert response.headers['Location'].endswith('/api/solve?a=1&b=-5&c=6')
+            assert 'immutable' in response.headers['Cache-Control']
+            print("✅ Non-canonical query redirected to the canonical URL")
+
+            # Another representation is another entity
+            msgpack_response = client.get('/api/solve?a=1&b=-5&c=6', headers={'Accept': 'application/msgpack'})
+            if msgpack_response.mimetype == 'application/msgpack':
+                assert msgpack_response.headers['ETag'] != etag
+            assert 'Accept' in response.headers['Vary']
+
+            for query in ('a=1&b=2', 'a=1&b=2&c=nan', 'a=x&b=1&c=1'):
+                assert client.get(f'/api/solve?{query}').status_code == 400, query
+            print("✅ Missing and non-finite coefficients rejected with 400")
+
+
+if __name__ == "__main__":
+    test_canonical_numbers()
+    test_solve_endpoint()
+    print("\n=== SOLVE ENDPOINT TEST COMPLETED ===")
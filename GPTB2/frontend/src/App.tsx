@@ -1,9 +1,28 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, Suspense } from 'react';
 import EquationForm from './components/EquationForm';
-import EquationResult from './components/EquationResult';
-import EquationList from './components/EquationList';
 import { EquationData } from './types';
 import { equationApi } from './services/api';
+import { lazyWithPreload, whenIdle } from './utils/lazyLoad';
+
+// Only the form is in the initial bundle. The result and list views (with their CSS) are
+// separate chunks: fetched when the browser is idle after first paint, when the user reaches
+// for the form (hover/focus), or at the latest when first rendered.
+const EquationResult = lazyWithPreload(() => import('./components/EquationResult'));
+const EquationList = lazyWithPreload(() => import('./components/EquationList'));
+
+const preloadResultView = () => {
+  EquationResult.preload();
+};
+
+// Placeholder while a view's chunk is loading
+const ViewFallback: React.FC<{ label: string }> = ({ label }) => (
+  <div className="card">
+    <div style={{ textAlign: 'center', padding: '20px', color: '#666' }}>
+      <span className="loading"></span>
+      <span style={{ marginLeft: '10px' }}>{label}</span>
+    </div>
+  </div>
+);
 
 const App: React.FC = () => {
   const [apiStatus, setApiStatus] = useState<'checking' | 'connected' | 'error'>('checking');
@@ -11,6 +30,8 @@ const App: React.FC = () => {
   const [currentEquation, setCurrentEquation] = useState<EquationData | null>(null);
   const [showSteps, setShowSteps] = useState<boolean>(false);
   const [refreshListTrigger, setRefreshListTrigger] = useState(0);
+  // The list (and its data fetch) starts once the form is up and the main thread is idle
+  const [showList, setShowList] = useState(false);
   const [notification, setNotification] = useState<{
     type: 'success' | 'error' | 'info';
     message: string;
@@ -37,6 +58,15 @@ const App: React.FC = () => {
     checkApiConnection();
   }, []);
 
+  // After first paint: fetch the deferred views' chunks and mount the list
+  useEffect(() => {
+    return whenIdle(() => {
+      EquationList.preload();
+      EquationResult.preload();
+      setShowList(true);
+    });
+  }, []);
+
   const checkApiConnection = async () => {
     try {
       await equationApi.ping();
@@ -240,19 +270,23 @@ const App: React.FC = () => {
         </div>
       )}
 
-      {/* Main Form */}
-      <EquationForm 
-        onEquationCreated={handleEquationCreated}
-        onError={handleError}
-      />
+      {/* Main Form - reaching for it preloads the result view */}
+      <div onMouseEnter={preloadResultView} onFocusCapture={preloadResultView}>
+        <EquationForm 
+          onEquationCreated={handleEquationCreated}
+          onError={handleError}
+        />
+      </div>
 
       {/* Current Equation Result - Enhanced Display */}
       {currentEquation && (
-        <EquationResult
-          equation={currentEquation}
-          showSteps={showSteps}
-          onShowSteps={handleToggleSteps}
-        />
+        <Suspense fallback={<ViewFallback label="Đang tải kết quả..." />}>
+          <EquationResult
+            equation={currentEquation}
+            showSteps={showSteps}
+            onShowSteps={handleToggleSteps}
+          />
+        </Suspense>
       )}
 
       {/* Recently Created Equations - Compact List */}
@@ -337,13 +371,19 @@ const App: React.FC = () => {
       )}
 
       {/* Equation List - Full Database */}
-      <EquationList
-        onEquationSelect={handleEquationSelect}
-        onEquationUpdated={handleEquationUpdated}
-        onEquationDeleted={handleEquationDeleted}
-        onError={handleError}
-        refreshTrigger={refreshListTrigger}
-      />
+      {showList ? (
+        <Suspense fallback={<ViewFallback label="Đang tải danh sách phương trình..." />}>
+          <EquationList
+            onEquationSelect={handleEquationSelect}
+            onEquationUpdated={handleEquationUpdated}
+            onEquationDeleted={handleEquationDeleted}
+            onError={handleError}
+            refreshTrigger={refreshListTrigger}
+          />
+        </Suspense>
+      ) : (
+        <ViewFallback label="Đang tải danh sách phương trình..." />
+      )}
 
       {/* Footer */}
       <div className="text-center" style={{ 
@@ -1,6 +1,9 @@
-import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import React, { useState, useEffect, useRef, useCallback, useMemo } from 'react';
 import { EquationData } from '../types';
+import { equationApi, subscribeToChanges } from '../services/api';
+import { hasLocalCopy, saveSync } from '../services/equationCache';
+import { subscribe as subscribeToCache } from '../services/entityCache';
+import './EquationList.css';
 
 interface Equation {
   id: number;
@@ -23,6 +26,201 @@ interface EquationListProps {
   refreshTrigger?: number; // Trigger to refresh the list
 }
 
+interface EditForm {
+  a: number;
+  b: number;
+  c: number;
+}
+
+// Windowed rendering: only the rows inside the scroll viewport (plus OVERSCAN on each side)
+// are mounted; spacer rows stand in for the rest. Rows have a fixed height (see .equation-row).
+const ROW_HEIGHT = 56;
+const VIEWPORT_HEIGHT = 560;
+const OVERSCAN = 6;
+// Infinite scroll: the next page is requested when fewer than PREFETCH_ROWS loaded rows remain below the viewport
+const PAGE_SIZE = 100;
+const PREFETCH_ROWS = 30;
+
+const SOLUTION_TYPE_STYLES: Record<string, { color: string; icon: string }> = {
+  two_real: { color: '#28a745', icon: '🎯' },
+  one_real: { color: '#ffc107', icon: '🎪' },
+  complex: { color: '#6f42c1', icon: '🌀' },
+  linear: { color: '#17a2b8', icon: '📏' },
+  none: { color: '#dc3545', icon: '❌' },
+  infinite: { color: '#20c997', icon: '♾️' }
+};
+
+// Get solution type styling
+const getSolutionTypeStyle = (type: string) => SOLUTION_TYPE_STYLES[type] || { color: '#6c757d', icon: '❓' };
+
+// Convert Equation to EquationData
+const toEquationData = (equation: Equation): EquationData => ({
+  id: equation.id,
+  a: equation.a,
+  b: equation.b,
+  c: equation.c,
+  solution: equation.solution,
+  solution_type: equation.solution_type,
+  discriminant: equation.discriminant || undefined
+});
+
+interface EquationRowProps {
+  equation: Equation;
+  alternate: boolean;
+  selected: boolean;
+  editing: boolean;
+  editForm?: EditForm; // Only passed to the row being edited
+  onSelect: (equation: Equation) => void;
+  onToggleSelected: (id: number) => void;
+  onEdit: (equation: Equation) => void;
+  onEditFormChange: (field: keyof EditForm, value: number) => void;
+  onSubmit: (id: number, form: EditForm) => void;
+  onCancel: () => void;
+  onDelete: (id: number, equationString: string) => void;
+}
+
+// One table row. Memoized with stable callbacks: typing in the edit form, selecting a row or
+// receiving a change event re-renders only the rows whose props changed.
+const EquationRow = React.memo(({
+  equation,
+  alternate,
+  selected,
+  editing,
+  editForm,
+  onSelect,
+  onToggleSelected,
+  onEdit,
+  onEditFormChange,
+  onSubmit,
+  onCancel,
+  onDelete
+}: EquationRowProps) => {
+  const typeStyle = getSolutionTypeStyle(equation.solution_type);
+
+  return (
+    <tr
+      className={`equation-row ${alternate ? 'alternate' : ''} ${editing ? 'editing' : ''}`}
+      onClick={() => {
+        if (!editing) {
+          onSelect(equation);
+        }
+      }}
+    >
+      <td className="select-cell" onClick={(e) => e.stopPropagation()}>
+        <input
+          type="checkbox"
+          checked={selected}
+          onChange={() => onToggleSelected(equation.id)}
+        />
+      </td>
+      <td className="id-cell">{equation.id}</td>
+
+      <td className="equation-cell">
+        {editing && editForm ? (
+          <div className="edit-form">
+            <div className="coefficient-inputs">
+              <input
+                type="number"
+                step="any"
+                value={editForm.a}
+                onChange={(e) => onEditFormChange('a', parseFloat(e.target.value) || 0)}
+                placeholder="a"
+                className="coeff-input"
+              />
+              <input
+                type="number"
+                step="any"
+                value={editForm.b}
+                onChange={(e) => onEditFormChange('b', parseFloat(e.target.value) || 0)}
+                placeholder="b"
+                className="coeff-input"
+              />
+              <input
+                type="number"
+                step="any"
+                value={editForm.c}
+                onChange={(e) => onEditFormChange('c', parseFloat(e.target.value) || 0)}
+                placeholder="c"
+                className="coeff-input"
+              />
+            </div>
+          </div>
+        ) : (
+          <span className="equation-display">{equation.equation_string}</span>
+        )}
+      </td>
+
+      <td className="solution-cell">
+        <span className="solution-text" title={equation.solution}>{equation.solution}</span>
+      </td>
+
+      <td className="type-cell">
+        <span className="solution-type-badge" style={{ color: typeStyle.color }}>
+          {typeStyle.icon} {equation.solution_type}
+        </span>
+      </td>
+
+      <td className="discriminant-cell">
+        {equation.discriminant !== null && equation.discriminant !== undefined ? equation.discriminant.toFixed(2) : 'N/A'}
+      </td>
+
+      <td className="time-cell">
+        {new Date(equation.created_at).toLocaleString('vi-VN')}
+      </td>
+
+      <td className="actions-cell">
+        {editing && editForm ? (
+          <div className="edit-actions">
+            <button
+              className="btn btn-success btn-sm"
+              onClick={(e) => {
+                e.stopPropagation();
+                onSubmit(equation.id, editForm);
+              }}
+              title="Lưu thay đổi"
+            >
+              ✅
+            </button>
+            <button
+              className="btn btn-secondary btn-sm"
+              onClick={(e) => {
+                e.stopPropagation();
+                onCancel();
+              }}
+              title="Hủy"
+            >
+              ❌
+            </button>
+          </div>
+        ) : (
+          <div className="row-actions">
+            <button
+              className="btn btn-primary btn-sm"
+              onClick={(e) => {
+                e.stopPropagation();
+                onEdit(equation);
+              }}
+              title="Chỉnh sửa"
+            >
+              ✏️
+            </button>
+            <button
+              className="btn btn-danger btn-sm"
+              onClick={(e) => {
+                e.stopPropagation();
+                onDelete(equation.id, equation.equation_string);
+              }}
+              title="Xóa"
+            >
+              🗑️
+            </button>
+          </div>
+        )}
+      </td>
+    </tr>
+  );
+});
+
 const EquationList: React.FC<EquationListProps> = ({
   onEquationSelect,
   onEquationUpdated,
@@ -33,150 +231,318 @@ const EquationList: React.FC<EquationListProps> = ({
   const [equations, setEquations] = useState<Equation[]>([]);
   const [loading, setLoading] = useState(false);
   const [editingId, setEditingId] = useState<number | null>(null);
-  const [editForm, setEditForm] = useState({ a: 0, b: 0, c: 0 });
-  const [currentPage, setCurrentPage] = useState(1);
-  const [itemsPerPage] = useState(10);
+  const [editForm, setEditForm] = useState<EditForm>({ a: 0, b: 0, c: 0 });
+  const [selectedIds, setSelectedIds] = useState<Set<number>>(new Set());
+  const [liveUpdates, setLiveUpdates] = useState(false);
+  const [scrollTop, setScrollTop] = useState(0);
+  // Cursor of the next server page; null once the whole list is loaded
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const nextCursorRef = useRef<string | null>(null);
+
+  // sync_token of the first page, saved with the list once the last page has arrived
+  const syncTokenRef = useRef<string | null>(null);
+  const [pagingDone, setPagingDone] = useState(false);
+  const loadingMoreRef = useRef(false);
+  const scrollFrameRef = useRef<number | null>(null);
+  const viewportRef = useRef<HTMLDivElement | null>(null);
+
+  // Parent callbacks may change identity on every render; read them through a ref so the
+  // row callbacks below can stay stable
+  const callbacksRef = useRef({ onEquationSelect, onEquationUpdated, onEquationDeleted, onError });
+  callbacksRef.current = { onEquationSelect, onEquationUpdated, onEquationDeleted, onError };
+
+  useEffect(() => {
+    nextCursorRef.current = nextCursor;
+  }, [nextCursor]);
+
+  // Once every page is loaded, keep the list locally so the next load is a delta sync
+  // (changes that arrived while paging are newer than the token and are sent again)
+  useEffect(() => {
+    if (pagingDone && syncTokenRef.current) {
+      saveSync(syncTokenRef.current, equations, [], true);
+      syncTokenRef.current = null;
+      setPagingDone(false);
+    }
+  }, [pagingDone, equations]);
 
-  // Fetch all equations from API
+  // Fetch equations: a delta sync when a local copy exists, otherwise the first page
   const fetchEquations = async () => {
     setLoading(true);
     try {
-      const response = await axios.get('http://localhost:5000/api/equation');
-      
-      if (response.data.status === 'success') {
-        setEquations(response.data.data || []);
+      if (await hasLocalCopy()) {
+        // Delta sync against the IndexedDB copy: only changes since the last load are downloaded
+        const response = await equationApi.sync();
+
+        if (response.status === 'success') {
+          setEquations((response.data || []) as Equation[]);
+          setNextCursor(null);
+        } else {
+          callbacksRef.current.onError?.('Failed to fetch equations: ' + response.message);
+        }
+        return;
+      }
+
+      const page = await equationApi.getPage(null, PAGE_SIZE);
+
+      if (page.status === 'success') {
+        setEquations((page.data || []) as Equation[]);
+        syncTokenRef.current = page.sync_token || null;
+        setNextCursor(page.next_cursor || null);
+        setPagingDone(!page.next_cursor);
       } else {
-        onError?.('Failed to fetch equations: ' + response.data.message);
+        callbacksRef.current.onError?.('Failed to fetch equations: ' + page.message);
       }
     } catch (error: any) {
       console.error('Error fetching equations:', error);
-      onError?.('Network error: ' + (error.message || 'Unable to fetch equations'));
+      callbacksRef.current.onError?.('Network error: ' + (error.message || 'Unable to fetch equations'));
     } finally {
       setLoading(false);
     }
   };
 
-  // Load equations on component mount and when refreshTrigger changes
+  // Fetch the next page when the user scrolls near the end of what is loaded
+  const loadMore = async (cursor: string) => {
+    if (loadingMoreRef.current) {
+      return;
+    }
+    loadingMoreRef.current = true;
+    setLoadingMore(true);
+    try {
+      const page = await equationApi.getPage(cursor, PAGE_SIZE);
+
+      if (page.status === 'success') {
+        setEquations(prev => {
+          // Rows the change feed already delivered are not added twice
+          const known = new Set(prev.map(eq => eq.id));
+          return [...prev, ...((page.data || []) as Equation[]).filter(eq => !known.has(eq.id))];
+        });
+        setNextCursor(page.next_cursor || null);
+        setPagingDone(!page.next_cursor);
+      } else {
+        callbacksRef.current.onError?.('Failed to fetch equations: ' + page.message);
+      }
+    } catch (error: any) {
+      console.error('Error fetching equations:', error);
+      callbacksRef.current.onError?.('Network error: ' + (error.message || 'Unable to fetch equations'));
+    } finally {
+      loadingMoreRef.current = false;
+      setLoadingMore(false);
+    }
+  };
+
+  // Load equations on component mount. Later refreshTrigger changes (a new equation from the
+  // form) need no refetch: the create went through equationApi and reaches the list via the cache
   useEffect(() => {
+    if (refreshTrigger > 0) {
+      return;
+    }
     fetchEquations();
   }, [refreshTrigger]);
 
+  // Apply changes from the entity cache: this tab's writes (any view) and, through the change
+  // feed, other tabs' writes
+  useEffect(() => {
+    return subscribeToCache((change) => {
+      if (change.kind === 'created') {
+        setEquations(prev => {
+          const known = new Set(prev.map(eq => eq.id));
+          const added = (change.equations as Equation[]).filter(eq => !known.has(eq.id));
+          // Newest first, like GET /api/equation
+          return added.length > 0 ? [...added.reverse(), ...prev] : prev;
+        });
+      } else if (change.kind === 'updated') {
+        const changes: Record<number, Partial<Equation>> = {};
+        (change.equations || []).forEach(eq => {
+          changes[eq.id as number] = eq as Partial<Equation>;
+        });
+        // Unchanged rows keep their object identity, so their memoized rows do not re-render
+        setEquations(prev => prev.map(eq => (changes[eq.id] ? { ...eq, ...changes[eq.id] } : eq)));
+      } else if (change.kind === 'deleted') {
+        const removed = new Set(change.ids || []);
+        setEquations(prev => prev.filter(eq => !removed.has(eq.id)));
+        setSelectedIds(prev => new Set(Array.from(prev).filter(id => !removed.has(id))));
+        setEditingId(prev => (prev !== null && removed.has(prev) ? null : prev));
+      } else if (change.kind === 'list' && nextCursorRef.current === null) {
+        // A stale list was shown and has been revalidated (not while paging through the server)
+        setEquations((change.equations || []) as Equation[]);
+      }
+    });
+  }, []);
+
+  // Change feed connection state; after missed events the list is fetched again
+  useEffect(() => {
+    return subscribeToChanges({
+      onReset: () => {
+        fetchEquations();
+      },
+      onStatusChange: setLiveUpdates
+    });
+  }, []);
+
+  // Track the scroll position once per animation frame
+  const handleScroll = (event: React.UIEvent<HTMLDivElement>) => {
+    const target = event.currentTarget;
+    if (scrollFrameRef.current !== null) {
+      return;
+    }
+    scrollFrameRef.current = window.requestAnimationFrame(() => {
+      scrollFrameRef.current = null;
+      setScrollTop(target.scrollTop);
+    });
+  };
+
+  useEffect(() => () => {
+    if (scrollFrameRef.current !== null) {
+      window.cancelAnimationFrame(scrollFrameRef.current);
+    }
+  }, []);
+
+  // Visible window
+  const firstVisible = Math.floor(scrollTop / ROW_HEIGHT);
+  const visibleCount = Math.ceil(VIEWPORT_HEIGHT / ROW_HEIGHT);
+  const startIndex = Math.max(0, firstVisible - OVERSCAN);
+  const endIndex = Math.min(equations.length, firstVisible + visibleCount + OVERSCAN);
+  const visibleEquations = equations.slice(startIndex, endIndex);
+
+  // Infinite scroll: request the next page before the user reaches the end
+  useEffect(() => {
+    if (nextCursor && !loading && firstVisible + visibleCount + PREFETCH_ROWS >= equations.length) {
+      loadMore(nextCursor);
+    }
+  }, [nextCursor, loading, firstVisible, visibleCount, equations.length]);
+
   // Handle edit button click
-  const handleEditClick = (equation: Equation) => {
+  const handleEditClick = useCallback((equation: Equation) => {
     setEditingId(equation.id);
     setEditForm({
       a: equation.a,
       b: equation.b,
       c: equation.c
     });
-  };
+  }, []);
+
+  // Update one coefficient of the edit form
+  const handleEditFormChange = useCallback((field: keyof EditForm, value: number) => {
+    setEditForm(prev => ({ ...prev, [field]: value }));
+  }, []);
 
   // Handle edit form submission
-  const handleEditSubmit = async (id: number) => {
+  const handleEditSubmit = useCallback(async (id: number, form: EditForm) => {
     try {
-      const response = await axios.put(`http://localhost:5000/api/equation/${id}`, editForm, {
-        headers: { 'Content-Type': 'application/json' }
-      });
-
-      if (response.data.status === 'success') {
-        const updatedEquation = response.data.data;
-        
-        // Update local state
-        setEquations(prev => 
-          prev.map(eq => eq.id === id ? updatedEquation : eq)
-        );
-        
+      // The row itself is updated through the entity cache
+      const response = await equationApi.update(id, form);
+
+      if (response.status === 'success' && response.data) {
+        const updatedEquation = response.data as Equation;
+
         // Reset editing state
         setEditingId(null);
         setEditForm({ a: 0, b: 0, c: 0 });
-        
-        // Notify parent component - Convert to EquationData
-        const equationData: EquationData = {
-          id: updatedEquation.id,
-          a: updatedEquation.a,
-          b: updatedEquation.b,
-          c: updatedEquation.c,
-          solution: updatedEquation.solution,
-          solution_type: updatedEquation.solution_type,
-          discriminant: updatedEquation.discriminant || undefined
-        };
-        onEquationUpdated?.(equationData);
-        
+
+        // Notify parent component
+        callbacksRef.current.onEquationUpdated?.(toEquationData(updatedEquation));
+
       } else {
-        onError?.('Failed to update equation: ' + response.data.message);
+        callbacksRef.current.onError?.('Failed to update equation: ' + response.message);
       }
     } catch (error: any) {
       console.error('Error updating equation:', error);
-      onError?.('Update failed: ' + (error.message || 'Network error'));
+      callbacksRef.current.onError?.('Update failed: ' + (error.message || 'Network error'));
     }
-  };
+  }, []);
 
   // Handle delete button click
-  const handleDelete = async (id: number, equationString: string) => {
+  const handleDelete = useCallback(async (id: number, equationString: string) => {
     if (!window.confirm(`Bạn có chắc muốn xóa phương trình "${equationString}"?`)) {
       return;
     }
 
     try {
-      const response = await axios.delete(`http://localhost:5000/api/equation/${id}`);
+      // The row is removed through the entity cache
+      const response = await equationApi.delete(id);
 
-      if (response.data.status === 'success') {
-        // Update local state
-        setEquations(prev => prev.filter(eq => eq.id !== id));
-        
+      if (response.status === 'success') {
         // Notify parent component
-        onEquationDeleted?.(id);
-        
+        callbacksRef.current.onEquationDeleted?.(id);
+
       } else {
-        onError?.('Failed to delete equation: ' + response.data.message);
+        callbacksRef.current.onError?.('Failed to delete equation: ' + response.message);
       }
     } catch (error: any) {
       console.error('Error deleting equation:', error);
-      onError?.('Delete failed: ' + (error.message || 'Network error'));
+      callbacksRef.current.onError?.('Delete failed: ' + (error.message || 'Network error'));
     }
+  }, []);
+
+  // Toggle selection of one row
+  const toggleSelected = useCallback((id: number) => {
+    setSelectedIds(prev => {
+      const next = new Set(prev);
+      if (next.has(id)) {
+        next.delete(id);
+      } else {
+        next.add(id);
+      }
+      return next;
+    });
+  }, []);
+
+  // Select or clear every loaded row
+  const toggleSelectAll = (selectAll: boolean) => {
+    setSelectedIds(selectAll ? new Set(equations.map(eq => eq.id)) : new Set());
   };
 
-  // Handle equation row click
-  const handleRowClick = (equation: Equation) => {
-    if (editingId !== equation.id) {
-      // Convert Equation to EquationData
-      const equationData: EquationData = {
-        id: equation.id,
-        a: equation.a,
-        b: equation.b,
-        c: equation.c,
-        solution: equation.solution,
-        solution_type: equation.solution_type,
-        discriminant: equation.discriminant || undefined
-      };
-      onEquationSelect?.(equationData);
+  // Delete all selected equations with one bulk request
+  const handleBulkDelete = async () => {
+    const ids = Array.from(selectedIds);
+    if (ids.length === 0) {
+      return;
+    }
+    if (!window.confirm(`Bạn có chắc muốn xóa ${ids.length} phương trình đã chọn?`)) {
+      return;
+    }
+
+    try {
+      const response = await equationApi.bulkDelete(ids);
+
+      if (response.status === 'error') {
+        onError?.('Failed to delete equations: ' + response.message);
+        return;
+      }
+
+      const deletedIds = new Set(
+        (response.results || [])
+          .filter(result => result.status === 'deleted')
+          .map(result => result.id)
+      );
+
+      // Rows are removed through the entity cache
+      setSelectedIds(new Set());
+
+      // Notify parent component
+      deletedIds.forEach(id => onEquationDeleted?.(id));
+    } catch (error: any) {
+      console.error('Error deleting equations:', error);
+      onError?.('Bulk delete failed: ' + (error.message || 'Network error'));
     }
   };
 
+  // Handle equation row click
+  const handleRowClick = useCallback((equation: Equation) => {
+    callbacksRef.current.onEquationSelect?.(toEquationData(equation));
+  }, []);
+
   // Cancel editing
-  const handleCancelEdit = () => {
+  const handleCancelEdit = useCallback(() => {
     setEditingId(null);
     setEditForm({ a: 0, b: 0, c: 0 });
-  };
-
-  // Get solution type styling
-  const getSolutionTypeStyle = (type: string) => {
-    const styles = {
-      two_real: { color: '#28a745', icon: '🎯' },
-      one_real: { color: '#ffc107', icon: '🎪' },
-      complex: { color: '#6f42c1', icon: '🌀' },
-      linear: { color: '#17a2b8', icon: '📏' },
-      none: { color: '#dc3545', icon: '❌' },
-      infinite: { color: '#20c997', icon: '♾️' }
-    };
-    return styles[type as keyof typeof styles] || { color: '#6c757d', icon: '❓' };
-  };
+  }, []);
 
-  // Pagination logic
-  const totalPages = Math.ceil(equations.length / itemsPerPage);
-  const startIndex = (currentPage - 1) * itemsPerPage;
-  const endIndex = startIndex + itemsPerPage;
-  const currentEquations = equations.slice(startIndex, endIndex);
+  const allSelected = useMemo(
+    () => equations.length > 0 && equations.every(eq => selectedIds.has(eq.id)),
+    [equations, selectedIds]
+  );
 
   if (loading) {
     return (
@@ -192,16 +558,16 @@ const EquationList: React.FC<EquationListProps> = ({
   if (equations.length === 0) {
     return (
       <div className="card">
-        <h3 style={{ 
-          display: 'flex', 
-          alignItems: 'center', 
+        <h3 style={{
+          display: 'flex',
+          alignItems: 'center',
           gap: '10px',
           color: '#495057'
         }}>
           📋 Danh sách phương trình đã lưu
         </h3>
-        <div style={{ 
-          textAlign: 'center', 
+        <div style={{
+          textAlign: 'center',
           padding: '40px',
           color: '#6c757d'
         }}>
@@ -214,21 +580,52 @@ const EquationList: React.FC<EquationListProps> = ({
 
   return (
     <div className="card equation-list-container">
-      <h3 style={{ 
-        display: 'flex', 
-        alignItems: 'center', 
+      <h3 style={{
+        display: 'flex',
+        alignItems: 'center',
         gap: '10px',
         color: '#495057',
         marginBottom: '20px'
       }}>
-        📋 Danh sách phương trình đã lưu ({equations.length})
+        📋 Danh sách phương trình đã lưu ({equations.length}{nextCursor ? '+' : ''})
+        {liveUpdates && (
+          <span style={{ fontSize: '12px', color: '#28a745', fontWeight: 'normal' }} title="Danh sách tự cập nhật khi có thay đổi">
+            🟢 Cập nhật trực tiếp
+          </span>
+        )}
       </h3>
 
-      {/* Table */}
-      <div className="equation-table-container">
+      {/* Bulk actions for selected rows */}
+      {selectedIds.size > 0 && (
+        <div className="bulk-actions-bar">
+          <span>Đã chọn {selectedIds.size} phương trình</span>
+          <button className="btn btn-danger btn-sm" onClick={handleBulkDelete}>
+            🗑️ Xóa đã chọn
+          </button>
+          <button className="btn btn-secondary btn-sm" onClick={() => setSelectedIds(new Set())}>
+            Bỏ chọn
+          </button>
+        </div>
+      )}
+
+      {/* Table: a fixed-height viewport that mounts only the visible rows */}
+      <div
+        className="equation-table-container virtualized"
+        style={{ maxHeight: VIEWPORT_HEIGHT }}
+        onScroll={handleScroll}
+        ref={viewportRef}
+      >
         <table className="equation-table">
           <thead>
             <tr>
+              <th className="select-cell">
+                <input
+                  type="checkbox"
+                  checked={allSelected}
+                  onChange={(e) => toggleSelectAll(e.target.checked)}
+                  title="Chọn tất cả đã tải"
+                />
+              </th>
               <th>ID</th>
               <th>Phương trình</th>
               <th>Nghiệm</th>
@@ -239,154 +636,54 @@ const EquationList: React.FC<EquationListProps> = ({
             </tr>
           </thead>
           <tbody>
-            {currentEquations.map((equation) => (
-              <tr 
-                key={equation.id}
-                className={`equation-row ${editingId === equation.id ? 'editing' : ''}`}
-                onClick={() => handleRowClick(equation)}
-              >
-                <td className="id-cell">{equation.id}</td>
-                
-                <td className="equation-cell">
-                  {editingId === equation.id ? (
-                    <div className="edit-form">
-                      <div className="coefficient-inputs">
-                        <input
-                          type="number"
-                          step="any"
-                          value={editForm.a}
-                          onChange={(e) => setEditForm(prev => ({ ...prev, a: parseFloat(e.target.value) || 0 }))}
-                          placeholder="a"
-                          className="coeff-input"
-                        />
-                        <input
-                          type="number"
-                          step="any"
-                          value={editForm.b}
-                          onChange={(e) => setEditForm(prev => ({ ...prev, b: parseFloat(e.target.value) || 0 }))}
-                          placeholder="b"
-                          className="coeff-input"
-                        />
-                        <input
-                          type="number"
-                          step="any"
-                          value={editForm.c}
-                          onChange={(e) => setEditForm(prev => ({ ...prev, c: parseFloat(e.target.value) || 0 }))}
-                          placeholder="c"
-                          className="coeff-input"
-                        />
-                      </div>
-                    </div>
-                  ) : (
-                    <span className="equation-display">{equation.equation_string}</span>
-                  )}
-                </td>
-                
-                <td className="solution-cell">
-                  <span className="solution-text">{equation.solution}</span>
-                </td>
-                
-                <td className="type-cell">
-                  <span 
-                    className="solution-type-badge"
-                    style={{ color: getSolutionTypeStyle(equation.solution_type).color }}
-                  >
-                    {getSolutionTypeStyle(equation.solution_type).icon} {equation.solution_type}
-                  </span>
-                </td>
-                
-                <td className="discriminant-cell">
-                  {equation.discriminant !== null ? equation.discriminant.toFixed(2) : 'N/A'}
-                </td>
-                
-                <td className="time-cell">
-                  {new Date(equation.created_at).toLocaleString('vi-VN')}
-                </td>
-                
-                <td className="actions-cell">
-                  {editingId === equation.id ? (
-                    <div className="edit-actions">
-                      <button
-                        className="btn btn-success btn-sm"
-                        onClick={(e) => {
-                          e.stopPropagation();
-                          handleEditSubmit(equation.id);
-                        }}
-                        title="Lưu thay đổi"
-                      >
-                        ✅
-                      </button>
-                      <button
-                        className="btn btn-secondary btn-sm"
-                        onClick={(e) => {
-                          e.stopPropagation();
-                          handleCancelEdit();
-                        }}
-                        title="Hủy"
-                      >
-                        ❌
-                      </button>
-                    </div>
-                  ) : (
-                    <div className="row-actions">
-                      <button
-                        className="btn btn-primary btn-sm"
-                        onClick={(e) => {
-                          e.stopPropagation();
-                          handleEditClick(equation);
-                        }}
-                        title="Chỉnh sửa"
-                      >
-                        ✏️
-                      </button>
-                      <button
-                        className="btn btn-danger btn-sm"
-                        onClick={(e) => {
-                          e.stopPropagation();
-                          handleDelete(equation.id, equation.equation_string);
-                        }}
-                        title="Xóa"
-                      >
-                        🗑️
-                      </button>
-                    </div>
-                  )}
-                </td>
+            {startIndex > 0 && (
+              <tr className="spacer-row" style={{ height: startIndex * ROW_HEIGHT }}>
+                <td colSpan={8} />
               </tr>
+            )}
+            {visibleEquations.map((equation, offset) => (
+              <EquationRow
+                key={equation.id}
+                equation={equation}
+                alternate={(startIndex + offset) % 2 === 1}
+                selected={selectedIds.has(equation.id)}
+                editing={editingId === equation.id}
+                editForm={editingId === equation.id ? editForm : undefined}
+                onSelect={handleRowClick}
+                onToggleSelected={toggleSelected}
+                onEdit={handleEditClick}
+                onEditFormChange={handleEditFormChange}
+                onSubmit={handleEditSubmit}
+                onCancel={handleCancelEdit}
+                onDelete={handleDelete}
+              />
             ))}
+            {endIndex < equations.length && (
+              <tr className="spacer-row" style={{ height: (equations.length - endIndex) * ROW_HEIGHT }}>
+                <td colSpan={8} />
+              </tr>
+            )}
           </tbody>
         </table>
       </div>
 
-      {/* Pagination */}
-      {totalPages > 1 && (
-        <div className="pagination-container">
-          <div className="pagination-info">
-            Hiển thị {startIndex + 1}-{Math.min(endIndex, equations.length)} của {equations.length} phương trình
-          </div>
-          <div className="pagination-controls">
-            <button
-              className="btn btn-outline-primary btn-sm"
-              onClick={() => setCurrentPage(prev => Math.max(1, prev - 1))}
-              disabled={currentPage === 1}
-            >
-              ← Trước
-            </button>
-            
-            <span className="page-info">
-              Trang {currentPage} / {totalPages}
-            </span>
-            
+      {/* Scroll status */}
+      <div className="pagination-container">
+        <div className="pagination-info">
+          Hiển thị {startIndex + 1}-{endIndex} của {equations.length}{nextCursor ? '+' : ''} phương trình
+        </div>
+        <div className="pagination-controls">
+          {loadingMore && <span className="page-info">Đang tải thêm...</span>}
+          {!nextCursor && equations.length > visibleCount && (
             <button
               className="btn btn-outline-primary btn-sm"
-              onClick={() => setCurrentPage(prev => Math.min(totalPages, prev + 1))}
-              disabled={currentPage === totalPages}
+              onClick={() => viewportRef.current?.scrollTo({ top: 0 })}
             >
-              Sau →
+              ↑ Lên đầu
             </button>
-          </div>
+          )}
         </div>
-      )}
+      </div>
 
       {/* Instructions */}
       <div className="list-instructions">
@@ -395,11 +692,12 @@ const EquationList: React.FC<EquationListProps> = ({
           <li>Click vào dòng để xem chi tiết phương trình</li>
           <li>Dùng nút ✏️ để chỉnh sửa hệ số a, b, c</li>
           <li>Dùng nút 🗑️ để xóa phương trình</li>
-          <li>Phương trình mới nhất hiển thị ở đầu danh sách</li>
+          <li>Đánh dấu nhiều dòng để xóa hàng loạt</li>
+          <li>Phương trình mới nhất hiển thị ở đầu danh sách; cuộn xuống để tải thêm</li>
         </ul>
       </div>
     </div>
   );
 };
 
-export default EquationList;
\ No newline at end of file
+export default EquationList;
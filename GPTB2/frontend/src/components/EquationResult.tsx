@@ -1,5 +1,6 @@
 import React from 'react';
 import { EquationData, SolutionType } from '../types';
+import './EquationResult.css';
 
 interface EquationResultProps {
   equation: EquationData;
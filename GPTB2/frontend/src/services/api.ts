@@ -1,5 +1,9 @@
-import axios from 'axios';
-import { EquationData, ApiResponse } from '../types';
+import axios, { AxiosResponse } from 'axios';
+import { EquationData, ApiResponse, BulkResponse, EquationPage, BatchOperation, BatchResponse } from '../types';
+import { encode as encodeMsgpack, decode as decodeMsgpack } from './msgpack';
+import { loadCache, saveSync } from './equationCache';
+import { createBatcher, BatchOptions } from './batcher';
+import * as cache from './entityCache';
 
 // Get API URL from environment variables
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
@@ -13,6 +17,58 @@ const api = axios.create({
   timeout: 10000, // 10 seconds timeout
 });
 
+// Wire format: JSON by default; opt in to MessagePack with REACT_APP_API_FORMAT=msgpack
+// or setWireFormat('msgpack'). Field names and values are identical in both formats.
+export type WireFormat = 'json' | 'msgpack';
+const MSGPACK_MIMETYPE = 'application/msgpack';
+let wireFormat: WireFormat = process.env.REACT_APP_API_FORMAT === 'msgpack' ? 'msgpack' : 'json';
+
+export const setWireFormat = (format: WireFormat) => {
+  wireFormat = format;
+};
+
+export const getWireFormat = (): WireFormat => wireFormat;
+
+// Decode a binary response body by its Content-Type (errors from nginx etc. may still be JSON or text)
+const decodeBody = (response?: AxiosResponse) => {
+  if (!response || !(response.data instanceof ArrayBuffer)) return;
+  const contentType = String(response.headers['content-type'] || '');
+  if (contentType.includes(MSGPACK_MIMETYPE)) {
+    response.data = decodeMsgpack(response.data);
+    return;
+  }
+  const text = new TextDecoder().decode(response.data);
+  try {
+    response.data = JSON.parse(text);
+  } catch {
+    response.data = text;
+  }
+};
+
+// Registered before the logging interceptors: request interceptors run last-registered first,
+// so requests are logged before encoding and responses after decoding
+api.interceptors.request.use((config) => {
+  if (wireFormat !== 'msgpack') return config;
+  config.headers.set('Accept', MSGPACK_MIMETYPE);
+  config.responseType = 'arraybuffer';
+  if (config.data !== undefined && !(config.data instanceof FormData)) {
+    config.data = encodeMsgpack(config.data);
+    config.headers.set('Content-Type', MSGPACK_MIMETYPE);
+  }
+  return config;
+});
+
+api.interceptors.response.use(
+  (response) => {
+    decodeBody(response);
+    return response;
+  },
+  (error) => {
+    decodeBody(error.response);
+    return Promise.reject(error);
+  }
+);
+
 // Request interceptor for logging
 api.interceptors.request.use(
   (config) => {
@@ -37,13 +93,209 @@ api.interceptors.response.use(
   }
 );
 
-// API service functions
+// Request batching: creates and get-by-id calls made within windowMs of each other are sent
+// as one POST /api/equations/bulk or GET /api/equations?ids= (maxBatchSize items at most;
+// the bulk endpoint accepts 50). A lone call still uses the single-item endpoint.
+// Configure with REACT_APP_BATCH_WINDOW_MS / REACT_APP_BATCH_MAX_SIZE or setBatchOptions().
+let batchOptions: BatchOptions = {
+  windowMs: Number(process.env.REACT_APP_BATCH_WINDOW_MS || 10),
+  maxBatchSize: Math.min(50, Number(process.env.REACT_APP_BATCH_MAX_SIZE || 50)),
+};
+
+export const setBatchOptions = (options: Partial<BatchOptions>) => {
+  batchOptions = { ...batchOptions, ...options };
+  batchOptions.maxBatchSize = Math.min(50, batchOptions.maxBatchSize);
+};
+
+export const getBatchOptions = (): BatchOptions => batchOptions;
+
+type Coefficients = { a: number; b: number; c: number };
+
+// Error bodies apply to every item of the batch; network errors reject every item
+const batchFailure = (error: any, size: number) => {
+  if (error.response?.data) {
+    return Array(size).fill(error.response.data);
+  }
+  throw new Error(`Network error: ${error.message}`);
+};
+
+const createBatch = async (items: Coefficients[]): Promise<ApiResponse<EquationData>[]> => {
+  try {
+    if (items.length === 1) {
+      const response = await api.post('/api/equation', items[0]);
+      return [response.data];
+    }
+
+    const response = await api.post('/api/equations/bulk', { equations: items });
+    const body: BulkResponse & { created_equations?: EquationData[] } = response.data;
+    if (body.status === 'error') {
+      return Array(items.length).fill(body);
+    }
+    // created_equations holds the items without an error entry, in request order
+    const failed: Record<number, string> = {};
+    (body.errors || []).forEach((error) => {
+      failed[error.index] = error.error;
+    });
+    const created = body.created_equations || [];
+    let next = 0;
+    return items.map((_, index): ApiResponse<EquationData> => {
+      if (index in failed) {
+        return { message: failed[index], status: 'error' };
+      }
+      return { message: 'Equation created and solved successfully', status: 'success', data: created[next++] };
+    });
+  } catch (error: any) {
+    return batchFailure(error, items.length);
+  }
+};
+
+const getByIdBatch = async (ids: number[]): Promise<ApiResponse<EquationData>[]> => {
+  try {
+    const unique = ids.filter((id, index) => ids.indexOf(id) === index);
+    if (unique.length === 1) {
+      const response = await api.get(`/api/equation/${unique[0]}`);
+      return ids.map(() => response.data);
+    }
+
+    const response = await api.get('/api/equations', { params: { ids: unique.join(',') } });
+    const body = response.data;
+    if (body.status !== 'success') {
+      return Array(ids.length).fill(body);
+    }
+    const byId: Record<number, EquationData> = {};
+    (body.data as EquationData[]).forEach((eq) => {
+      byId[eq.id as number] = eq;
+    });
+    return ids.map((id): ApiResponse<EquationData> =>
+      byId[id]
+        ? { message: 'Equation retrieved successfully', status: 'success', data: byId[id] }
+        : { message: `Equation with ID ${id} not found`, status: 'error' }
+    );
+  } catch (error: any) {
+    return batchFailure(error, ids.length);
+  }
+};
+
+const batchedCreate = createBatcher(createBatch, getBatchOptions);
+const batchedGetById = createBatcher(getByIdBatch, getBatchOptions);
+
+// Entity cache reads (see entityCache.ts) wrapped in the usual response envelope
+const cachedList = () => {
+  const list = cache.getList();
+  return list && {
+    value: { message: `Retrieved ${list.value.length} equations`, status: 'success', data: list.value } as ApiResponse<EquationData[]>,
+    fetchedAt: list.fetchedAt,
+  };
+};
+
+const cachedEquation = (id: number) => {
+  const entry = cache.getEquation(id);
+  return entry && {
+    value: { message: 'Equation retrieved successfully', status: 'success', data: entry.value } as ApiResponse<EquationData>,
+    fetchedAt: entry.fetchedAt,
+  };
+};
+
+// Keep the entity cache current with a successful write response
+const cacheWrite = <T extends ApiResponse<any>>(response: T, apply: (data: any) => void): T => {
+  if (response.status === 'success' && response.data) {
+    apply(response.data);
+  }
+  return response;
+};
+
+// API service functions. Reads go through the entity cache: identical requests in flight are
+// shared, and cached lists and equations are served stale-while-revalidate. Writes update the
+// cache, so every view sees them without refetching.
 export const equationApi = {
-  // Create new equation
-  create: async (coefficients: { a: number; b: number; c: number }): Promise<ApiResponse<EquationData>> => {
+  // Create new equation (batched with other creates issued at the same time)
+  create: async (coefficients: Coefficients): Promise<ApiResponse<EquationData>> =>
+    cacheWrite(await batchedCreate(coefficients), (data) => cache.applyCreated([data])),
+
+  // Get all equations
+  getAll: (): Promise<ApiResponse<EquationData[]>> =>
+    cache.staleWhileRevalidate('list', cachedList(), async () => {
+      try {
+        const response = await api.get('/api/equation');
+        return cacheWrite(response.data, (data) => cache.setList(data));
+      } catch (error: any) {
+        if (error.response?.data) {
+          return error.response.data;
+        }
+        throw new Error(`Network error: ${error.message}`);
+      }
+    }),
+
+  // Get all equations through the local IndexedDB copy: only changes since the last sync
+  // are downloaded (GET /api/equation?since=<sync_token>). Newest first, like getAll.
+  sync: (): Promise<ApiResponse<EquationData[]>> =>
+    cache.staleWhileRevalidate('list', cachedList(), async () => {
+      try {
+        const cached = await loadCache();
+        const response = await api.get('/api/equation', { params: { since: cached.syncToken || '' } });
+        const body = response.data;
+        if (body.status !== 'success') {
+          return body;
+        }
+
+        const received: EquationData[] = body.data || [];
+        const deleted: number[] = body.deleted || [];
+        const isDelta = body.delta === true;
+        const byId: Record<number, EquationData> = {};
+        if (isDelta) {
+          cached.equations.forEach((eq) => {
+            byId[eq.id as number] = eq;
+          });
+          deleted.forEach((id) => {
+            delete byId[id];
+          });
+        }
+        received.forEach((eq) => {
+          byId[eq.id as number] = eq;
+        });
+        await saveSync(body.sync_token, received, deleted, !isDelta);
+
+        const equations = Object.keys(byId).map((id) => byId[Number(id)]);
+        equations.sort((x, y) =>
+          (y.created_at || '').localeCompare(x.created_at || '') || (y.id as number) - (x.id as number)
+        );
+        cache.setList(equations);
+        return { message: body.message, status: 'success', data: equations } as ApiResponse<EquationData[]>;
+      } catch (error: any) {
+        if (error.response?.data) {
+          return error.response.data;
+        }
+        throw new Error(`Network error: ${error.message}`);
+      }
+    }),
+
+  // Get one page of the list (newest first); pass the previous page's next_cursor for the next one.
+  // The first page (no cursor) also starts a sync: its sync_token covers every page that follows.
+  getPage: (cursor: string | null, limit: number = 100): Promise<EquationPage> =>
+    cache.dedupe(`page:${limit}:${cursor || ''}`, async () => {
+      try {
+        const params = cursor ? { limit, cursor } : { limit, since: '' };
+        const response = await api.get('/api/equation', { params });
+        return cacheWrite(response.data, (data) => cache.remember(data));
+      } catch (error: any) {
+        if (error.response?.data) {
+          return error.response.data;
+        }
+        throw new Error(`Network error: ${error.message}`);
+      }
+    }),
+
+  // Get equation by ID (batched into one multi-get with other lookups issued at the same time)
+  getById: (id: number): Promise<ApiResponse<EquationData>> =>
+    cache.staleWhileRevalidate(`equation:${id}`, cachedEquation(id), async () =>
+      cacheWrite(await batchedGetById(id), (data) => cache.applyUpdated([data]))
+    ),
+
+  // Update equation
+  update: async (id: number, coefficients: { a: number; b: number; c: number }): Promise<ApiResponse<EquationData>> => {
     try {
-      const response = await api.post('/api/equation', coefficients);
-      return response.data;
+      const response = await api.put(`/api/equation/${id}`, coefficients);
+      return cacheWrite(response.data, (data) => cache.applyUpdated([data]));
     } catch (error: any) {
       if (error.response?.data) {
         return error.response.data;
@@ -52,10 +304,13 @@ export const equationApi = {
     }
   },
 
-  // Get all equations
-  getAll: async (): Promise<ApiResponse<EquationData[]>> => {
+  // Delete equation
+  delete: async (id: number): Promise<ApiResponse<EquationData>> => {
     try {
-      const response = await api.get('/api/equation');
+      const response = await api.delete(`/api/equation/${id}`);
+      if (response.data.status === 'success') {
+        cache.applyDeleted([id]);
+      }
       return response.data;
     } catch (error: any) {
       if (error.response?.data) {
@@ -65,11 +320,15 @@ export const equationApi = {
     }
   },
 
-  // Get equation by ID
-  getById: async (id: number): Promise<ApiResponse<EquationData>> => {
+  // Update many equations in one request (set-based UPDATE on the backend)
+  bulkUpdate: async (equations: Array<{ id: number; a: number; b: number; c: number }>): Promise<BulkResponse> => {
     try {
-      const response = await api.get(`/api/equation/${id}`);
-      return response.data;
+      const response = await api.put('/api/equations/bulk', { equations });
+      const body: BulkResponse = response.data;
+      cache.applyUpdated(
+        (body.results || []).filter((result) => result.status === 'updated' && result.data).map((result) => result.data!)
+      );
+      return body;
     } catch (error: any) {
       if (error.response?.data) {
         return error.response.data;
@@ -78,11 +337,13 @@ export const equationApi = {
     }
   },
 
-  // Update equation
-  update: async (id: number, coefficients: { a: number; b: number; c: number }): Promise<ApiResponse<EquationData>> => {
+  // Delete many equations in one request (single DELETE ... WHERE id IN on the backend)
+  bulkDelete: async (ids: number[]): Promise<BulkResponse> => {
     try {
-      const response = await api.put(`/api/equation/${id}`, coefficients);
-      return response.data;
+      const response = await api.delete('/api/equations/bulk', { data: { ids } });
+      const body: BulkResponse = response.data;
+      cache.applyDeleted((body.results || []).filter((result) => result.status === 'deleted').map((result) => result.id));
+      return body;
     } catch (error: any) {
       if (error.response?.data) {
         return error.response.data;
@@ -91,10 +352,14 @@ export const equationApi = {
     }
   },
 
-  // Delete equation
-  delete: async (id: number): Promise<ApiResponse<EquationData>> => {
+  // Solve without storing (GET /api/solve); immutable, so browsers and nginx cache the answer.
+  // Coefficients go in a, b, c order; the backend redirects other number forms to its canonical URL
+  solve: async (coefficients: { a: number; b: number; c: number }): Promise<ApiResponse<EquationData>> => {
     try {
-      const response = await api.delete(`/api/equation/${id}`);
+      const query = ['a', 'b', 'c']
+        .map((name) => `${name}=${encodeURIComponent(String((coefficients as any)[name]))}`)
+        .join('&');
+      const response = await api.get(`/api/solve?${query}`);
       return response.data;
     } catch (error: any) {
       if (error.response?.data) {
@@ -104,6 +369,26 @@ export const equationApi = {
     }
   },
 
+  // Several operations in one request; atomic batches commit together or not at all
+  batch: async (operations: BatchOperation[], atomic: boolean = true): Promise<BatchResponse> => {
+    try {
+      const response = await api.post('/api/batch', { operations, atomic });
+      const body: BatchResponse = response.data;
+      (body.results || []).forEach((result) => {
+        if (result.error || !result.data) return;
+        if (result.op === 'create') cache.applyCreated([result.data]);
+        else if (result.op === 'update') cache.applyUpdated([result.data]);
+        else if (result.op === 'delete') cache.applyDeleted([result.data.id]);
+      });
+      return body;
+    } catch (error: any) {
+      if (error.response?.data) {
+        return error.response.data;
+      }
+      throw new Error(`Network error: ${error.message}`);
+    }
+  },
+
   // Test API connection
   ping: async (): Promise<any> => {
     try {
@@ -118,4 +403,58 @@ export const equationApi = {
   }
 };
 
+// Change feed (Server-Sent Events). The events service runs separately from the API workers;
+// in development the API serves /api/events itself.
+const EVENTS_BASE_URL = process.env.REACT_APP_EVENTS_URL || API_BASE_URL;
+
+export interface ChangeHandlers {
+  onCreated?: (equations: EquationData[]) => void;
+  onUpdated?: (equations: EquationData[]) => void;
+  onDeleted?: (ids: number[]) => void;
+  // Events were missed (buffer overrun or service restart): refetch everything
+  onReset?: () => void;
+  onStatusChange?: (connected: boolean) => void;
+}
+
+// Subscribe to committed creates/updates/deletes; returns the unsubscribe function.
+// EventSource reconnects by itself and resumes with Last-Event-ID.
+export const subscribeToChanges = (handlers: ChangeHandlers): (() => void) => {
+  if (typeof EventSource === 'undefined') {
+    return () => undefined;
+  }
+
+  const source = new EventSource(`${EVENTS_BASE_URL}/api/events`);
+  const listen = (type: string, handle: (data: any) => void) => {
+    source.addEventListener(type, (event) => {
+      try {
+        handle(JSON.parse((event as MessageEvent).data));
+      } catch (error) {
+        console.error(`❌ Change feed: bad ${type} event`, error);
+      }
+    });
+  };
+
+  // Events also keep the entity cache current (views subscribed to it see other tabs' writes)
+  listen('created', (data) => {
+    cache.applyCreated(data.equations || []);
+    handlers.onCreated?.(data.equations || []);
+  });
+  listen('updated', (data) => {
+    cache.applyUpdated(data.equations || []);
+    handlers.onUpdated?.(data.equations || []);
+  });
+  listen('deleted', (data) => {
+    cache.applyDeleted(data.ids || []);
+    handlers.onDeleted?.(data.ids || []);
+  });
+  listen('reset', () => {
+    cache.invalidateAll();
+    handlers.onReset?.();
+  });
+  source.onopen = () => handlers.onStatusChange?.(true);
+  source.onerror = () => handlers.onStatusChange?.(false);
+
+  return () => source.close();
+};
+
 export default api;
\ No newline at end of file
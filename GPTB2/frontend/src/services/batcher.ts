@@ -0,0 +1,56 @@
+// Collects calls made within a short window and runs them as one request.
+// Every caller gets a promise for its own item's result; `run` must return one result per item,
+// in order. If `run` rejects, every caller in that batch receives the rejection.
+
+export interface BatchOptions {
+  windowMs: number; // How long to wait for more calls after the first one
+  maxBatchSize: number; // A full batch is sent immediately
+}
+
+interface Pending<T, R> {
+  item: T;
+  resolve: (result: R) => void;
+  reject: (error: any) => void;
+}
+
+export const createBatcher = <T, R>(
+  run: (items: T[]) => Promise<R[]>,
+  getOptions: () => BatchOptions
+): ((item: T) => Promise<R>) => {
+  let queue: Pending<T, R>[] = [];
+  let timer: ReturnType<typeof setTimeout> | null = null;
+
+  const flush = () => {
+    if (timer !== null) {
+      clearTimeout(timer);
+      timer = null;
+    }
+    const batch = queue;
+    queue = [];
+    if (batch.length === 0) return;
+
+    run(batch.map((pending) => pending.item)).then(
+      (results) => {
+        batch.forEach((pending, index) => {
+          if (index < results.length) {
+            pending.resolve(results[index]);
+          } else {
+            pending.reject(new Error('Batch response is missing this item'));
+          }
+        });
+      },
+      (error) => batch.forEach((pending) => pending.reject(error))
+    );
+  };
+
+  return (item: T) =>
+    new Promise<R>((resolve, reject) => {
+      const { windowMs, maxBatchSize } = getOptions();
+      queue.push({ item, resolve, reject });
+      if (queue.length >= Math.max(1, maxBatchSize)) {
+        flush();
+      } else if (timer === null) {
+        timer = setTimeout(flush, Math.max(0, windowMs));
+      }
+    });
+};
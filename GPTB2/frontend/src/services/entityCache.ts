@@ -0,0 +1,156 @@
+import { EquationData } from '../types';
+
+// Normalized in-memory cache shared by every view: one entry per equation id plus the ids of the
+// full list (newest first). Reads are stale-while-revalidate: a cached value is returned at once
+// and, when older than MAX_AGE_MS, refreshed in the background. Identical requests in flight are
+// shared. Writes made through equationApi and change-feed events update entries in place and
+// notify subscribers, so views stay current without refetching.
+const MAX_AGE_MS = Number(process.env.REACT_APP_CACHE_MAX_AGE_MS || 30000);
+
+export interface CacheChange {
+  kind: 'created' | 'updated' | 'deleted' | 'list';
+  equations?: EquationData[]; // created, updated, list (the whole list, newest first)
+  ids?: number[]; // deleted
+}
+
+type Listener = (change: CacheChange) => void;
+
+interface Entry<T> {
+  value: T;
+  fetchedAt: number;
+}
+
+const entities: Record<number, Entry<EquationData>> = {};
+let listIds: Entry<number[]> | null = null;
+const inFlight: Record<string, Promise<any>> = {};
+const listeners: Listener[] = [];
+
+const notify = (change: CacheChange) => {
+  listeners.slice().forEach((listener) => {
+    try {
+      listener(change);
+    } catch (error) {
+      console.error('❌ Cache listener failed:', error);
+    }
+  });
+};
+
+const isFresh = (entry: Entry<any>) => Date.now() - entry.fetchedAt < MAX_AGE_MS;
+
+const sameEquation = (x: EquationData, y: EquationData) =>
+  Object.keys(y).every((key) => (x as any)[key] === (y as any)[key]);
+
+// Store equations; partial objects (e.g. update events without created_at) are merged into the
+// cached entry. Returns the equations whose stored value changed.
+const store = (equations: EquationData[]): EquationData[] => {
+  const now = Date.now();
+  const changed: EquationData[] = [];
+  equations.forEach((equation) => {
+    if (equation.id === undefined) return;
+    const entry = entities[equation.id];
+    if (entry && sameEquation(entry.value, equation)) {
+      entry.fetchedAt = now;
+      return;
+    }
+    const value = entry ? { ...entry.value, ...equation } : equation;
+    entities[equation.id] = { value, fetchedAt: now };
+    changed.push(value);
+  });
+  return changed;
+};
+
+export const subscribe = (listener: Listener): (() => void) => {
+  listeners.push(listener);
+  return () => {
+    const index = listeners.indexOf(listener);
+    if (index >= 0) listeners.splice(index, 1);
+  };
+};
+
+export const getEquation = (id: number): Entry<EquationData> | null => entities[id] || null;
+
+export const getList = (): Entry<EquationData[]> | null => {
+  if (!listIds) return null;
+  const value = listIds.value.filter((id) => entities[id]).map((id) => entities[id].value);
+  return { value, fetchedAt: listIds.fetchedAt };
+};
+
+// Remember equations read alongside other data (e.g. list pages) without notifying
+export const remember = (equations: EquationData[]) => {
+  store(equations);
+};
+
+export const setList = (equations: EquationData[]) => {
+  store(equations);
+  listIds = { value: equations.map((eq) => eq.id as number), fetchedAt: Date.now() };
+  notify({ kind: 'list', equations: getList()!.value });
+};
+
+export const applyCreated = (equations: EquationData[]) => {
+  const changed = store(equations);
+  if (listIds) {
+    const known = new Set(listIds.value);
+    const added = equations.map((eq) => eq.id as number).filter((id) => !known.has(id)).reverse();
+    listIds.value = [...added, ...listIds.value];
+  }
+  if (changed.length > 0) notify({ kind: 'created', equations: changed });
+};
+
+export const applyUpdated = (equations: EquationData[]) => {
+  const changed = store(equations);
+  if (changed.length > 0) notify({ kind: 'updated', equations: changed });
+};
+
+export const applyDeleted = (ids: number[]) => {
+  const removed = ids.filter((id) => entities[id] || (listIds && listIds.value.indexOf(id) >= 0));
+  removed.forEach((id) => delete entities[id]);
+  if (listIds) {
+    const gone = new Set(ids);
+    listIds.value = listIds.value.filter((id) => !gone.has(id));
+  }
+  if (removed.length > 0) notify({ kind: 'deleted', ids: removed });
+};
+
+// Mark everything stale (e.g. the change feed lost events): the next read revalidates
+export const invalidateAll = () => {
+  Object.keys(entities).forEach((id) => {
+    entities[Number(id)].fetchedAt = 0;
+  });
+  if (listIds) listIds.fetchedAt = 0;
+};
+
+// Share one in-flight request between identical calls
+export const dedupe = <T>(key: string, request: () => Promise<T>): Promise<T> => {
+  if (!inFlight[key]) {
+    const cleanup = () => {
+      delete inFlight[key];
+    };
+    inFlight[key] = request().then(
+      (result) => {
+        cleanup();
+        return result;
+      },
+      (error) => {
+        cleanup();
+        throw error;
+      }
+    );
+  }
+  return inFlight[key];
+};
+
+// Cached value now (revalidating it in the background when stale), or the fetched value when
+// nothing is cached. The fetcher is responsible for storing what it fetched.
+export const staleWhileRevalidate = <T>(
+  key: string,
+  cached: Entry<T> | null,
+  fetcher: () => Promise<T>
+): Promise<T> => {
+  if (!cached) {
+    return dedupe(key, fetcher);
+  }
+  if (!isFresh(cached)) {
+    dedupe(key, fetcher).catch((error) => console.warn(`⚠️ Revalidating ${key} failed:`, error));
+  }
+  return Promise.resolve(cached.value);
+};
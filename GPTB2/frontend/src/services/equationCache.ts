@@ -0,0 +1,131 @@
+import { EquationData } from '../types';
+
+// Local copy of the equation list in IndexedDB, kept current with GET /api/equation?since=
+// (delta sync). Without IndexedDB (private mode, old browsers) every call is a no-op and the
+// list is fetched in full each time.
+const DB_NAME = 'gptb2';
+const DB_VERSION = 1;
+const EQUATIONS = 'equations';
+const META = 'meta';
+const SYNC_TOKEN_KEY = 'syncToken';
+
+export interface CachedEquations {
+  equations: EquationData[];
+  syncToken: string | null;
+}
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+
+const openDb = (): Promise<IDBDatabase | null> => {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve) => {
+      if (typeof indexedDB === 'undefined') {
+        resolve(null);
+        return;
+      }
+      try {
+        const request = indexedDB.open(DB_NAME, DB_VERSION);
+        request.onupgradeneeded = () => {
+          const db = request.result;
+          if (!db.objectStoreNames.contains(EQUATIONS)) {
+            db.createObjectStore(EQUATIONS, { keyPath: 'id' });
+          }
+          if (!db.objectStoreNames.contains(META)) {
+            db.createObjectStore(META);
+          }
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => {
+          console.warn('⚠️ Equation cache unavailable:', request.error);
+          resolve(null);
+        };
+      } catch (error) {
+        console.warn('⚠️ Equation cache unavailable:', error);
+        resolve(null);
+      }
+    });
+  }
+  return dbPromise;
+};
+
+const requestResult = <T>(request: IDBRequest<T>): Promise<T> =>
+  new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+const transactionDone = (tx: IDBTransaction): Promise<void> =>
+  new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+
+// Cached equations and the token to sync from; syncToken is null when there is no usable copy
+export const loadCache = async (): Promise<CachedEquations> => {
+  const db = await openDb();
+  if (!db) return { equations: [], syncToken: null };
+  try {
+    const tx = db.transaction([EQUATIONS, META], 'readonly');
+    const [equations, syncToken] = await Promise.all([
+      requestResult(tx.objectStore(EQUATIONS).getAll()),
+      requestResult(tx.objectStore(META).get(SYNC_TOKEN_KEY)),
+    ]);
+    return { equations: equations as EquationData[], syncToken: (syncToken as string) || null };
+  } catch (error) {
+    console.warn('⚠️ Could not read equation cache:', error);
+    return { equations: [], syncToken: null };
+  }
+};
+
+// Whether a synced copy exists (without reading the equations)
+export const hasLocalCopy = async (): Promise<boolean> => {
+  const db = await openDb();
+  if (!db) return false;
+  try {
+    const tx = db.transaction(META, 'readonly');
+    return Boolean(await requestResult(tx.objectStore(META).get(SYNC_TOKEN_KEY)));
+  } catch (error) {
+    return false;
+  }
+};
+
+// Apply one sync response: replace everything (full list) or upsert/delete (delta).
+// Equations and token are written in one transaction so the copy never runs ahead of its token.
+export const saveSync = async (
+  syncToken: string,
+  upserts: EquationData[],
+  deletedIds: number[],
+  replace: boolean
+): Promise<void> => {
+  const db = await openDb();
+  if (!db) return;
+  try {
+    const tx = db.transaction([EQUATIONS, META], 'readwrite');
+    const store = tx.objectStore(EQUATIONS);
+    if (replace) {
+      store.clear();
+    }
+    // Deletes first: a delta may delete an id and (on databases that reuse ids) create it again
+    deletedIds.forEach((id) => store.delete(id));
+    upserts.forEach((equation) => store.put(equation));
+    tx.objectStore(META).put(syncToken, SYNC_TOKEN_KEY);
+    await transactionDone(tx);
+  } catch (error) {
+    console.warn('⚠️ Could not write equation cache:', error);
+  }
+};
+
+// Forget the local copy (the next sync fetches the full list)
+export const clearCache = async (): Promise<void> => {
+  const db = await openDb();
+  if (!db) return;
+  try {
+    const tx = db.transaction([EQUATIONS, META], 'readwrite');
+    tx.objectStore(EQUATIONS).clear();
+    tx.objectStore(META).clear();
+    await transactionDone(tx);
+  } catch (error) {
+    console.warn('⚠️ Could not clear equation cache:', error);
+  }
+};
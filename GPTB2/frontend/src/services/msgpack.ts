@@ -0,0 +1,183 @@
+// Minimal MessagePack codec for API payloads (JSON-compatible values only)
+// Spec: https://github.com/msgpack/msgpack/blob/master/spec.md
+
+const textEncoder = new TextEncoder();
+const textDecoder = new TextDecoder();
+
+class Writer {
+  private buffer = new Uint8Array(256);
+  private view = new DataView(this.buffer.buffer);
+  private length = 0;
+
+  private ensure(size: number) {
+    if (this.length + size <= this.buffer.length) return;
+    let capacity = this.buffer.length * 2;
+    while (capacity < this.length + size) capacity *= 2;
+    const next = new Uint8Array(capacity);
+    next.set(this.buffer.subarray(0, this.length));
+    this.buffer = next;
+    this.view = new DataView(next.buffer);
+  }
+
+  byte(value: number) {
+    this.ensure(1);
+    this.buffer[this.length++] = value;
+  }
+
+  uint(size: 1 | 2 | 4, value: number) {
+    this.ensure(size);
+    if (size === 1) this.view.setUint8(this.length, value);
+    else if (size === 2) this.view.setUint16(this.length, value);
+    else this.view.setUint32(this.length, value);
+    this.length += size;
+  }
+
+  int(size: 1 | 2 | 4, value: number) {
+    this.ensure(size);
+    if (size === 1) this.view.setInt8(this.length, value);
+    else if (size === 2) this.view.setInt16(this.length, value);
+    else this.view.setInt32(this.length, value);
+    this.length += size;
+  }
+
+  float64(value: number) {
+    this.ensure(8);
+    this.view.setFloat64(this.length, value);
+    this.length += 8;
+  }
+
+  bytes(value: Uint8Array) {
+    this.ensure(value.length);
+    this.buffer.set(value, this.length);
+    this.length += value.length;
+  }
+
+  // Exact-size copy: axios sends a typed array's whole underlying buffer
+  result(): Uint8Array {
+    return this.buffer.slice(0, this.length);
+  }
+}
+
+const writeLength = (writer: Writer, length: number, fix: number | null, fixMax: number, codes: [number, number, number]) => {
+  if (fix !== null && length <= fixMax) writer.byte(fix | length);
+  else if (length <= 0xff && codes[0]) { writer.byte(codes[0]); writer.uint(1, length); }
+  else if (length <= 0xffff) { writer.byte(codes[1]); writer.uint(2, length); }
+  else { writer.byte(codes[2]); writer.uint(4, length); }
+};
+
+const writeValue = (writer: Writer, value: any): void => {
+  if (value === null || value === undefined) {
+    writer.byte(0xc0);
+  } else if (typeof value === 'boolean') {
+    writer.byte(value ? 0xc3 : 0xc2);
+  } else if (typeof value === 'number') {
+    if (Number.isInteger(value) && value >= -0x80000000 && value <= 0xffffffff) {
+      if (value >= 0 && value <= 0x7f) writer.byte(value);
+      else if (value < 0 && value >= -32) writer.byte(0xe0 | (value + 32));
+      else if (value >= 0 && value <= 0xff) { writer.byte(0xcc); writer.uint(1, value); }
+      else if (value >= 0 && value <= 0xffff) { writer.byte(0xcd); writer.uint(2, value); }
+      else if (value >= 0) { writer.byte(0xce); writer.uint(4, value); }
+      else if (value >= -0x80) { writer.byte(0xd0); writer.int(1, value); }
+      else if (value >= -0x8000) { writer.byte(0xd1); writer.int(2, value); }
+      else { writer.byte(0xd2); writer.int(4, value); }
+    } else {
+      writer.byte(0xcb);
+      writer.float64(value);
+    }
+  } else if (typeof value === 'string') {
+    const encoded = textEncoder.encode(value);
+    writeLength(writer, encoded.length, 0xa0, 31, [0xd9, 0xda, 0xdb]);
+    writer.bytes(encoded);
+  } else if (value instanceof Uint8Array) {
+    writeLength(writer, value.length, null, 0, [0xc4, 0xc5, 0xc6]);
+    writer.bytes(value);
+  } else if (Array.isArray(value)) {
+    writeLength(writer, value.length, 0x90, 15, [0, 0xdc, 0xdd]);
+    value.forEach((item) => writeValue(writer, item));
+  } else if (typeof value === 'object') {
+    // Like JSON.stringify: undefined members are dropped
+    const keys = Object.keys(value).filter((key) => value[key] !== undefined);
+    writeLength(writer, keys.length, 0x80, 15, [0, 0xde, 0xdf]);
+    keys.forEach((key) => {
+      writeValue(writer, key);
+      writeValue(writer, value[key]);
+    });
+  } else {
+    throw new TypeError(`Cannot encode ${typeof value} as MessagePack`);
+  }
+};
+
+export const encode = (value: any): Uint8Array => {
+  const writer = new Writer();
+  writeValue(writer, value);
+  return writer.result();
+};
+
+export const decode = (input: ArrayBuffer | Uint8Array): any => {
+  const bytes = input instanceof Uint8Array ? input : new Uint8Array(input);
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  let offset = 0;
+
+  const take = (size: number) => {
+    const start = offset;
+    offset += size;
+    if (offset > bytes.length) throw new RangeError('Truncated MessagePack data');
+    return start;
+  };
+  const str = (length: number) => {
+    const start = take(length);
+    return textDecoder.decode(bytes.subarray(start, start + length));
+  };
+  const array = (length: number) => {
+    const result = new Array(length);
+    for (let i = 0; i < length; i++) result[i] = read();
+    return result;
+  };
+  const map = (length: number) => {
+    const result: Record<string, any> = {};
+    for (let i = 0; i < length; i++) {
+      const key = read();
+      result[String(key)] = read();
+    }
+    return result;
+  };
+
+  const read = (): any => {
+    const code = bytes[take(1)];
+    if (code <= 0x7f) return code;
+    if (code <= 0x8f) return map(code & 0x0f);
+    if (code <= 0x9f) return array(code & 0x0f);
+    if (code <= 0xbf) return str(code & 0x1f);
+    if (code >= 0xe0) return code - 0x100;
+    switch (code) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: { const n = view.getUint8(take(1)); const s = take(n); return bytes.slice(s, s + n); }
+      case 0xc5: { const n = view.getUint16(take(2)); const s = take(n); return bytes.slice(s, s + n); }
+      case 0xc6: { const n = view.getUint32(take(4)); const s = take(n); return bytes.slice(s, s + n); }
+      case 0xca: return view.getFloat32(take(4));
+      case 0xcb: return view.getFloat64(take(8));
+      case 0xcc: return view.getUint8(take(1));
+      case 0xcd: return view.getUint16(take(2));
+      case 0xce: return view.getUint32(take(4));
+      case 0xcf: { const s = take(8); return view.getUint32(s) * 0x100000000 + view.getUint32(s + 4); }
+      case 0xd0: return view.getInt8(take(1));
+      case 0xd1: return view.getInt16(take(2));
+      case 0xd2: return view.getInt32(take(4));
+      case 0xd3: { const s = take(8); return view.getInt32(s) * 0x100000000 + view.getUint32(s + 4); }
+      case 0xd9: return str(view.getUint8(take(1)));
+      case 0xda: return str(view.getUint16(take(2)));
+      case 0xdb: return str(view.getUint32(take(4)));
+      case 0xdc: return array(view.getUint16(take(2)));
+      case 0xdd: return array(view.getUint32(take(4)));
+      case 0xde: return map(view.getUint16(take(2)));
+      case 0xdf: return map(view.getUint32(take(4)));
+      default: throw new TypeError(`Unsupported MessagePack type 0x${code.toString(16)}`);
+    }
+  };
+
+  const value = read();
+  if (offset !== bytes.length) throw new RangeError('Trailing bytes after MessagePack value');
+  return value;
+};
@@ -9,6 +9,7 @@ export interface EquationData {
   discriminant?: number;
   solution_type?: string;
   equation_string?: string;
+  canonical_hash?: string;
   created_at?: string;
   updated_at?: string;
 }
@@ -19,6 +20,64 @@ export interface ApiResponse<T> {
   data?: T;
   error?: string;
   database_error?: string;
+  // POST /api/equation?dedup=true answered with an equation stored before
+  deduplicated?: boolean;
+}
+
+// One keyset page of GET /api/equation?limit=&cursor=
+export interface EquationPage extends ApiResponse<EquationData[]> {
+  count?: number;
+  next_cursor?: string | null;
+  sync_token?: string;
+}
+
+export interface BulkItemResult {
+  id: number;
+  status: 'updated' | 'deleted' | 'not_found';
+  data?: EquationData;
+}
+
+export interface BulkItemError {
+  index: number;
+  id?: number;
+  error: string;
+}
+
+export interface BulkResponse {
+  message: string;
+  status: 'success' | 'error' | 'partial_success';
+  updated_count?: number;
+  deleted_count?: number;
+  not_found_count?: number;
+  error_count?: number;
+  // POST /api/equations/bulk?dedup=true: request indexes answered with a stored equation
+  deduplicated_indexes?: number[];
+  results?: BulkItemResult[];
+  errors?: BulkItemError[];
+  error?: string;
+}
+
+// POST /api/batch: "id" may be "$<n>", the id returned by the n-th operation of the batch
+export type BatchOperation =
+  | { op: 'create'; a: number; b: number; c: number }
+  | { op: 'update'; id: number | string; a: number; b: number; c: number }
+  | { op: 'get' | 'delete'; id: number | string }
+  | { op: 'stats' };
+
+export interface BatchResult {
+  op: BatchOperation['op'];
+  status: number;
+  data?: any;
+  error?: string;
+}
+
+export interface BatchResponse {
+  message: string;
+  status: 'success' | 'error' | 'partial_success';
+  atomic?: boolean;
+  failed_index?: number;
+  results?: BatchResult[];
+  error?: string;
 }
 
 export interface EquationFormData {
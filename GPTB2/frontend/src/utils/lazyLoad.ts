@@ -0,0 +1,38 @@
+import React, { ComponentType, LazyExoticComponent } from 'react';
+
+// React.lazy() component whose chunk can also be fetched ahead of rendering (on hover, focus
+// or when the browser is idle), so the view usually renders without showing its fallback.
+export type PreloadableComponent<T extends ComponentType<any>> = LazyExoticComponent<T> & {
+  preload: () => Promise<{ default: T }>;
+};
+
+export const lazyWithPreload = <T extends ComponentType<any>>(
+  factory: () => Promise<{ default: T }>
+): PreloadableComponent<T> => {
+  let loading: Promise<{ default: T }> | null = null;
+  const load = () => {
+    if (!loading) {
+      loading = factory().catch((error) => {
+        // Let a later attempt retry (e.g. after a network blip)
+        loading = null;
+        throw error;
+      });
+    }
+    return loading;
+  };
+
+  const Component = React.lazy(load) as PreloadableComponent<T>;
+  Component.preload = load;
+  return Component;
+};
+
+// Run callback once the main thread is idle (after first paint); returns a cancel function
+export const whenIdle = (callback: () => void, timeoutMs: number = 2000): (() => void) => {
+  const idleWindow = window as any;
+  if (typeof idleWindow.requestIdleCallback === 'function') {
+    const handle = idleWindow.requestIdleCallback(callback, { timeout: timeoutMs });
+    return () => idleWindow.cancelIdleCallback(handle);
+  }
+  const handle = window.setTimeout(callback, 200);
+  return () => window.clearTimeout(handle);
+};
@@ -6,10 +6,27 @@ Test script to verify build output and nginx html directory structure
 
 import os
 import sys
+import gzip
 import subprocess
 import json
 from pathlib import Path
 
+# Startup budget: what the first page load needs (the entrypoint JS and CSS in
+# asset-manifest.json), gzip-compressed as served. Lazily loaded chunks do not count.
+BUDGET_INITIAL_JS_KB = float(os.getenv('BUNDLE_BUDGET_JS_KB', '90'))
+BUDGET_INITIAL_CSS_KB = float(os.getenv('BUNDLE_BUDGET_CSS_KB', '8'))
+BUDGET_TTI_MS = float(os.getenv('TTI_BUDGET_MS', '3500'))
+
+# Time-to-interactive model, after Lighthouse's simulated mobile throttling ("Slow 4G"):
+# 150 ms RTT, 1.6 Mbit/s, 4x CPU slowdown. Connection setup (DNS, TCP, TLS) costs 3 RTT, the
+# HTML one more, then the entrypoint assets download in parallel (one RTT plus their gzip bytes
+# over the link) and the JS is parsed, compiled and run at about 1 ms per uncompressed KB on
+# an unthrottled desktop core.
+RTT_MS = float(os.getenv('TTI_RTT_MS', '150'))
+BANDWIDTH_KBIT_S = float(os.getenv('TTI_BANDWIDTH_KBIT_S', '1638.4'))
+CPU_SLOWDOWN = float(os.getenv('TTI_CPU_SLOWDOWN', '4'))
+JS_MS_PER_KB = 1.0
+
 def create_mock_build():
     """Create mock build directory to simulate npm run build output"""
     print("🔧 Creating mock build output...")
@@ -26,11 +43,11 @@ def create_mock_build():
     <meta name="viewport" content="width=device-width, initial-scale=1" />
     <title>GPTB2 - Quadratic Equation Solver</title>
     <link href="/static/css/main.css" rel="stylesheet">
+    <script defer="defer" src="/static/js/main.js"></script>
 </head>
 <body>
     <noscript>You need to enable JavaScript to run this app.</noscript>
     <div id="root"></div>
-    <script src="/static/js/main.js"></script>
 </body>
 </html>""")
     
@@ -59,12 +76,23 @@ body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
 !function(e){var t={};function n(r){if(t[r])return t[r].exports;var o=t[r]={i:r,l:!1,exports:{}};return e[r].call(o.exports,o,o.exports,n),o.l=!0,o.exports}n.m=e,n.c=t,n.d=function(e,t,r){n.o(e,t)||Object.defineProperty(e,t,{enumerable:!0,get:r})},n.r=function(e){"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},n.t=function(e,t){if(1&t&&(e=n(e)),8&t)return e;if(4&t&&"object"==typeof e&&e&&e.__esModule)return e;var r=Object.create(null);if(n.r(r),Object.defineProperty(r,"default",{enumerable:!0,value:e}),2&t&&"string"!=typeof e)for(var o in e)n.d(r,o,function(t){return e[t]}.bind(null,o));return r},n.n=function(e){var t=e&&e.__esModule?function(){return e.default}:function(){return e};return n.d(t,"a",t),t},n.o=function(e,t){return Object.prototype.hasOwnProperty.call(e,t)},n.p="/",n(n.s=0)}([function(e,t,n){"use strict";console.log("GPTB2 Frontend Loaded")}]);
 """)
     
+    # Create mock lazily loaded chunks (EquationList and EquationResult views)
+    for chunk in ("list", "result"):
+        (js_dir / f"{chunk}.chunk.js").write_text(
+            f'"use strict";(self.webpackChunkgptb2_frontend=self.webpackChunkgptb2_frontend||[]).push([["{chunk}"],{{}}]);\n'
+        )
+        (css_dir / f"{chunk}.chunk.css").write_text(f".{chunk}-view {{ margin: 20px 0; }}\n")
+    
     # Create asset manifest
     manifest_file = build_dir / "asset-manifest.json"
     manifest_file.write_text(json.dumps({
         "files": {
             "main.css": "/static/css/main.css",
             "main.js": "/static/js/main.js",
+            "static/js/list.chunk.js": "/static/js/list.chunk.js",
+            "static/css/list.chunk.css": "/static/css/list.chunk.css",
+            "static/js/result.chunk.js": "/static/js/result.chunk.js",
+            "static/css/result.chunk.css": "/static/css/result.chunk.css",
             "index.html": "/index.html"
         },
         "entrypoints": [
@@ -112,6 +140,73 @@ def test_build_output_structure():
     print("✅ Build output structure check passed")
     return True
 
+def initial_assets(build_dir=Path("build")):
+    """Entrypoint assets of the build: [(path, raw bytes, gzip bytes)]"""
+    manifest = json.loads((build_dir / "asset-manifest.json").read_text())
+    assets = []
+    for entry in manifest["entrypoints"]:
+        data = (build_dir / entry).read_bytes()
+        assets.append((entry, len(data), len(gzip.compress(data, 9))))
+    return assets
+
+def estimate_tti_ms(assets):
+    """Time-to-interactive of the entrypoint assets under the throttling model above"""
+    gzip_kb = sum(gz for _, _, gz in assets) / 1024
+    js_kb = sum(raw for path, raw, _ in assets if path.endswith(".js")) / 1024
+    network_ms = 5 * RTT_MS + gzip_kb * 8 / BANDWIDTH_KBIT_S * 1000
+    cpu_ms = js_kb * JS_MS_PER_KB * CPU_SLOWDOWN
+    return network_ms + cpu_ms
+
+def test_code_splitting():
+    """Test the result and list views are lazily loaded chunks, not in the entrypoint"""
+    print("🔍 Testing code splitting...")
+    
+    build_dir = Path("build")
+    entrypoints = {path for path, _, _ in initial_assets(build_dir)}
+    lazy_chunks = [
+        path for path in sorted(build_dir.glob("static/js/*.chunk.js"))
+        if str(path.relative_to(build_dir)) not in entrypoints
+    ]
+    if len(lazy_chunks) < 2:
+        print(f"❌ Expected lazily loaded chunks for the result and list views, found {len(lazy_chunks)}")
+        return False
+    
+    print(f"✅ {len(lazy_chunks)} lazily loaded chunks outside the entrypoint")
+    return True
+
+def test_bundle_budget():
+    """Test the initial JS and CSS stay within the startup budget"""
+    print("🔍 Testing bundle size budget...")
+    
+    assets = initial_assets()
+    js_kb = sum(gz for path, _, gz in assets if path.endswith(".js")) / 1024
+    css_kb = sum(gz for path, _, gz in assets if path.endswith(".css")) / 1024
+    for path, raw, gz in assets:
+        print(f"   📦 {path}: {raw / 1024:.1f} KB ({gz / 1024:.1f} KB gzip)")
+    
+    ok = True
+    if js_kb > BUDGET_INITIAL_JS_KB:
+        print(f"❌ Initial JS {js_kb:.1f} KB gzip exceeds budget {BUDGET_INITIAL_JS_KB:.0f} KB")
+        ok = False
+    if css_kb > BUDGET_INITIAL_CSS_KB:
+        print(f"❌ Initial CSS {css_kb:.1f} KB gzip exceeds budget {BUDGET_INITIAL_CSS_KB:.0f} KB")
+        ok = False
+    if ok:
+        print(f"✅ Initial JS {js_kb:.1f}/{BUDGET_INITIAL_JS_KB:.0f} KB, CSS {css_kb:.1f}/{BUDGET_INITIAL_CSS_KB:.0f} KB gzip")
+    return ok
+
+def test_time_to_interactive():
+    """Test the estimated time to interactive on a throttled mobile connection"""
+    print("🔍 Testing time to interactive (Slow 4G, 4x CPU)...")
+    
+    tti_ms = estimate_tti_ms(initial_assets())
+    if tti_ms > BUDGET_TTI_MS:
+        print(f"❌ Estimated TTI {tti_ms:.0f} ms exceeds budget {BUDGET_TTI_MS:.0f} ms")
+        return False
+    
+    print(f"✅ Estimated TTI {tti_ms:.0f} ms (budget {BUDGET_TTI_MS:.0f} ms)")
+    return True
+
 def simulate_nginx_copy():
     """Simulate copying build files to nginx html directory"""
     print("🔍 Simulating nginx copy process...")
@@ -233,6 +328,13 @@ def cleanup_simulation():
     
     return True
 
+def check_budget():
+    """Budget checks against a real `npm run build` output (run by the Dockerfile)"""
+    tests = [test_build_output_structure, test_code_splitting, test_bundle_budget, test_time_to_interactive]
+    results = [test() for test in tests]
+    print(f"📊 BUDGET CHECK: {sum(results)}/{len(results)} passed")
+    return all(results)
+
 def main():
     """Main test function"""
     print("=" * 70)
@@ -242,6 +344,9 @@ def main():
     tests = [
         create_mock_build,
         test_build_output_structure,
+        test_code_splitting,
+        test_bundle_budget,
+        test_time_to_interactive,
         simulate_nginx_copy,
         test_nginx_html_directory,
         test_docker_copy_command,
@@ -292,5 +397,6 @@ def main():
     return passed == total
 
 if __name__ == "__main__":
-    success = main()
+    # --budget: check the existing build/ (no mock build, no cleanup); a failure fails the image build
+    success = check_budget() if "--budget" in sys.argv else main()
     sys.exit(0 if success else 1)
\ No newline at end of file
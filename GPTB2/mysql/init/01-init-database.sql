@@ -18,25 +18,119 @@ GRANT SELECT, INSERT, UPDATE, DELETE, CREATE, DROP, INDEX, ALTER ON gptb2_db.* T
 FLUSH PRIVILEGES;
 
 -- Create equations table
+-- Partitioned by month on created_at so old months can be archived and dropped
+-- (backend/archive.py). MySQL requires the partitioning column in every unique key,
+-- hence the (id, created_at) primary key; id stays AUTO_INCREMENT and unique in practice.
+--
+-- Cost of that key: lookups by id alone (GET, PUT and DELETE /api/equation/<id>, the bulk
+-- endpoints' id IN (...), the ORM's own UPDATE/DELETE by id) carry no created_at, so MySQL
+-- cannot prune partitions and does one primary-key dive in every partition (EXPLAIN shows all
+-- of them under "partitions"): 37 dives instead of one with the partitions below. Empty
+-- future partitions cost a single page each, and `archive.py run` drops the months past
+-- ARCHIVE_RETENTION_MONTHS, which bounds the populated ones. GET by id is mostly answered
+-- by the shared cache (shared_cache.py) without touching MySQL. Queries that know
+-- created_at should add it to the WHERE clause (as canonical.py's backfill does) so they
+-- hit one partition.
 CREATE TABLE IF NOT EXISTS equations (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id INT NOT NULL AUTO_INCREMENT,
     a FLOAT NOT NULL,
     b FLOAT NOT NULL,
     c FLOAT NOT NULL,
-    solution TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    solution VARCHAR(200),
+    discriminant FLOAT,
+    solution_type VARCHAR(50),
+    root1_real DOUBLE,
+    root2_real DOUBLE,
+    root_imag DOUBLE,
+    canonical_hash CHAR(32) CHARACTER SET ascii COLLATE ascii_bin COMMENT 'Hash of the scale-free form, shared by k·(a, b, c)',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at),
     INDEX idx_created_at (created_at),
-    INDEX idx_coefficients (a, b, c)
+    INDEX idx_coefficients (a, b, c),
+    INDEX idx_root1 (root_imag, root1_real),
+    INDEX idx_root2 (root_imag, root2_real),
+    INDEX idx_updated_at (updated_at),
+    INDEX idx_canonical_hash (canonical_hash, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE COLUMNS (created_at) (
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p202701 VALUES LESS THAN ('2027-02-01'),
+    PARTITION p202702 VALUES LESS THAN ('2027-03-01'),
+    PARTITION p202703 VALUES LESS THAN ('2027-04-01'),
+    PARTITION p202704 VALUES LESS THAN ('2027-05-01'),
+    PARTITION p202705 VALUES LESS THAN ('2027-06-01'),
+    PARTITION p202706 VALUES LESS THAN ('2027-07-01'),
+    PARTITION p202707 VALUES LESS THAN ('2027-08-01'),
+    PARTITION p202708 VALUES LESS THAN ('2027-09-01'),
+    PARTITION p202709 VALUES LESS THAN ('2027-10-01'),
+    PARTITION p202710 VALUES LESS THAN ('2027-11-01'),
+    PARTITION p202711 VALUES LESS THAN ('2027-12-01'),
+    PARTITION p202712 VALUES LESS THAN ('2028-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- Existing unpartitioned installs can be converted in place (rebuilds the table):
+--   ALTER TABLE equations MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+--     DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at);
+--   ALTER TABLE equations PARTITION BY RANGE COLUMNS (created_at) (... as above ...);
+-- `python archive.py ensure` keeps upcoming monthly partitions split off p_future.
+
+-- Deletion log (tombstones) for delta sync, GET /api/equation?since= (backend/delta_sync.py)
+-- Filled by the trigger below so every DELETE is logged in the deleting statement;
+-- `python archive.py prune` trims entries older than DELTA_TOMBSTONE_RETENTION_DAYS
+CREATE TABLE IF NOT EXISTS equation_deletions (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    equation_id INT NOT NULL,
+    deleted_at DATETIME NOT NULL,
+    INDEX ix_equation_deletions_deleted_at (deleted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TRIGGER IF NOT EXISTS trg_equations_deleted AFTER DELETE ON equations FOR EACH ROW
+    INSERT INTO equation_deletions (equation_id, deleted_at) VALUES (OLD.id, UTC_TIMESTAMP());
+
+-- Dedup registry for POST /api/equation?dedup=true (backend/dedup.py): a unique key on the
+-- coefficients cannot live on the partitioned equations table (it would need created_at),
+-- so INSERT ... ON DUPLICATE KEY UPDATE runs against this table instead
+CREATE TABLE IF NOT EXISTS equation_dedup (
+    coefficient_hash CHAR(32) CHARACTER SET ascii COLLATE ascii_bin NOT NULL PRIMARY KEY,
+    equation_id INT NULL COMMENT 'Stored equation; NULL only while being created',
+    hits BIGINT NOT NULL DEFAULT 1 COMMENT 'Times these coefficients were submitted',
+    created_at DATETIME NOT NULL,
+    last_hit_at DATETIME NOT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Insert sample data for testing
-INSERT INTO equations (a, b, c, solution) VALUES 
-(1, -5, 6, 'x₁ = 3.000000, x₂ = 2.000000'),
-(1, -3, 2, 'x₁ = 2.000000, x₂ = 1.000000'),
-(1, 0, -4, 'x₁ = 2.000000, x₂ = -2.000000'),
-(1, -2, 1, 'x₁ = 1.000000, x₂ = 1.000000'),
-(2, -4, 2, 'x₁ = 1.000000, x₂ = 1.000000')
+-- canonical_hash values are canonical.canonical_hash(a, b, c): (2, -4, 2) shares (1, -2, 1)'s
+INSERT INTO equations (a, b, c, solution, discriminant, solution_type, root1_real, root2_real, root_imag, canonical_hash) VALUES 
+(1, -5, 6, 'x₁ = 3.000000, x₂ = 2.000000', 1, 'two_real', 2, 3, 0, 'f406967ea027614267191a54062aeea1'),
+(1, -3, 2, 'x₁ = 2.000000, x₂ = 1.000000', 1, 'two_real', 1, 2, 0, '1c84bdab3300feff925463f7ce3e30ad'),
+(1, 0, -4, 'x₁ = 2.000000, x₂ = -2.000000', 16, 'two_real', -2, 2, 0, 'bfc87612c10965defbaca9735c8b35ab'),
+(1, -2, 1, 'x = 1.000000 (repeated root)', 0, 'one_real', 1, 1, 0, 'f963b66c571983470f2e234c6c10a85a'),
+(2, -4, 2, 'x = 1.000000 (repeated root)', 0, 'one_real', 1, 1, 0, 'f963b66c571983470f2e234c6c10a85a')
 ON DUPLICATE KEY UPDATE solution = VALUES(solution);
 
 -- Show table structure
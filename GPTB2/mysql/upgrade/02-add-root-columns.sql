@@ -0,0 +1,33 @@
+-- GPTB2 Database Upgrade - numeric root columns for root-range search
+-- Fresh installs get these from mysql/init/01-init-database.sql; run this once on existing databases:
+--   docker compose exec -T mysql mysql -uroot -p"$DB_PASSWORD" gptb2_db < mysql/upgrade/02-add-root-columns.sql
+
+USE gptb2_db;
+
+ALTER TABLE equations
+    ADD COLUMN root1_real DOUBLE NULL COMMENT 'Smaller real root, or real part of complex roots' AFTER solution_type,
+    ADD COLUMN root2_real DOUBLE NULL COMMENT 'Larger real root, or real part of complex roots' AFTER root1_real,
+    ADD COLUMN root_imag DOUBLE NULL COMMENT '|Imaginary part| of the roots, 0 for real roots' AFTER root2_real,
+    ADD INDEX idx_root1 (root_imag, root1_real),
+    ADD INDEX idx_root2 (root_imag, root2_real);
+
+-- Backfill with the same rules as Equation.solve_equation()
+UPDATE equations SET
+    root1_real = CASE
+        WHEN a = 0 AND b = 0 THEN NULL
+        WHEN a = 0 THEN -c / b
+        WHEN b * b - 4 * a * c < 0 THEN -b / (2 * a)
+        ELSE LEAST((-b + SQRT(b * b - 4 * a * c)) / (2 * a), (-b - SQRT(b * b - 4 * a * c)) / (2 * a))
+    END,
+    root2_real = CASE
+        WHEN a = 0 AND b = 0 THEN NULL
+        WHEN a = 0 THEN -c / b
+        WHEN b * b - 4 * a * c < 0 THEN -b / (2 * a)
+        ELSE GREATEST((-b + SQRT(b * b - 4 * a * c)) / (2 * a), (-b - SQRT(b * b - 4 * a * c)) / (2 * a))
+    END,
+    root_imag = CASE
+        WHEN a = 0 AND b = 0 THEN NULL
+        WHEN a = 0 THEN 0
+        WHEN b * b - 4 * a * c < 0 THEN ABS(SQRT(4 * a * c - b * b) / (2 * a))
+        ELSE 0
+    END;
@@ -0,0 +1,19 @@
+-- GPTB2 Database Upgrade - delta sync (GET /api/equation?since=)
+-- Fresh installs get these from mysql/init/01-init-database.sql; run this once on existing databases:
+--   docker compose exec -T mysql mysql -uroot -p"$DB_PASSWORD" gptb2_db < mysql/upgrade/03-add-delta-sync.sql
+
+USE gptb2_db;
+
+-- Rows changed since a client's sync token
+ALTER TABLE equations ADD INDEX idx_updated_at (updated_at);
+
+-- Deletion log (tombstones), filled by a trigger so every DELETE path is covered
+CREATE TABLE IF NOT EXISTS equation_deletions (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    equation_id INT NOT NULL,
+    deleted_at DATETIME NOT NULL,
+    INDEX ix_equation_deletions_deleted_at (deleted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TRIGGER IF NOT EXISTS trg_equations_deleted AFTER DELETE ON equations FOR EACH ROW
+    INSERT INTO equation_deletions (equation_id, deleted_at) VALUES (OLD.id, UTC_TIMESTAMP());
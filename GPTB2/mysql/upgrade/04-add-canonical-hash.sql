@@ -0,0 +1,12 @@
+-- GPTB2 Database Upgrade - scale-invariant canonical hash (GET /api/equation?canonical_hash=)
+-- Fresh installs get these from mysql/init/01-init-database.sql; run this once on existing databases:
+--   docker compose exec -T mysql mysql -uroot -p"$DB_PASSWORD" gptb2_db < mysql/upgrade/04-add-canonical-hash.sql
+-- then fill the column for existing rows (the hash rounds in Python, see backend/canonical.py):
+--   docker compose exec -T backend python canonical.py backfill
+
+USE gptb2_db;
+
+ALTER TABLE equations
+    ADD COLUMN canonical_hash CHAR(32) CHARACTER SET ascii COLLATE ascii_bin NULL
+        COMMENT 'Hash of the scale-free form, shared by k·(a, b, c)' AFTER root_imag,
+    ADD INDEX idx_canonical_hash (canonical_hash, created_at);
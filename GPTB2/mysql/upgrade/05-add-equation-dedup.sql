@@ -0,0 +1,14 @@
+-- GPTB2 Database Upgrade - dedup registry (POST /api/equation?dedup=true)
+-- Fresh installs get these from mysql/init/01-init-database.sql; run this once on existing databases:
+--   docker compose exec -T mysql mysql -uroot -p"$DB_PASSWORD" gptb2_db < mysql/upgrade/05-add-equation-dedup.sql
+-- Equations stored before the upgrade are not registered: their next dedup submission stores one more row
+
+USE gptb2_db;
+
+CREATE TABLE IF NOT EXISTS equation_dedup (
+    coefficient_hash CHAR(32) CHARACTER SET ascii COLLATE ascii_bin NOT NULL PRIMARY KEY,
+    equation_id INT NULL COMMENT 'Stored equation; NULL only while being created',
+    hits BIGINT NOT NULL DEFAULT 1 COMMENT 'Times these coefficients were submitted',
+    created_at DATETIME NOT NULL,
+    last_hit_at DATETIME NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -98,15 +98,16 @@ def test_backend_container():
     
     # Test if Backend container is running
     try:
-        result = subprocess.run(['docker', 'ps', '--filter', 'name=gptb2_backend', '--format', 'table {{.Names}}\t{{.Status}}'], 
+        # Backend replicas are named by compose (gptb2-backend-1, ...), find them by service label
+        result = subprocess.run(['docker', 'ps', '--filter', 'label=com.docker.compose.service=backend', '--format', '{{.Names}}\t{{.Status}}'], 
                               capture_output=True, text=True, timeout=10)
         
-        if result.returncode == 0 and 'gptb2_backend' in result.stdout:
-            print("✅ Backend container is running")
+        if result.returncode == 0 and result.stdout.strip():
+            print(f"✅ Backend containers running: {len(result.stdout.strip().splitlines())}")
             
             # Test Backend API
             backend_test_cmd = [
-                'docker', 'exec', 'gptb2_backend', 
+                'docker', 'compose', 'exec', '-T', 'backend', 
                 'curl', '-f', 'http://localhost:5000/ping'
             ]
             
@@ -182,7 +183,7 @@ def test_inter_container_connectivity():
     print("   Testing Backend → MySQL...")
     try:
         backend_mysql_cmd = [
-            'docker', 'exec', 'gptb2_backend', 
+            'docker', 'compose', 'exec', '-T', 'backend', 
             'python', '-c', 
             'import os; import pymysql; conn = pymysql.connect(host="mysql", user="root", password=os.getenv("DB_PASSWORD", "gptb2_secure_password_2024"), database="gptb2_db"); print("Backend → MySQL: OK"); conn.close()'
         ]
@@ -269,11 +270,10 @@ def simulate_container_connectivity():
     print("   - Ports: 3306:3306")
     print("   - Health: mysqladmin ping")
     
-    print("\n2. ✅ Backend Container (gptb2_backend)")
-    print("   - Build: ./backend/Dockerfile")
+    print("\n2. ✅ Backend Containers (gptb2-backend-1..N, BACKEND_REPLICAS)")
+    print("   - Build: ./backend/Dockerfile (gunicorn, --keepalive 75)")
     print("   - Network: gptb2_network (172.20.0.0/16)")
-    print("   - Internal IP: 172.20.0.3")
-    print("   - Ports: 5000:5000")
+    print("   - Ports: 5000 (internal; host port 5000 is nginx, least_conn over the replicas)")
     print("   - Health: curl http://localhost:5000/ping")
     print("   - Connects to: mysql:3306")
     
@@ -286,8 +286,8 @@ def simulate_container_connectivity():
     print("   - Connects to: backend:5000")
     
     print("\n📡 Connectivity Matrix:")
-    print("✅ Frontend (172.20.0.4:80) → Backend (172.20.0.3:5000)")
-    print("✅ Backend (172.20.0.3:5000) → MySQL (172.20.0.2:3306)")
+    print("✅ Frontend (172.20.0.4:80) → Backend replicas (backend:5000)")
+    print("✅ Backend replicas → MySQL (172.20.0.2:3306)")
     print("✅ External (host) → Frontend (localhost:3000)")
     print("✅ External (host) → Backend (localhost:5000)")
     print("✅ External (host) → MySQL (localhost:3306)")
@@ -266,7 +266,7 @@ def simulate_docker_compose_up():
     print("2. ✅ Creating volumes: mysql_data, mysql_config")
     print("3. ✅ Starting MySQL container (gptb2_mysql)")
     print("4. ⏳ Waiting for MySQL health check...")
-    print("5. ✅ Building and starting Backend container (gptb2_backend)")
+    print("5. ✅ Building and starting Backend replicas (gptb2-backend-1..N)")
     print("6. ⏳ Waiting for Backend health check...")
     print("7. ✅ Building and starting Frontend container (gptb2_frontend)")
     print("8. ⏳ Waiting for Frontend health check...")
@@ -279,8 +279,8 @@ def test_service_connectivity():
     print("🔍 Testing service connectivity simulation...")
     
     print("📋 Service connectivity matrix:")
-    print("Frontend (gptb2_frontend:80) → Backend (gptb2_backend:5000)")
-    print("Backend (gptb2_backend:5000) → MySQL (gptb2_mysql:3306)")
+    print("Frontend (gptb2_frontend:80) → Backend replicas (backend:5000, least_conn)")
+    print("Backend replicas → MySQL (gptb2_mysql:3306)")
     print("External → Frontend (localhost:80)")
     print("External → Backend (localhost:5000)")
     print("External → MySQL (localhost:3306)")